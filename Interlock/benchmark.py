@@ -0,0 +1,450 @@
+import argparse
+import contextlib
+import io
+import os
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+from classifier import classify_item
+from dialects.detect import AUTO_DIALECT
+from dialects.interlock_batch import HAS_PYARROW
+from file_extensions import FILE_EXTENSIONS
+from interlock_tree_parser import process_tree_file, write_item_output
+from mmap_scanner import classify_item_bytes
+from output_sink import open_output_sink
+from path_stack import PathStack
+from synthetic_tree import generate_lines, write_tree_file
+from tree_tokenizer import tokenize_line
+
+
+def legacy_parse_tree_line(line_num, raw_line):
+	"""Original per-line parser, kept as the baseline for comparisons."""
+	content_start_index = 0
+	for i, char in enumerate(raw_line):
+		if char not in [' ', '\xa0', '│', '─', '└', '├', '┬', '┴', '┘', '┌', '┐', '┼']:
+			content_start_index = i
+			break
+	current_indent_level = content_start_index // 4
+	TREE_PREFIX_PATTERN = re.compile(r'^(?:[│─└├\s\xa0]*)(.*)$')
+	content_match = TREE_PREFIX_PATTERN.match(raw_line)
+	if not content_match:
+		return None
+	item_name_raw = content_match.group(1).strip()
+	item_name_cleaned = re.sub(r'\s+', ' ', item_name_raw).strip()
+	return {
+		"line_num": line_num,
+		"raw_line": raw_line,
+		"indent_level": current_indent_level,
+		"item_name": item_name_cleaned
+	}
+
+
+def legacy_write_item_output(output_file, item):
+	"""Original per-item writer, kept as the baseline for comparisons."""
+	output_text = f"Line {item['line_num']} (Level {item['indent_level']}):\n"
+	output_text += f"  Item Name: '{item['item_name']}'\n"
+	output_text += f"  Full Path: '{item['full_path']}'\n"
+	output_text += "-" * 20 + "\n"
+	
+	if output_file:
+		output_file.write(output_text)
+	else:
+		print(output_text.rstrip())
+
+
+def legacy_classify(item_name):
+	"""Original is_file check plus the repeated extension split done by the loop."""
+	clean_name = re.sub(r'\s*\([^)]*\)$', '', item_name)
+	if '.' in clean_name and '.' + clean_name.split('.')[-1].lower() in FILE_EXTENSIONS:
+		clean_name = re.sub(r'\s*\([^)]*\)$', '', item_name)
+		return True, clean_name.split('.')[-1].lower()
+	return False, None
+
+
+def legacy_update_path(current_path, item, current_indent_level):
+	"""Original path builder, kept as the baseline for comparisons."""
+	while len(current_path) > current_indent_level:
+		current_path.pop()
+	while len(current_path) < current_indent_level:
+		current_path.append("")
+	if len(current_path) == current_indent_level:
+		current_path.append(item['item_name'])
+	else:
+		current_path[current_indent_level] = item['item_name']
+	return "/".join(current_path)
+
+
+def legacy_process_tree_file(file_path, files_only, output_file_path):
+	"""Original parsing loop and statistics, kept as the baseline for end-to-end comparisons."""
+	with open(output_file_path, 'w', encoding='utf-8') as output_file:
+		output_file.write(f"\n--- {'Files Only' if files_only else 'All Items'} ---\n")
+		current_path = []
+		files_count = 0
+		total_lines_processed = 0
+		extensions = defaultdict(int)
+		with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+			for raw_line in f:
+				total_lines_processed += 1
+				raw_line = raw_line.rstrip('\n\r')
+				if not raw_line.strip():
+					continue
+				item = legacy_parse_tree_line(total_lines_processed, raw_line)
+				if not item:
+					continue
+				item['full_path'] = legacy_update_path(current_path, item, item['indent_level'])
+				item_is_file, extension = legacy_classify(item['item_name'])
+				if item_is_file:
+					files_count += 1
+					extensions[extension] += 1
+					if files_only:
+						legacy_write_item_output(output_file, item)
+				elif not files_only:
+					legacy_write_item_output(output_file, item)
+
+		stats_text = f"\n=== Final Statistics ===\n"
+		stats_text += f"Total lines processed: {total_lines_processed:,}\n"
+		stats_text += f"Files found: {files_count:,}\n"
+		if extensions and files_only:
+			stats_text += f"\nFile types found:\n"
+			for ext, count in sorted(extensions.items(), key=lambda x: x[1], reverse=True):
+				stats_text += f"  .{ext}: {count:,} files\n"
+		output_file.write(stats_text)
+
+
+def make_lines(count, seed=1, max_depth=12):
+	"""Build a deterministic list of well-formed Interlock-style tree lines."""
+	return list(generate_lines(count, seed, max_depth))
+
+
+def time_lines_per_sec(func, lines, repeat):
+	"""Return the best lines/sec figure for func over repeat runs."""
+	best = None
+	for _ in range(repeat):
+		start = time.perf_counter()
+		func(lines)
+		elapsed = time.perf_counter() - start
+		best = elapsed if best is None else min(best, elapsed)
+	return len(lines) / best
+
+
+def bench_tokenizer(args):
+	"""Compare tokenize_line against the original parse_tree_line."""
+	lines = make_lines(args.lines)
+
+	for line_num, raw_line in enumerate(lines, 1):
+		legacy = legacy_parse_tree_line(line_num, raw_line)
+		assert (legacy['indent_level'], legacy['item_name']) == tokenize_line(raw_line), raw_line
+
+	def run_legacy(lines):
+		for line_num, raw_line in enumerate(lines, 1):
+			legacy_parse_tree_line(line_num, raw_line)
+
+	def run_tokenizer(lines):
+		for raw_line in lines:
+			tokenize_line(raw_line)
+
+	legacy_rate = time_lines_per_sec(run_legacy, lines, args.repeat)
+	new_rate = time_lines_per_sec(run_tokenizer, lines, args.repeat)
+	print(f"legacy parse_tree_line: {legacy_rate:>12,.0f} lines/sec")
+	print(f"tokenize_line:          {new_rate:>12,.0f} lines/sec")
+	print(f"speedup:                {new_rate / legacy_rate:>12.1f}x")
+
+
+def evict_page_cache(path):
+	"""Ask the kernel to drop a file's cached pages so the next read is cold."""
+	with open(path, 'rb') as f:
+		os.fsync(f.fileno())
+		os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+
+def time_cold(func, path, repeat):
+	"""Return the best wall-clock time for func(path) with a cold page cache."""
+	best = None
+	for _ in range(repeat):
+		evict_page_cache(path)
+		start = time.perf_counter()
+		func(path)
+		elapsed = time.perf_counter() - start
+		best = elapsed if best is None else min(best, elapsed)
+	return best
+
+def bench_progress(args):
+	"""Compare the old count-then-parse passes with a single byte-offset driven pass."""
+	def two_passes(path):
+		with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+			total_lines = sum(1 for _ in f)
+		with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+			for line_num, raw_line in enumerate(f, 1):
+				position = line_num / total_lines
+	
+	def one_pass(path):
+		file_size = os.path.getsize(path)
+		with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+			for raw_line in f:
+				position = f.buffer.tell() / file_size
+	
+	with tempfile.TemporaryDirectory() as tmp_dir:
+		path = args.file
+		if not path:
+			path = os.path.join(tmp_dir, 'tree.txt')
+			write_tree_file(path, args.lines)
+		
+		print(f"input: {path} ({os.path.getsize(path):,} bytes, cold page cache)")
+		two_pass_time = time_cold(two_passes, path, args.repeat)
+		one_pass_time = time_cold(one_pass, path, args.repeat)
+		print(f"line count + parse pass: {two_pass_time:>8.3f}s")
+		print(f"single byte-offset pass: {one_pass_time:>8.3f}s")
+		print(f"wall-clock reduction:    {(1 - one_pass_time / two_pass_time) * 100:>7.1f}%")
+
+def make_items(count):
+	"""Build item dicts shaped like the ones the parser writes out."""
+	return [{
+		"line_num": line_num,
+		"indent_level": 4,
+		"item_name": f"file_{line_num}.pdf (12 KB)",
+		"full_path": f"Finance/2023/Invoices/Scans/file_{line_num}.pdf (12 KB)"
+	} for line_num in range(1, count + 1)]
+
+def bench_output(args):
+	"""Compare the original per-item writes with the batched output sink."""
+	items = make_items(args.lines)
+	
+	def run_legacy(path):
+		output_file = open(path, 'w', encoding='utf-8') if path else None
+		for item in items:
+			legacy_write_item_output(output_file, item)
+			if output_file and item['line_num'] % 10000 == 0:
+				output_file.flush()
+		if output_file:
+			output_file.close()
+	
+	def run_sink(path):
+		output = open_output_sink(path)
+		for item in items:
+			write_item_output(output, item)
+		output.close()
+	
+	def timed(func, path):
+		best = None
+		for _ in range(args.repeat):
+			start = time.perf_counter()
+			func(path)
+			elapsed = time.perf_counter() - start
+			best = elapsed if best is None else min(best, elapsed)
+		return best
+	
+	with tempfile.TemporaryDirectory() as tmp_dir:
+		targets = [
+			('console', None),
+			('file', os.path.join(tmp_dir, 'out.txt')),
+			('/dev/null', os.devnull)
+		]
+		results = [(name, timed(run_legacy, path), timed(run_sink, path)) for name, path in targets]
+	
+	# Results go to stderr so they survive stdout being used as the console target
+	for name, legacy_time, sink_time in results:
+		print(f"{name:<10} legacy {len(items) / legacy_time:>12,.0f} items/sec   "
+			  f"sink {len(items) / sink_time:>12,.0f} items/sec   "
+			  f"{legacy_time / sink_time:.1f}x", file=sys.stderr)
+
+def bench_paths(args):
+	"""Compare rebuilding every path with update_path against PathStack."""
+	# Directories wander up and down, files are leaves under the current directory
+	rng = random.Random(1)
+	tokens = []
+	emitted = []
+	depth = 0
+	for line_num in range(args.lines):
+		if rng.random() < 0.15:
+			depth = max(0, min(args.depth, depth + rng.choice((-2, -1, 1, 1))))
+			tokens.append((depth, f"Folder_{rng.randrange(50)}"))
+			emitted.append(False)
+		else:
+			tokens.append((depth + 1, f"file_{line_num}.pdf"))
+			emitted.append(True)
+	
+	current_path = []
+	path_stack = PathStack()
+	for indent_level, item_name in tokens:
+		path_stack.update(indent_level, item_name)
+		expected = legacy_update_path(current_path, {'item_name': item_name}, indent_level)
+		assert path_stack.full_path() == expected, expected
+	
+	def run_legacy(tokens):
+		current_path = []
+		for (indent_level, item_name), emit in zip(tokens, emitted):
+			full_path = legacy_update_path(current_path, {'item_name': item_name}, indent_level)
+	
+	def run_stack(tokens):
+		path_stack = PathStack()
+		for (indent_level, item_name), emit in zip(tokens, emitted):
+			path_stack.update(indent_level, item_name)
+			if emit:
+				full_path = path_stack.full_path()
+	
+	legacy_rate = time_lines_per_sec(run_legacy, tokens, args.repeat)
+	stack_rate = time_lines_per_sec(run_stack, tokens, args.repeat)
+	print(f"max depth {args.depth}, {sum(emitted) / len(tokens):.0%} of items emitted (files only)")
+	print(f"legacy update_path: {legacy_rate:>12,.0f} lines/sec")
+	print(f"PathStack:          {stack_rate:>12,.0f} lines/sec")
+	print(f"speedup:            {stack_rate / legacy_rate:>12.1f}x")
+
+def bench_classify(args):
+	"""Compare the regex is_file plus extension split with classify_item."""
+	names = [tokenize_line(raw_line)[1] for raw_line in make_lines(args.lines)]
+	names += ['(a.pdf)', 'a.pdf (1) (2 KB)', '.gitignore', 'x.PDF  (3 MB)', 'no_ext (1 KB)', 'a.b)']
+	
+	for item_name in names:
+		item_is_file, extension, _ = classify_item(item_name)
+		assert (item_is_file, extension) == legacy_classify(item_name), item_name
+		assert classify_item_bytes(item_name.encode('utf-8')) == classify_item(item_name), item_name
+	
+	def run_legacy(names):
+		for item_name in names:
+			legacy_classify(item_name)
+	
+	def run_classify(names):
+		for item_name in names:
+			classify_item(item_name)
+	
+	legacy_rate = time_lines_per_sec(run_legacy, names, args.repeat)
+	classify_rate = time_lines_per_sec(run_classify, names, args.repeat)
+	print(f"legacy is_file + split: {legacy_rate:>12,.0f} names/sec")
+	print(f"classify_item:          {classify_rate:>12,.0f} names/sec")
+	print(f"speedup:                {classify_rate / legacy_rate:>12.1f}x")
+
+# Parser modes compared end to end: name -> (process_tree_file keywords, command line options)
+# The default mode runs with no options, detecting the dialect like the command line does
+PARSER_MODES = {
+	'default': ({'dialect': AUTO_DIALECT}, []),
+	'text': ({'dialect': 'interlock'}, ['--dialect', 'interlock']),
+	'mmap': ({'dialect': 'interlock', 'use_mmap': True}, ['--dialect', 'interlock', '--mmap']),
+	'batch': ({'dialect': 'interlock', 'batch': True}, ['--dialect', 'interlock', '--batch']),
+}
+
+def parser_modes(args):
+	"""Return the PARSER_MODES that can run here, plus args.workers worker processes."""
+	modes = dict(PARSER_MODES)
+	if not HAS_PYARROW:
+		del modes['batch']
+	modes['workers'] = ({'dialect': 'interlock', 'workers': args.workers}, ['--dialect', 'interlock', '--workers', str(args.workers)])
+	return modes
+
+def synthetic_tree_file(args, tmp_dir):
+	"""Return args.file, or the path of a synthetic listing written to tmp_dir."""
+	if args.file:
+		return args.file
+	path = os.path.join(tmp_dir, 'tree.txt')
+	write_tree_file(path, args.lines, max_depth=args.depth, malformed_ratio=args.malformed)
+	return path
+
+def run_measured(command):
+	"""Run command, returning (wall-clock seconds, peak resident memory in MB)."""
+	start = time.perf_counter()
+	process = subprocess.Popen(command, cwd=os.path.dirname(os.path.abspath(__file__)),
+							   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+	_, status, usage = os.wait4(process.pid, 0)
+	elapsed = time.perf_counter() - start
+	process.returncode = os.waitstatus_to_exitcode(status)
+	if process.returncode:
+		raise RuntimeError(f"{' '.join(command)} exited with status {process.returncode}")
+	# ru_maxrss is in kilobytes on Linux
+	return elapsed, usage.ru_maxrss / 1024
+
+def bench_pipeline(args):
+	"""Time whole runs of the original loop and each parser mode, with their peak memory."""
+	with tempfile.TemporaryDirectory() as tmp_dir:
+		path = synthetic_tree_file(args, tmp_dir)
+		output_path = os.path.join(tmp_dir, 'out.txt')
+		file_size = os.path.getsize(path)
+		with open(path, 'rb') as f:
+			line_count = sum(1 for _ in f)
+
+		commands = {}
+		for files_only in (False, True):
+			suffix = ' --files-only' if files_only else ''
+			commands['legacy' + suffix] = [sys.executable, '-c',
+										   f"import benchmark; benchmark.legacy_process_tree_file({path!r}, {files_only}, {output_path!r})"]
+			for name, (_, options) in parser_modes(args).items():
+				commands[name + suffix] = [sys.executable, 'interlock_tree_parser.py', path, '--no-cache',
+										   '--progress', 'none', '-o', output_path] + options + suffix.split()
+
+		print(f"input: {path} ({line_count:,} lines, {file_size:,} bytes)")
+		for name, command in commands.items():
+			runs = [run_measured(command) for _ in range(args.repeat)]
+			best = min(elapsed for elapsed, _ in runs)
+			peak = max(peak for _, peak in runs)
+			print(f"{name:<21} {best:>8.3f}s {line_count / best:>12,.0f} lines/sec {file_size / best / 2**20:>8.1f} MB/s {peak:>8.1f} MB peak")
+
+def bench_equivalence(args):
+	"""Check every parser mode writes what the original loop wrote, for all items and files only.
+
+	The original statistics must be a prefix of the new ones, which add size
+	and directory sections after them.
+	"""
+	failures = 0
+	with tempfile.TemporaryDirectory() as tmp_dir:
+		path = synthetic_tree_file(args, tmp_dir)
+		output_path = os.path.join(tmp_dir, 'out.txt')
+		for files_only in (False, True):
+			legacy_process_tree_file(path, files_only, output_path)
+			with open(output_path, encoding='utf-8') as f:
+				expected = f.read()
+
+			for name, (options, _) in parser_modes(args).items():
+				with contextlib.redirect_stderr(io.StringIO()):
+					process_tree_file(path, files_only, output_file_path=output_path, progress='none', **options)
+				with open(output_path, encoding='utf-8') as f:
+					actual = f.read()
+
+				label = f"{name}{' --files-only' if files_only else ''}"
+				if actual.startswith(expected):
+					print(f"{label:<21} same as the original ({expected.count(chr(10)):,} lines)")
+					continue
+				failures += 1
+				for line_num, (expected_line, actual_line) in enumerate(zip(expected.splitlines(), actual.splitlines()), 1):
+					if expected_line != actual_line:
+						print(f"{label:<21} DIFFERS at output line {line_num}: {expected_line!r} != {actual_line!r}")
+						break
+				else:
+					print(f"{label:<21} DIFFERS: output ends early")
+	if failures:
+		sys.exit(1)
+
+
+BENCHMARKS = {
+	'classify': bench_classify,
+	'equivalence': bench_equivalence,
+	'output': bench_output,
+	'paths': bench_paths,
+	'pipeline': bench_pipeline,
+	'progress': bench_progress,
+	'tokenizer': bench_tokenizer,
+}
+
+
+def main():
+	parser = argparse.ArgumentParser(description='Micro-benchmarks for the tree parser')
+	parser.add_argument('benchmark', choices=sorted(BENCHMARKS), help='Benchmark to run')
+	parser.add_argument('--lines', type=int, default=200000,
+					   help='Number of synthetic lines to generate (default: 200000)')
+	parser.add_argument('--repeat', type=int, default=3,
+					   help='Number of timed runs, best is reported (default: 3)')
+	parser.add_argument('--depth', type=int, default=25,
+					   help='Maximum tree depth for synthetic lines in the paths, pipeline and equivalence benchmarks (default: 25)')
+	parser.add_argument('--malformed', type=float, default=0.01,
+					   help='Share of malformed lines in synthetic files for pipeline and equivalence (default: 0.01)')
+	parser.add_argument('--workers', type=int, default=2,
+					   help='Worker processes for the workers mode of pipeline and equivalence (default: 2)')
+	parser.add_argument('--file', type=str,
+					   help='Use an existing tree file instead of synthetic lines where supported')
+
+	args = parser.parse_args()
+	BENCHMARKS[args.benchmark](args)
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,80 @@
+"""Periodic checkpoints so an interrupted text-mode run can be resumed.
+
+A checkpoint is taken between blocks of whole lines. It records the input
+byte offset reached, the current path, what the dialect remembers between
+lines, the interned folder names, every counter in the stats dict and the
+output file position after flushing. It is written to a temporary file and
+renamed over the previous one, so a crash never leaves a torn checkpoint.
+Resuming truncates the output back to the recorded position and carries on
+from the recorded offset, giving the same output as a run that was never
+interrupted.
+"""
+import json
+import os
+import time
+
+from parse_cache import stats_from_json, stats_to_json
+
+# Seconds between checkpoints
+DEFAULT_CHECKPOINT_INTERVAL = 60
+
+CHECKPOINT_SUFFIX = '.checkpoint'
+
+
+class Checkpointer:
+	"""Writes and reads the checkpoint file kept next to an output file."""
+
+	def __init__(self, output_file_path, identity, interval=DEFAULT_CHECKPOINT_INTERVAL):
+		self.checkpoint_path = output_file_path + CHECKPOINT_SUFFIX
+		# OutputSink to flush before saving, set once the output is open
+		self.output = None
+		# Input file and options the checkpoint is only valid for
+		self.identity = identity
+		self.interval = interval
+		self.next_save = time.monotonic() + interval
+
+	def due(self):
+		"""Return True once interval seconds have passed since the last checkpoint."""
+		return time.monotonic() >= self.next_save
+
+	def save(self, offset, path_names, stats, dialect_state=None, interned=None):
+		"""Flush the output and atomically record the state at input byte offset."""
+		self.output.flush()
+		checkpoint = {
+			"identity": self.identity,
+			"offset": offset,
+			"output_position": self.output.stream.tell(),
+			"path": path_names,
+			"dialect_state": dialect_state,
+			"interned": interned or [],
+			"stats": stats_to_json(stats)
+		}
+		temporary_path = self.checkpoint_path + '.tmp'
+		with open(temporary_path, 'w', encoding='utf-8') as f:
+			json.dump(checkpoint, f)
+			f.flush()
+			os.fsync(f.fileno())
+		os.replace(temporary_path, self.checkpoint_path)
+		self.next_save = time.monotonic() + self.interval
+
+	def load(self):
+		"""Return (offset, output_position, path_names, dialect_state, interned, stats) from the checkpoint file.
+
+		Raises ValueError if there is no usable checkpoint for this input and options.
+		"""
+		try:
+			with open(self.checkpoint_path, encoding='utf-8') as f:
+				checkpoint = json.load(f)
+		except FileNotFoundError:
+			raise ValueError(f"no checkpoint found at {self.checkpoint_path}")
+		if checkpoint['identity'] != self.identity:
+			raise ValueError(f"{self.checkpoint_path} was written for a different input file or options")
+		return (checkpoint['offset'], checkpoint['output_position'], checkpoint['path'], checkpoint['dialect_state'],
+				checkpoint['interned'], stats_from_json(checkpoint['stats']))
+
+	def remove(self):
+		"""Delete the checkpoint once the run has completed."""
+		try:
+			os.remove(self.checkpoint_path)
+		except FileNotFoundError:
+			pass
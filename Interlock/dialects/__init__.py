@@ -0,0 +1,37 @@
+"""Tree listing dialects: how the lines of each listing format become items.
+
+Every dialect feeds the same pipeline (classification, paths, statistics,
+output writers, checkpoints and the parse cache), so supporting another
+format means writing a small TreeDialect subclass in a module here and
+registering it in DIALECTS. dialects.detect picks the dialect for a file
+by sampling it.
+"""
+from dialects.base import SectionDialect, TreeDialect
+from dialects.dir_listing import DirListingDialect
+from dialects.gnu_tree import GnuTreeDialect
+from dialects.interlock import InterlockDialect
+from dialects.ls_recursive import LsRecursiveDialect
+from dialects.windows_tree import WindowsTreeDialect
+
+DIALECTS = {
+	'interlock': InterlockDialect,
+	'windows-tree': WindowsTreeDialect,
+	'gnu-tree': GnuTreeDialect,
+	'ls-r': LsRecursiveDialect,
+	'dir-s': DirListingDialect,
+}
+
+DEFAULT_DIALECT = 'interlock'
+
+
+def make_dialect(dialect=DEFAULT_DIALECT, indent_width=None):
+	"""Return a TreeDialect instance, given one or a DIALECTS name.
+
+	indent_width only applies to dialects whose indentation can vary.
+	"""
+	if isinstance(dialect, TreeDialect):
+		return dialect
+	dialect_class = DIALECTS[dialect]
+	if indent_width is None or dialect_class.indent_width is None:
+		return dialect_class()
+	return dialect_class(indent_width)
@@ -0,0 +1,162 @@
+"""Base class shared by the tree listing dialects."""
+import io
+
+from classifier import classify_item
+from sizes import parse_size
+from tree_input import BLOCK_SIZE
+
+# Characters per indentation unit in the tree-drawing dialects
+UNIT_WIDTH = 4
+
+
+def split_indent_units(raw_line, units, unit_width=UNIT_WIDTH):
+	"""Return (indent_level, rest) after stripping leading units of unit_width characters."""
+	indent_level = 0
+	position = 0
+	while raw_line[position:position + unit_width] in units:
+		position += unit_width
+		indent_level += 1
+	return indent_level, raw_line[position:]
+
+def non_blank(lines):
+	"""Return the lines of a sample that are not blank."""
+	return [raw_line for raw_line in lines if raw_line.strip()]
+
+def fully_indented(raw_line, units, glyphs):
+	"""Return True if raw_line's prefix is made entirely of units (no glyphs left over)."""
+	return split_indent_units(raw_line, units)[1][:1] not in glyphs
+
+def common_prefix_length(names, other_names):
+	"""Return how many leading names two lists share."""
+	length = 0
+	for name, other_name in zip(names, other_names):
+		if name != other_name:
+			break
+		length += 1
+	return length
+
+
+class TreeDialect:
+	"""Turns the lines of one listing format into (indent_level, item_name) items.
+
+	Formats that draw a tree, one item per line, only implement tokenize_line.
+	Formats that print a directory header followed by its entries override
+	iter_items and keep the current directory between lines; state() and
+	restore() let a checkpoint carry it.
+	"""
+
+	name = None
+	description = ""
+	# Every line can be tokenized on its own, so the file can be split between workers
+	stateless = True
+	# Characters per level when the format lets it vary, None when it is fixed
+	indent_width = None
+	# Bytes of whole lines handed to iter_block_items at a time
+	block_size = BLOCK_SIZE
+
+	def __init__(self):
+		# Lines read so far, blank and skipped lines included
+		self.line_count = 0
+
+	def tokenize_line(self, raw_line):
+		"""Return (indent_level, item_name) for a non-blank line, or None to skip it."""
+		raise NotImplementedError
+
+	def iter_items(self, lines):
+		"""Yield (line_num, indent_level, item_name) for the items in decoded lines."""
+		tokenize_line = self.tokenize_line
+		line_num = self.line_count
+		try:
+			for raw_line in lines:
+				line_num += 1
+				raw_line = raw_line.rstrip('\n\r')
+				if not raw_line.strip():
+					continue
+				token = tokenize_line(raw_line)
+				if token is not None:
+					yield line_num, token[0], token[1]
+		finally:
+			self.line_count = line_num
+
+	def iter_block_items(self, block):
+		"""Yield (line_num, indent_level, item_name, is_file, extension, size) for a block of UTF-8 lines.
+
+		The lines are decoded the way a text-mode file would be, and each item
+		classified with its size annotation parsed to bytes.
+		"""
+		lines = io.TextIOWrapper(io.BytesIO(block), encoding='utf-8', errors='ignore')
+		for line_num, indent_level, item_name in self.iter_items(lines):
+			item_is_file, ext, size_annotation = classify_item(item_name)
+			yield line_num, indent_level, item_name, item_is_file, ext, parse_size(size_annotation) if size_annotation else None
+
+	@classmethod
+	def sniff(cls, lines):
+		"""Return the fraction (0 to 1) of a sample's non-blank lines that look like this format.
+
+		lines are decoded lines, blank ones included; formats without their
+		distinctive markers in the sample score 0.
+		"""
+		return 0.0
+
+	def state(self):
+		"""Return what the dialect remembers between lines, as JSON-compatible data."""
+		return None
+
+	def restore(self, state):
+		"""Continue from a state() taken earlier in the same input."""
+
+
+class SectionDialect(TreeDialect):
+	"""Listings made of sections: a header naming a directory, then its entries.
+
+	A header emits the directories of its path that differ from the previous
+	header as items, so entries land at the header's depth with full paths.
+	Directory entries are skipped, as every directory has its own section.
+	"""
+
+	stateless = False
+
+	def __init__(self):
+		super().__init__()
+		# Path components of the current section's directory
+		self.directory = []
+		self.after_blank = True
+
+	def header_components(self, raw_line, after_blank):
+		"""Return the directory path components if raw_line is a section header, else None."""
+		raise NotImplementedError
+
+	def entry_name(self, raw_line):
+		"""Return the item name for a file entry line, or None to skip the line."""
+		raise NotImplementedError
+
+	def iter_items(self, lines):
+		line_num = self.line_count
+		try:
+			for raw_line in lines:
+				line_num += 1
+				raw_line = raw_line.rstrip('\n\r')
+				if not raw_line.strip():
+					self.after_blank = True
+					continue
+				after_blank, self.after_blank = self.after_blank, False
+
+				components = self.header_components(raw_line, after_blank)
+				if components is not None:
+					for indent_level in range(common_prefix_length(components, self.directory), len(components)):
+						yield line_num, indent_level, components[indent_level]
+					self.directory = components
+					continue
+
+				item_name = self.entry_name(raw_line)
+				if item_name:
+					yield line_num, len(self.directory), item_name
+		finally:
+			self.line_count = line_num
+
+	def state(self):
+		return {"directory": self.directory, "after_blank": self.after_blank}
+
+	def restore(self, state):
+		self.directory = list(state['directory'])
+		self.after_blank = state['after_blank']
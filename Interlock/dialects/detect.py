@@ -0,0 +1,140 @@
+"""Dialect, indent width and encoding detection from samples of a tree file.
+
+The head of the file, a few seeded random offsets and the tail are read
+(only the head for compressed or UTF-16 input, which can't be entered part
+way). The encoding comes from a byte order mark, NUL byte patterns or
+whether the sample is valid UTF-8. Every registered dialect then scores the
+decoded sample with its sniff() classmethod. A format with its own markers
+(tree /F connectors, ls -R headers, ...) wins over the Interlock default
+once it recognizes at least MIN_SCORE of the lines, and for Interlock
+listings the indent width is inferred too.
+"""
+import codecs
+import random
+import re
+
+from dialects import DEFAULT_DIALECT, DIALECTS, make_dialect
+from tree_input import DEFAULT_ENCODING, STDIN_PATH, open_tree_input
+
+# Bytes read per sample and the number of samples taken between head and tail
+SAMPLE_SIZE = 64 * 1024
+SAMPLE_COUNT = 4
+
+# Share of non-blank sample lines a specialised dialect must recognize
+MIN_SCORE = 0.5
+
+BYTE_ORDER_MARKS = (
+	(codecs.BOM_UTF8, 'utf-8'),
+	(codecs.BOM_UTF16_LE, 'utf-16'),
+	(codecs.BOM_UTF16_BE, 'utf-16'),
+)
+
+# │ ├ └ ─ ┴ ┼ in code page 437/850, as written by `tree /F > file` in cmd. Only
+# bytes that aren't part of a valid UTF-8 sequence count, and ┬ (0xc2, the
+# UTF-8 lead byte of the non-breaking spaces in Interlock indents) is left out
+OEM_BOX_BYTES = frozenset(b'\xb3\xc3\xc0\xc4\xc1\xc5')
+
+# Share of the non-ASCII characters that may be invalid UTF-8 bytes in a UTF-8
+# listing; leak dumps have the odd broken name, which parsing skips like before
+MAX_INVALID_UTF8 = 0.02
+
+# Bytes that aren't valid UTF-8, as decoded with errors='surrogateescape'
+INVALID_UTF8 = re.compile('[\udc80-\udcff]')
+NON_ASCII = re.compile('[^\x00-\x7f]')
+
+# Value for the dialect option that asks for detection
+AUTO_DIALECT = 'auto'
+
+
+class Detection:
+	"""Listing format, indent width and encoding inferred for a file."""
+
+	def __init__(self, dialect, indent_width, encoding, confidence, scores):
+		self.dialect = dialect
+		self.indent_width = indent_width
+		self.encoding = encoding
+		self.confidence = confidence
+		# sniff() score of every registered dialect
+		self.scores = scores
+
+	def make_dialect(self):
+		"""Return a TreeDialect instance for the detected format."""
+		return make_dialect(self.dialect, self.indent_width)
+
+	def describe(self):
+		width_text = f", {self.indent_width} characters per level" if self.indent_width is not None else ""
+		return f"{self.dialect}{width_text}, {self.encoding} (confidence {self.confidence:.0%})"
+
+
+def read_samples(file_path, sample_size=SAMPLE_SIZE, sample_count=SAMPLE_COUNT):
+	"""Return (head, samples): the first bytes of the file and byte samples of whole lines."""
+	with open_tree_input(file_path) as f:
+		head = f.read(sample_size)
+		samples = [head[:head.rfind(b'\n') + 1] or head]
+		if f.compression is not None or f.size <= sample_size * (sample_count + 2):
+			return head, samples
+
+		# Seeded so the same file always gives the same answer
+		offsets = random.Random(f.size).sample(range(sample_size, f.size - 2 * sample_size), sample_count)
+		for offset in sorted(offsets) + [f.size - sample_size]:
+			f.seek(offset)
+			sample = f.read(sample_size)
+			# Drop the partial first line, and the partial last one unless at the end
+			sample = sample[sample.find(b'\n') + 1:]
+			if offset + sample_size < f.size:
+				sample = sample[:sample.rfind(b'\n') + 1]
+			samples.append(sample)
+	return head, samples
+
+def detect_encoding(head):
+	"""Return (encoding, confidence) for the first bytes of a file."""
+	for byte_order_mark, encoding in BYTE_ORDER_MARKS:
+		if head.startswith(byte_order_mark):
+			return encoding, 1.0
+
+	# UTF-16 text without a byte order mark is mostly ASCII with a NUL in every other byte
+	window = head[:4096]
+	if window.count(0) * 4 > len(window):
+		if window[1::2].count(0) > window[0::2].count(0):
+			return 'utf-16-le', 0.9
+		return 'utf-16-be', 0.9
+
+	# Up to three bytes of a character may be cut off at the end of the sample
+	text = codecs.getincrementaldecoder('utf-8')(errors='surrogateescape').decode(head)
+	invalid = INVALID_UTF8.findall(text)
+	if len(invalid) <= len(NON_ASCII.findall(text)) * MAX_INVALID_UTF8:
+		return DEFAULT_ENCODING, 1.0 if not invalid else 0.9
+	if sum(1 for char in invalid if ord(char) - 0xdc00 in OEM_BOX_BYTES) * 100 > len(head):
+		return 'cp437', 0.8
+	return 'cp1252', 0.6
+
+def decode_samples(head, samples, encoding):
+	"""Return the decoded lines of the samples; UTF-16 only uses the head."""
+	if codecs.lookup(encoding).name.startswith('utf-16'):
+		text = codecs.getincrementaldecoder(encoding)(errors='replace').decode(head)
+		return text.splitlines()
+	lines = []
+	for sample in samples:
+		lines.extend(sample.decode(encoding, errors='ignore').splitlines())
+	return lines
+
+def detect_dialect(file_path):
+	"""Sample file_path and return a Detection of its dialect, indent width and encoding."""
+	if file_path == STDIN_PATH:
+		raise ValueError("dialect detection needs a file, not stdin; pass --dialect")
+
+	head, samples = read_samples(file_path)
+	encoding, encoding_confidence = detect_encoding(head)
+	lines = decode_samples(head, samples, encoding)
+
+	scores = {name: dialect_class.sniff(lines) for name, dialect_class in DIALECTS.items()}
+	specialised = {name: score for name, score in scores.items() if name != DEFAULT_DIALECT}
+	dialect = max(specialised, key=specialised.get) if specialised else DEFAULT_DIALECT
+	if scores[dialect] < MIN_SCORE:
+		dialect = DEFAULT_DIALECT
+
+	indent_width = None
+	if DIALECTS[dialect].indent_width is not None:
+		indent_width, score = DIALECTS[dialect].detect_indent_width(lines)
+		scores[dialect] = score
+	return Detection(dialect, indent_width, encoding, scores[dialect] * encoding_confidence, scores)
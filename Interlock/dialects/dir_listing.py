@@ -0,0 +1,58 @@
+"""Output of the Windows `dir /s` command.
+
+     Directory of C:\\Users\\alice
+
+    01/02/2023  10:00 AM    <DIR>          .
+    01/02/2023  10:00 AM    <DIR>          Documents
+    01/02/2023  10:00 AM             1,234 notes.txt
+                   1 File(s)          1,234 bytes
+
+Header paths are absolute, so the drive is the top level. File sizes become
+size annotations; <DIR>, <JUNCTION> and other bracketed entries are skipped.
+"""
+import re
+
+from dialects.base import SectionDialect, non_blank
+
+HEADER_PATTERN = re.compile(r'\s*Directory of (.+?)\s*$')
+
+# Date, time (12 or 24 hour), then <DIR>-style tag or size with thousands separators, then name
+ENTRY_PATTERN = re.compile(
+	r'\s*\d{1,4}[./-]\d{1,2}[./-]\d{1,4}\s+\d{1,2}:\d\d(?::\d\d)?(?:\s*[AaPp]\.?[Mm]\.?)?\s+'
+	r'(<\w+>|\d{1,3}(?:[,.\xa0\u202f]\d{3})+|\d+)\s+(.*)'
+)
+
+# Summary and volume lines dir prints around the entries
+SUMMARY_PATTERN = re.compile(r'\s*(?:\d[\d,.\xa0\u202f]*\s+(?:File|Dir)\(s\)|Volume |Total Files Listed)')
+
+SEPARATOR_PATTERN = re.compile(r'\D')
+
+
+class DirListingDialect(SectionDialect):
+	"""`dir /s` output: a "Directory of" header before each directory's entries."""
+
+	name = 'dir-s'
+	description = "Windows 'dir /s' output"
+
+	@classmethod
+	def sniff(cls, lines):
+		lines = non_blank(lines)
+		if not any(HEADER_PATTERN.match(raw_line) for raw_line in lines):
+			return 0.0
+		patterns = (HEADER_PATTERN, ENTRY_PATTERN, SUMMARY_PATTERN)
+		return sum(1 for raw_line in lines if any(pattern.match(raw_line) for pattern in patterns)) / len(lines)
+
+	def header_components(self, raw_line, after_blank):
+		header = HEADER_PATTERN.match(raw_line)
+		if header is None:
+			return None
+		return [name for name in header.group(1).split('\\') if name]
+
+	def entry_name(self, raw_line):
+		entry = ENTRY_PATTERN.match(raw_line)
+		if entry is None:
+			return None
+		size, item_name = entry.groups()
+		if size.startswith('<'):
+			return None
+		return f"{item_name.strip()} ({SEPARATOR_PATTERN.sub('', size)})"
@@ -0,0 +1,83 @@
+"""Output of GNU/Linux `tree`, including -s/-h sizes and --charset=ascii.
+
+    .
+    ├── docs
+    │   ├── [ 12K]  manual.pdf
+    │   └── [ 512]  notes.txt
+    └── [1.2M]  archive.zip
+
+    1 directory, 3 files
+
+Sizes printed in brackets become a file's size annotation, so they count
+towards the size statistics like Interlock's "(796 KB)". Directory sizes
+(the size of the directory entry itself) are dropped.
+"""
+import re
+
+from classifier import classify_item
+from dialects.base import TreeDialect, fully_indented, non_blank, split_indent_units
+from sizes import parse_size
+
+# tree 1.8+ pads with no-break spaces
+INDENT_UNITS = frozenset((
+	'├── ', '└── ', '│   ', '    ',
+	'├──\xa0', '└──\xa0', '│\xa0\xa0 ', '\xa0\xa0\xa0 ',
+	'|-- ', '`-- ', '|   ',
+))
+
+# An item line: continuation units, then a connector and a space before the name
+CONNECTOR_PATTERN = re.compile(r'(?:[│|][ \xa0]{3}|[ \xa0]{4})*(?:├──|└──|\|--|`--)[ \xa0]')
+
+# Characters that must not be left over after the indent units
+GLYPHS = frozenset('│├└─|`\xa0')
+
+# The report line tree ends with
+SUMMARY_PATTERN = re.compile(r'\d+ director(?:y|ies)(?:, \d+ files?)?$')
+
+# Bracketed fields before the name: [size], or [permissions user size] and so on
+FIELDS_PATTERN = re.compile(r'\[([^\]]*)\]\s+(.*)')
+
+
+class GnuTreeDialect(TreeDialect):
+	"""`tree` output: one item per line, four characters per level."""
+
+	name = 'gnu-tree'
+	description = "GNU/Linux 'tree' output, optionally with -s/-h sizes or --charset=ascii"
+
+	@classmethod
+	def sniff(cls, lines):
+		"""Interlock listings are drawn the same way, so only claim a sample
+		showing tree's own additions: the summary line, or sizes in brackets
+		on most items. Plain tree output parses the same as Interlock.
+		"""
+		lines = non_blank(lines)
+		connector_lines = [raw_line for raw_line in lines if CONNECTOR_PATTERN.match(raw_line)]
+		if not connector_lines:
+			return 0.0
+		has_summary = any(SUMMARY_PATTERN.match(raw_line) for raw_line in lines)
+		bracketed = sum(1 for raw_line in connector_lines if FIELDS_PATTERN.match(split_indent_units(raw_line, INDENT_UNITS)[1]))
+		if not has_summary and bracketed * 2 <= len(connector_lines):
+			return 0.0
+		recognized = sum(1 for raw_line in lines if fully_indented(raw_line, INDENT_UNITS, GLYPHS) or SUMMARY_PATTERN.match(raw_line))
+		return recognized / len(lines)
+
+	def tokenize_line(self, raw_line):
+		indent_level, item_name = split_indent_units(raw_line, INDENT_UNITS)
+		if indent_level == 0 and SUMMARY_PATTERN.match(item_name):
+			return None
+
+		size = None
+		fields = FIELDS_PATTERN.match(item_name) if item_name.startswith('[') else None
+		if fields:
+			field_values = fields.group(1).split()
+			item_name = fields.group(2)
+			if field_values and parse_size(field_values[-1]) is not None:
+				size = field_values[-1]
+
+		# Symbolic links are printed as "name -> target"
+		item_name = ' '.join(item_name.partition(' -> ')[0].split())
+		if not item_name:
+			return None
+		if size is not None and classify_item(item_name)[0]:
+			item_name = f"{item_name} ({size})"
+		return indent_level, item_name
@@ -0,0 +1,60 @@
+"""Interlock leak site listings, the format this tool was written for."""
+from collections import Counter
+from functools import partial
+
+from dialects.base import TreeDialect
+from tree_tokenizer import INDENT_CHARS, INDENT_WIDTH, tokenize_line
+
+INDENT_STRIP = ''.join(INDENT_CHARS)
+
+
+def indent_widths(lines):
+	"""Return (prefix lengths, step counts) for the non-blank lines of a sample.
+
+	A child line sits exactly one level deeper than the line before it, so the
+	commonest step up in prefix length between neighbouring lines is the width
+	of one level.
+	"""
+	prefix_lengths = []
+	steps = Counter()
+	previous = None
+	for raw_line in lines:
+		content = raw_line.lstrip(INDENT_STRIP)
+		if not content.strip():
+			continue
+		prefix_length = len(raw_line) - len(content)
+		prefix_lengths.append(prefix_length)
+		if previous is not None and prefix_length > previous:
+			steps[prefix_length - previous] += 1
+		previous = prefix_length
+	return prefix_lengths, steps
+
+
+class InterlockDialect(TreeDialect):
+	"""Box-drawing or space indentation, indent_width characters per level."""
+
+	name = 'interlock'
+	description = "Interlock leak listings (box-drawing or space indent)"
+	indent_width = INDENT_WIDTH
+
+	tokenize_line = staticmethod(tokenize_line)
+
+	def __init__(self, indent_width=INDENT_WIDTH):
+		super().__init__()
+		if indent_width != INDENT_WIDTH:
+			self.indent_width = indent_width
+			self.tokenize_line = partial(tokenize_line, indent_width=indent_width)
+
+	@classmethod
+	def detect_indent_width(cls, lines):
+		"""Return (indent_width, fraction of lines whose prefix is a whole number of levels)."""
+		prefix_lengths, steps = indent_widths(lines)
+		if not steps:
+			return INDENT_WIDTH, 1.0 if prefix_lengths else 0.0
+		indent_width = steps.most_common(1)[0][0]
+		whole_levels = sum(1 for prefix_length in prefix_lengths if prefix_length % indent_width == 0)
+		return indent_width, whole_levels / len(prefix_lengths)
+
+	@classmethod
+	def sniff(cls, lines):
+		return cls.detect_indent_width(lines)[1]
@@ -0,0 +1,103 @@
+"""Interlock listings parsed a block at a time with Arrow compute kernels.
+
+InterlockBatchDialect turns a block of lines into an Arrow array and works
+out blank lines, indent levels, item names, size annotations and extensions
+with one kernel call each for the whole block, instead of several str calls
+per line. Extensions and sizes are looked up once per distinct value of the
+dictionary-encoded suffix and annotation columns. Only the path stack, which
+depends on the line before, is left to the caller's loop.
+
+Arrow splits names on ASCII whitespace only, so names with other characters
+(or the \\x1c-\\x1f separators str.split() also breaks on) go through
+tokenize_line and classify_item as before; the output is the same either way.
+"""
+from classifier import classify_item, lookup_extension
+from dialects.interlock import INDENT_STRIP, InterlockDialect
+from sizes import parse_size
+from tree_tokenizer import INDENT_WIDTH, PREFIX_CHARS, WHITESPACE
+
+try:
+	import pyarrow as pa
+	import pyarrow.compute as pc
+	HAS_PYARROW = True
+except ImportError:
+	HAS_PYARROW = False
+
+PREFIX_STRIP = ''.join(PREFIX_CHARS)
+
+# Whitespace str.split() breaks on that Arrow's ASCII whitespace kernels don't
+SEPARATOR_CHARS = '\x1c\x1d\x1e\x1f'
+
+# Same as split_size_annotation: the annotation starts at the first '(' after the previous ')'
+SIZE_ANNOTATION_PATTERN = r' *\([^)]*\)$'
+SIZE_PATTERN = r'\((?P<size>[^)]*)\)$'
+SUFFIX_PATTERN = r'\.(?P<suffix>[^.]*)$'
+
+# Blocks large enough that the per-call cost of the kernels doesn't matter
+BATCH_BLOCK_SIZE = 4 * 1024 * 1024
+
+
+def decode_lines(block):
+	"""Return the lines of a block of UTF-8 bytes, decoded as a text-mode file would."""
+	text = block.decode('utf-8', errors='ignore')
+	if '\r' in text:
+		text = text.replace('\r\n', '\n').replace('\r', '\n')
+	lines = text.split('\n')
+	if not lines[-1]:
+		lines.pop()
+	return lines
+
+def lookup_dictionary(column, lookup):
+	"""Return column's values as a list, mapped through lookup once per distinct value."""
+	encoded = pc.dictionary_encode(column)
+	values = [lookup(value) for value in encoded.dictionary.to_pylist()]
+	# Nulls map to the None appended after the distinct values
+	values.append(None)
+	return list(map(values.__getitem__, pc.fill_null(encoded.indices, len(values) - 1).to_pylist()))
+
+
+class InterlockBatchDialect(InterlockDialect):
+	"""Interlock dialect whose iter_block_items runs on pyarrow.compute."""
+
+	block_size = BATCH_BLOCK_SIZE
+
+	def __init__(self, indent_width=INDENT_WIDTH):
+		if not HAS_PYARROW:
+			raise RuntimeError("pyarrow is required for --batch (pip install pyarrow)")
+		super().__init__(indent_width)
+
+	def iter_block_items(self, block):
+		raw_lines = decode_lines(block)
+		first_line = self.line_count
+		self.line_count += len(raw_lines)
+		if not raw_lines:
+			return
+
+		lines = pa.array(raw_lines, pa.string())
+		non_blank = pc.greater(pc.utf8_length(pc.utf8_ltrim(lines, characters=WHITESPACE)), 0)
+		line_nums = pc.add(pc.indices_nonzero(non_blank), first_line + 1)
+		lines = pc.filter(lines, non_blank)
+
+		# A line made only of tree glyphs has no content to indent
+		content_length = pc.utf8_length(pc.utf8_ltrim(lines, characters=INDENT_STRIP))
+		prefix_length = pc.subtract(pc.utf8_length(lines), content_length)
+		indent_levels = pc.if_else(pc.greater(content_length, 0), pc.divide(prefix_length, self.indent_width), 0)
+
+		raw_names = pc.utf8_ltrim(lines, characters=PREFIX_STRIP)
+		names = pc.binary_join(pc.ascii_split_whitespace(pc.ascii_rtrim_whitespace(raw_names)), ' ')
+		clean_names = pc.replace_substring_regex(names, SIZE_ANNOTATION_PATTERN, '', max_replacements=1)
+		extensions = lookup_dictionary(pc.struct_field(pc.extract_regex(clean_names, SUFFIX_PATTERN), 'suffix'), lookup_extension)
+		sizes = lookup_dictionary(pc.struct_field(pc.extract_regex(names, SIZE_PATTERN), 'size'), parse_size)
+		names = names.to_pylist()
+		is_files = [ext is not None for ext in extensions]
+
+		fallback = pc.invert(pc.string_is_ascii(raw_names))
+		if any(separator in block for separator in SEPARATOR_CHARS.encode()):
+			fallback = pc.or_(fallback, pc.match_substring_regex(raw_names, f'[{SEPARATOR_CHARS}]'))
+		for index in pc.indices_nonzero(fallback).to_pylist():
+			item_name = ' '.join(lines[index].as_py().lstrip(PREFIX_STRIP).split())
+			item_is_file, ext, size_annotation = classify_item(item_name)
+			names[index], is_files[index], extensions[index] = item_name, item_is_file, ext
+			sizes[index] = parse_size(size_annotation) if size_annotation else None
+
+		yield from zip(line_nums.to_pylist(), indent_levels.to_pylist(), names, is_files, extensions, sizes)
@@ -0,0 +1,77 @@
+"""Output of `ls -R` and `ls -lR`.
+
+    .:
+    docs
+    readme.txt
+
+    ./docs:
+    manual.pdf
+
+Each directory's entries follow a "path:" header. With -l the entry type
+and byte size are known; in the short form only names with a known file
+extension are taken as files, since directories show up again as headers.
+"""
+import re
+
+from classifier import classify_item
+from dialects.base import SectionDialect
+from tree_tokenizer import INDENT_CHARS
+
+# Long-format entry: type, permissions, links, owner, group, size, date, name
+LONG_ENTRY_PATTERN = re.compile(
+	r'([-dlpsbc])[-rwxsStT]{9}\S*\s+\d+\s+\S+\s+\S+\s+(\d+)\s+'
+	r'(?:\w+\s+\d+\s+[\d:]+|\d{4}-\d\d-\d\d\s+[\d:.]+(?:\s+[+-]\d{4})?)\s+(.*)'
+)
+
+# Start of a long-format entry, to skip ones LONG_ENTRY_PATTERN can't place (devices)
+LONG_ENTRY_START = re.compile(r'[-dlpsbc][-rwxsStT]{9}\S*\s+\d+\s')
+
+TOTAL_PATTERN = re.compile(r'total \d+$')
+
+
+class LsRecursiveDialect(SectionDialect):
+	"""`ls -R` output: a "path:" header before each directory's entries."""
+
+	name = 'ls-r'
+	description = "'ls -R' or 'ls -lR' output"
+
+	@classmethod
+	def sniff(cls, lines):
+		headers = recognized = total = 0
+		after_blank = True
+		for raw_line in lines:
+			if not raw_line.strip():
+				after_blank = True
+				continue
+			total += 1
+			# Entries and headers start at the margin, unlike tree drawings
+			if raw_line[0] not in INDENT_CHARS:
+				if after_blank and raw_line.endswith(':'):
+					headers += 1
+				recognized += 1
+			after_blank = False
+		return recognized / total if headers else 0.0
+
+	def header_components(self, raw_line, after_blank):
+		if not (after_blank and raw_line.endswith(':')):
+			return None
+		return [name for name in raw_line[:-1].split('/') if name] or ['/']
+
+	def entry_name(self, raw_line):
+		if TOTAL_PATTERN.match(raw_line):
+			return None
+		entry = LONG_ENTRY_PATTERN.match(raw_line)
+		if entry:
+			kind, size, item_name = entry.groups()
+			if kind == '-':
+				return f"{item_name} ({size})"
+			# Symbolic links are printed as "name -> target"
+			return item_name.partition(' -> ')[0] if kind == 'l' else None
+		if LONG_ENTRY_START.match(raw_line):
+			return None
+
+		# Short form: ls -F marks directories with a trailing /
+		item_name = raw_line.strip()
+		if item_name.endswith('/') or not classify_item(item_name)[0]:
+			return None
+		return item_name
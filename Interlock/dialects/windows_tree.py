@@ -0,0 +1,51 @@
+"""Output of the Windows `tree /F` command, with or without /A.
+
+    Folder PATH listing for volume OS
+    Volume serial number is 1234-ABCD
+    C:.
+    │   notes.txt
+    ├───Documents
+    │   │   report.docx
+    │   └───Old
+    │           draft.doc
+    └───Pictures
+            photo.jpg
+
+/A draws the same tree with |, +---, and \\--- instead.
+"""
+import re
+
+from dialects.base import TreeDialect, fully_indented, non_blank, split_indent_units
+
+INDENT_UNITS = frozenset(('│   ', '├───', '└───', '|   ', '+---', '\\---', '    '))
+
+# A folder line: continuation units, then a connector straight before the name
+CONNECTOR_PATTERN = re.compile(r'(?:[│|] {3}| {4})*(?:├───|└───|\+---|\\---)[^─\s]')
+
+# Characters that must not be left over after the indent units
+GLYPHS = frozenset('│├└─|+\\ \xa0')
+
+# Lines tree prints around the listing itself
+HEADER_PATTERN = re.compile(r'(?:Folder PATH listing|Volume serial number is|No subfolders exist|Invalid path)', re.IGNORECASE)
+
+
+class WindowsTreeDialect(TreeDialect):
+	"""`tree /F` output: files of a folder are listed before its subfolders."""
+
+	name = 'windows-tree'
+	description = "Windows 'tree /F' output, box-drawing or /A ASCII"
+
+	@classmethod
+	def sniff(cls, lines):
+		lines = non_blank(lines)
+		if not any(CONNECTOR_PATTERN.match(raw_line) for raw_line in lines):
+			return 0.0
+		return sum(1 for raw_line in lines if fully_indented(raw_line, INDENT_UNITS, GLYPHS)) / len(lines)
+
+	def tokenize_line(self, raw_line):
+		indent_level, item_name = split_indent_units(raw_line, INDENT_UNITS)
+		item_name = ' '.join(item_name.split())
+		# Separator lines between a folder's files and its subfolders are only | characters
+		if not item_name.strip('│|') or (indent_level == 0 and HEADER_PATTERN.match(item_name)):
+			return None
+		return indent_level, item_name
@@ -0,0 +1,73 @@
+"""Extension categories for the statistics, with user overrides.
+
+file_extensions.EXTENSION_CATEGORIES maps every known extension to its
+categories (documents, spreadsheets, email, credentials and keys, ...). A
+categories file can move extensions to other categories or new ones; it is
+read when a run starts, never on import. Category totals are summed from the
+per-extension counters every parse already keeps, so they cost nothing per
+item and come out right for cached, resumed and parallel runs alike.
+"""
+import os
+
+from file_extensions import EXTENSION_CATEGORIES, FILE_EXTENSIONS
+
+# Read at startup when it exists and no other categories file is given
+DEFAULT_CATEGORIES_FILE = os.path.join(os.environ.get('XDG_CONFIG_HOME') or os.path.expanduser('~/.config'), 'interlock', 'categories.txt')
+
+# Category for extensions that have none
+OTHER_CATEGORY = 'other'
+
+
+def read_categories_file(file_path):
+	"""Return {extension: categories} from a file of extensions under "[category]" headers.
+
+	Extensions are separated by commas or whitespace, with or without the
+	dot; blank lines and lines starting with "#" are ignored.
+	"""
+	overrides = {}
+	category = None
+	with open(file_path, encoding='utf-8') as f:
+		for line_num, line in enumerate(f, 1):
+			line = line.strip()
+			if not line or line.startswith('#'):
+				continue
+			if line.startswith('[') and line.endswith(']'):
+				category = line[1:-1].strip()
+				continue
+			if category is None:
+				raise ValueError(f"{file_path}:{line_num}: extensions {line!r} are not under a [category] header")
+			for ext in line.replace(',', ' ').split():
+				ext = ext.lower().lstrip('.')
+				if category not in overrides.get(ext, ()):
+					overrides[ext] = overrides.get(ext, ()) + (category,)
+	return overrides
+
+def load_extension_categories(file_path=None):
+	"""Return the extension -> categories mapping with the overrides of a categories file applied.
+
+	Without file_path, DEFAULT_CATEGORIES_FILE is used if it exists. Every
+	extension the file lists gets exactly the categories it gives it there.
+	"""
+	if file_path is None:
+		if not os.path.exists(DEFAULT_CATEGORIES_FILE):
+			return EXTENSION_CATEGORIES
+		file_path = DEFAULT_CATEGORIES_FILE
+	return {**EXTENSION_CATEGORIES, **read_categories_file(file_path)}
+
+def unknown_extensions(extension_categories):
+	"""Return the mapped extensions the classifier doesn't treat as file types."""
+	return sorted(ext for ext in extension_categories if '.' + ext not in FILE_EXTENSIONS)
+
+def category_totals(extensions, extension_bytes=None, extension_categories=EXTENSION_CATEGORIES):
+	"""Return {category: [files, bytes]} from per-extension file counts and bytes.
+
+	A file whose extension is in several categories counts towards each.
+	"""
+	totals = {}
+	extension_bytes = extension_bytes or {}
+	for ext, count in extensions.items():
+		for category in extension_categories.get(ext) or (OTHER_CATEGORY,):
+			counters = totals.setdefault(category, [0, 0])
+			counters[0] += count
+			counters[1] += extension_bytes.get(ext, 0)
+	return totals
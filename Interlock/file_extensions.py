@@ -1,30 +1,67 @@
-FILE_EXTENSIONS = {
-    '.txt', '.rtf', '.md', '.odt', '.wps', '.wpd', '.log', '.nfo',
-    '.doc', '.docx', '.xls', '.xlsx', '.ppt', '.pptx', '.csv', '.mdb',
-    '.accdb', '.pub', '.vsd', '.msg', '.one', '.xps', '.epub', '.mobi',
-    '.tex', '.ltx', '.pdf', '.psd', '.ai', '.indd', '.eps', '.prproj',
-    '.aep', '.fla', '.swf', '.html', '.htm', '.css', '.js', '.json',
-    '.xml', '.php', '.asp', '.aspx', '.jsp', '.rss', '.atom', '.xhtml',
-    '.webmanifest', '.woff', '.woff2', '.eot', '.ttf', '.otf', '.svg',
-    '.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.tif', '.ico',
-    '.webp', '.heif', '.heic', '.raw', '.dng', '.cr2', '.nef', '.orf',
-    '.sr2', '.icns', '.exr', '.mp3', '.wav', '.aac', '.flac', '.ogg',
-    '.wma', '.m4a', '.aiff', '.aif', '.opus', '.mp4', '.mov', '.avi',
-    '.wmv', '.flv', '.webm', '.mkv', '.3gp', '.mpeg', '.mpg', '.m4v',
-    '.mts', '.ts', '.vob', '.zip', '.rar', '.7z', '.tar', '.gz', '.bz2',
-    '.xz', '.iso', '.img', '.vhd', '.vhdx', '.ova', '.ovf', '.cab',
-    '.zst', '.dmgpart', '.sparseimage', '.exe', '.dll', '.sys', '.msi',
-    '.dmg', '.apk', '.deb', '.rpm', '.bin', '.sh', '.bat', '.cmd',
-    '.ps1', '.kext', '.efi', '.scr', '.py', '.java', '.c', '.cpp',
-    '.cxx', '.cc', '.h', '.hpp', '.cs', '.rb', '.pl', '.go', '.swift',
-    '.kt', '.ts', '.jsx', '.tsx', '.vue', '.rs', '.scala', '.groovy',
-    '.m', '.sql', '.jsonc', '.yml', '.yaml', '.toml', '.conf', '.cfg',
-    '.ini', '.env', '.lock', '.ipynb', '.r', '.rmd', '.jl', '.dart',
-    '.sln', '.csproj', '.vcxproj', '.nix', '.bazel', '.bzl', '.make',
-    '.mk', '.gitattributes', '.gitignore', '.gitmodules', '.fon',
-    '.fnt', '.pfb', '.pfm', '.dwg', '.dxf', '.stl', '.obj', '.fbx',
-    '.blend', '.gcode', '.3mf', '.db', '.sqlite', '.sqlite3', '.ldb',
-    '.dat', '.binlog', '.eml', '.emlx', '.ics', '.torrent', '.url',
-    '.lnk', '.crdownload', '.part', '.vbs', '.wsf', '.reg', '.bak',
-    '.tmp'
+# Category -> extensions of that kind. An extension that means different things is
+# listed under each of them (.ts is TypeScript source and an MPEG transport stream).
+EXTENSION_TAXONOMY = {
+    'documents': (
+        '.txt', '.rtf', '.md', '.odt', '.wps', '.wpd', '.nfo', '.doc', '.docx',
+        '.ppt', '.pptx', '.pub', '.vsd', '.one', '.xps', '.epub', '.mobi', '.tex',
+        '.ltx', '.pdf'
+    ),
+    'spreadsheets': ('.xls', '.xlsx', '.csv'),
+    'databases': (
+        '.mdb', '.accdb', '.sql', '.db', '.sqlite', '.sqlite3', '.ldb', '.mdf',
+        '.ldf', '.dbf'
+    ),
+    'email': ('.msg', '.eml', '.emlx', '.ics', '.pst', '.ost', '.mbox'),
+    'source code': (
+        '.py', '.java', '.c', '.cpp', '.cxx', '.cc', '.h', '.hpp', '.cs', '.rb',
+        '.pl', '.go', '.swift', '.kt', '.ts', '.jsx', '.tsx', '.vue', '.rs',
+        '.scala', '.groovy', '.m', '.r', '.rmd', '.jl', '.dart', '.ipynb', '.js',
+        '.php', '.asp', '.aspx', '.jsp', '.sh', '.bat', '.cmd', '.ps1', '.vbs',
+        '.wsf', '.sln', '.csproj', '.vcxproj', '.nix', '.bazel', '.bzl', '.make',
+        '.mk', '.gitattributes', '.gitignore', '.gitmodules'
+    ),
+    'credentials and keys': (
+        '.env', '.pem', '.pfx', '.p12', '.crt', '.cer', '.ppk', '.kdbx', '.jks',
+        '.keystore', '.gpg', '.asc', '.ovpn'
+    ),
+    'archives': ('.zip', '.rar', '.7z', '.tar', '.gz', '.bz2', '.xz', '.cab', '.zst'),
+    'vm and disk images': (
+        '.iso', '.img', '.vhd', '.vhdx', '.vmdk', '.vdi', '.qcow2', '.vmx', '.ova',
+        '.ovf', '.dmg', '.dmgpart', '.sparseimage'
+    ),
+    'media': (
+        '.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.tif', '.ico', '.webp',
+        '.heif', '.heic', '.raw', '.dng', '.cr2', '.nef', '.orf', '.sr2', '.icns',
+        '.exr', '.svg', '.mp3', '.wav', '.aac', '.flac', '.ogg', '.wma', '.m4a',
+        '.aiff', '.aif', '.opus', '.mp4', '.mov', '.avi', '.wmv', '.flv', '.webm',
+        '.mkv', '.3gp', '.mpeg', '.mpg', '.m4v', '.mts', '.ts', '.vob', '.swf'
+    ),
+    'design': (
+        '.psd', '.ai', '.indd', '.eps', '.prproj', '.aep', '.fla', '.dwg', '.dxf',
+        '.stl', '.obj', '.fbx', '.blend', '.gcode', '.3mf'
+    ),
+    'web': (
+        '.html', '.htm', '.css', '.json', '.jsonc', '.xml', '.rss', '.atom',
+        '.xhtml', '.webmanifest'
+    ),
+    'configuration': ('.yml', '.yaml', '.toml', '.conf', '.cfg', '.ini', '.lock', '.reg'),
+    'fonts': ('.woff', '.woff2', '.eot', '.ttf', '.otf', '.fon', '.fnt', '.pfb', '.pfm'),
+    'executables': (
+        '.exe', '.dll', '.sys', '.msi', '.apk', '.deb', '.rpm', '.bin', '.kext',
+        '.efi', '.scr'
+    ),
+    'backups': ('.bak',),
+    'other': (
+        '.log', '.dat', '.binlog', '.torrent', '.url', '.lnk', '.crdownload',
+        '.part', '.tmp'
+    ),
 }
+
+FILE_EXTENSIONS = {ext for extensions in EXTENSION_TAXONOMY.values() for ext in extensions}
+
+# Extension as the classifier returns it (lower case, no dot) -> its categories
+EXTENSION_CATEGORIES = {}
+for category, extensions in EXTENSION_TAXONOMY.items():
+    for ext in extensions:
+        EXTENSION_CATEGORIES[ext[1:]] = EXTENSION_CATEGORIES.get(ext[1:], ()) + (category,)
+del category, extensions, ext
@@ -1,39 +1,40 @@
 import argparse
-import re
+import os
 import sys
-from collections import defaultdict
-from file_extensions import FILE_EXTENSIONS
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from checkpoint import DEFAULT_CHECKPOINT_INTERVAL, Checkpointer
+from classifier import classify_item
+from dialects import DEFAULT_DIALECT, DIALECTS, make_dialect
+from dialects.detect import AUTO_DIALECT, MIN_SCORE, detect_dialect
+from dialects.interlock_batch import HAS_PYARROW, InterlockBatchDialect
+from extension_categories import DEFAULT_CATEGORIES_FILE, EXTENSION_CATEGORIES, category_totals, load_extension_categories, unknown_extensions
+from item_filter import ItemFilter, parse_depth_range
+from keyword_scanner import DEFAULT_KEYWORD_PATHS, DEFAULT_KEYWORDS_FILE, KeywordHits, KeywordScanner
+from mmap_scanner import MmapLineReader, classify_item_bytes, tokenize_line_bytes
+from output_sink import DEFAULT_BUFFER_SIZE, open_output_sink
+from parse_cache import DEFAULT_CACHE_DIR, DEFAULT_CACHE_MAX_BYTES, ParseCache, decode_path
+from path_stack import PathStack
+from progress import HAS_TQDM, PROGRESS_REPORTERS, Progress, make_progress
+from record_writers import RECORD_WRITERS
+from rollup import DirectoryRollup
+from sizes import add_directory_bytes, add_file_size, directory_totals, format_bytes, histogram_ranges, leading_directories, merge_size_stats, new_size_stats, parse_size
+from string_pool import ChunkNames, StringPool, new_string_stats
+from tree_input import DEFAULT_ENCODING, STDIN_PATH, detect_compression, is_utf8, iter_line_blocks, open_tree_input
+from tree_tokenizer import INDENT_WIDTH, tokenize_line
 
-try:
-	from tqdm import tqdm
-	HAS_TQDM = True
-except ImportError:
-	HAS_TQDM = False
+ITEM_SEPARATOR = "-" * 20
+
+# Part of the parse cache key: bump when a change alters the items or statistics produced
+PARSER_VERSION = 7
+
+# Target size of the byte ranges handed to each worker in parallel mode
+CHUNK_SIZE = 64 * 1024 * 1024
 
 
 def parse_tree_line(line_num, raw_line):
 	"""Parse a single line from tree output and return parsed item info."""
-	# Find the position where the actual content begins
-	content_start_index = 0
-	for i, char in enumerate(raw_line):
-		if char not in [' ', '\xa0', '│', '─', '└', '├', '┬', '┴', '┘', '┌', '┐', '┼']:
-			content_start_index = i
-			break
-	
-	# Determine level based on content_start_index (assuming 4 chars per level)
-	current_indent_level = content_start_index // 4
-
-	# Pattern to extract content after tree characters
-	TREE_PREFIX_PATTERN = re.compile(r'^(?:[│─└├\s\xa0]*)(.*)$')
-	
-	# Extract the content using regex
-	content_match = TREE_PREFIX_PATTERN.match(raw_line)
-	if not content_match:
-		return None
-	
-	# Clean the item name
-	item_name_raw = content_match.group(1).strip()
-	item_name_cleaned = re.sub(r'\s+', ' ', item_name_raw).strip()
+	current_indent_level, item_name_cleaned = tokenize_line(raw_line)
 	
 	return {
 		"line_num": line_num,
@@ -44,57 +45,24 @@ def parse_tree_line(line_num, raw_line):
 
 def is_file(item_name):
 	"""Determine if an item is a file based on its extension."""
-	# Remove size information (anything in parentheses at the end)
-	clean_name = re.sub(r'\s*\([^)]*\)$', '', item_name)
-	
-	# Check if it has a file extension
-	if '.' in clean_name:
-		# Get the extension (everything after the last dot)
-		extension = '.' + clean_name.split('.')[-1].lower()
-		return extension in FILE_EXTENSIONS
-	
-	return False
+	return classify_item(item_name)[0]
 
-def update_path(current_path, item, current_indent_level):
-	"""Update the current path based on indentation level."""
-	# Adjust current_path based on indentation level
-	while len(current_path) > current_indent_level:
-		current_path.pop()
-	
-	# Extend path if we're going deeper
-	while len(current_path) < current_indent_level:
-		current_path.append("")  # This shouldn't happen with proper tree structure
-	
-	# Set or add the current item at the appropriate level
-	if len(current_path) == current_indent_level:
-		current_path.append(item['item_name'])
-	else:
-		current_path[current_indent_level] = item['item_name']
-	
-	return "/".join(current_path)
+def write_item_output(output, item):
+	"""Write item output to the output sink."""
+	output.write(
+		f"Line {item['line_num']} (Level {item['indent_level']}):\n"
+		f"  Item Name: '{item['item_name']}'\n"
+		f"  Full Path: '{item['full_path']}'\n"
+		f"{ITEM_SEPARATOR}\n"
+	)
 
-def write_item_output(output_file, item):
-	"""Write item output to file or console."""
-	output_text = f"Line {item['line_num']} (Level {item['indent_level']}):\n"
-	output_text += f"  Item Name: '{item['item_name']}'\n"
-	output_text += f"  Full Path: '{item['full_path']}'\n"
-	output_text += "-" * 20 + "\n"
-	
-	if output_file:
-		output_file.write(output_text)
-	else:
-		print(output_text.rstrip())
+def write_section_header(output, title):
+	"""Write section header to the output sink."""
+	output.write(f"\n--- {title} ---\n")
 
-def write_section_header(output_file, title):
-	"""Write section header to file or console."""
-	header = f"\n--- {title} ---\n"
-	if output_file:
-		output_file.write(header)
-	else:
-		print(header.rstrip())
-
-def write_statistics(output_file, total_lines, files_count, extensions, files_only):
-	"""Write final statistics to file or console."""
+def write_statistics(output, total_lines, files_count, extensions, files_only, size_stats=None, rollup=None, keyword_hits=None,
+					 extension_categories=EXTENSION_CATEGORIES, string_stats=None):
+	"""Write final statistics to the output sink."""
 	stats_text = f"\n=== Final Statistics ===\n"
 	stats_text += f"Total lines processed: {total_lines:,}\n"
 	stats_text += f"Files found: {files_count:,}\n"
@@ -103,156 +71,781 @@ def write_statistics(output_file, total_lines, files_count, extensions, files_on
 		stats_text += f"\nFile types found:\n"
 		for ext, count in sorted(extensions.items(), key=lambda x: x[1], reverse=True):
 			stats_text += f"  .{ext}: {count:,} files\n"
+		stats_text += format_category_statistics(extensions, size_stats, extension_categories)
 	
-	if output_file:
-		output_file.write(stats_text)
-	else:
-		print(stats_text.rstrip())
+	if size_stats and size_stats['sized_files']:
+		stats_text += format_size_statistics(size_stats)
+	
+	if rollup is not None:
+		stats_text += format_rollup_statistics(rollup, size_stats and size_stats['sized_files'])
+	
+	if keyword_hits is not None:
+		stats_text += format_keyword_statistics(keyword_hits)
+	
+	if string_stats and string_stats['repeats']:
+		stats_text += (f"\nFolder names: {string_stats['unique']:,} distinct, {string_stats['repeats']:,} repeats shared "
+					   f"({format_bytes(string_stats['saved_bytes'])} of duplicate strings freed)\n")
+	
+	output.write(stats_text)
 
-def get_file_line_count(file_path):
-	"""Get total line count for progress bar."""
-	try:
-		with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-			return sum(1 for _ in f)
-	except:
-		return None
+def format_category_statistics(extensions, size_stats, extension_categories):
+	"""Format file counts and, if sizes are known, bytes per extension category."""
+	include_bytes = size_stats and size_stats['sized_files']
+	totals = category_totals(extensions, size_stats['extension_bytes'] if include_bytes else None, extension_categories)
+	stats_text = f"\nFile categories:\n"
+	for category, (count, size) in sorted(totals.items(), key=lambda x: x[1][0], reverse=True):
+		size_text = f", {format_bytes(size)}" if include_bytes else ""
+		stats_text += f"  {category}: {count:,} files{size_text}\n"
+	shared = sorted(ext for ext in extensions if len(extension_categories.get(ext) or ()) > 1)
+	if shared:
+		stats_text += f"  (files with {', '.join('.' + ext for ext in shared)} count towards each of their categories)\n"
+	return stats_text
 
-def process_tree_file(file_path, files_only=False, progress_interval=50000, output_file_path=None, use_tqdm=None):
-	"""Process tree file in streaming mode with progress display."""
-	print(f"Processing file: {file_path}", file=sys.stderr)
+def format_size_statistics(size_stats, top_directories=20):
+	"""Format byte-volume statistics for files that carried a size annotation."""
+	stats_text = f"\nTotal size: {format_bytes(size_stats['total_bytes'])} ({size_stats['sized_files']:,} files with a size)\n"
 	
-	if output_file_path:
-		print(f"Output will be written to: {output_file_path}", file=sys.stderr)
-		output_file = open(output_file_path, 'w', encoding='utf-8')
-	else:
-		output_file = None
-	
-	# Determine if we should use tqdm
-	if use_tqdm is None:
-		use_tqdm = HAS_TQDM
-	elif use_tqdm and not HAS_TQDM:
-		print("Warning: tqdm not available, falling back to simple progress", file=sys.stderr)
-		use_tqdm = False
-	
-	# Get file size for progress bar if using tqdm
-	total_lines = None
-	if use_tqdm:
-		print("Counting lines for progress bar...", file=sys.stderr)
-		total_lines = get_file_line_count(file_path)
-		if total_lines:
-			print(f"Total lines: {total_lines:,}", file=sys.stderr)
+	stats_text += f"\nSize by file type:\n"
+	for ext, size in sorted(size_stats['extension_bytes'].items(), key=lambda x: x[1], reverse=True):
+		stats_text += f"  .{ext}: {format_bytes(size)}\n"
 	
-	try:
-		section_title = "Files Only" if files_only else "All Items"
-		write_section_header(output_file, section_title)
+	root, directory_bytes = directory_totals(size_stats['directory_bytes'])
+	title = f"directory below '{root}'" if root is not None else "top-level directory"
+	stats_text += f"\nSize by {title} (top {min(top_directories, len(directory_bytes))} of {len(directory_bytes):,}):\n"
+	for directory, size in sorted(directory_bytes.items(), key=lambda x: x[1], reverse=True)[:top_directories]:
+		stats_text += f"  '{directory}': {format_bytes(size)}\n"
+	
+	# Buckets hold sizes up to but excluding their limit
+	stats_text += f"\nFile size histogram:\n"
+	for low, limit, count in histogram_ranges(size_stats['histogram']):
+		range_text = format_bytes(low) if limit - low == 1 else f"{format_bytes(low)} to under {format_bytes(limit)}"
+		stats_text += f"  {range_text}: {count:,} files\n"
+	
+	return stats_text
+
+def format_rollup_statistics(rollup, include_bytes=True):
+	"""Format the directories holding the most files and, if sizes are known, bytes."""
+	depth_note = f", depth <= {rollup.max_depth}" if rollup.max_depth is not None else ""
+	rankings = [("file count", rollup.by_files)]
+	if include_bytes:
+		rankings.append(("size", rollup.by_bytes))
+	
+	stats_text = ""
+	for title, heap in rankings:
+		stats_text += f"\nLargest directories by {title} (top {len(heap)} of {rollup.ranked:,}{depth_note}):\n"
+		for path, files, size in rollup.top_directories(heap):
+			if isinstance(path, bytes):
+				path = path.decode('utf-8')
+			stats_text += f"  '{path}': {files:,} files, {format_bytes(size)}\n"
+	
+	return stats_text
+
+def format_keyword_statistics(keyword_hits):
+	"""Format the items matched per keyword category, with the first matched paths of each."""
+	stats_text = f"\nKeyword hits: {keyword_hits.items:,} items matched\n"
+	for category, count, keywords, paths in keyword_hits.category_totals():
+		keyword_text = ", ".join(f"{keyword} {hits:,}" for keyword, hits in keywords)
+		stats_text += f"  {category}: {count:,} items ({keyword_text})\n"
+		for line_num, path in paths:
+			stats_text += f"    Line {line_num}: '{path}'\n"
+	return stats_text
+
+class TextWriter:
+	"""Human-readable output: one block per item, plus section header and statistics."""
+	
+	def __init__(self, output_file_path=None, buffer_size=DEFAULT_BUFFER_SIZE, resume_position=None):
+		self.output = open_output_sink(output_file_path, buffer_size, resume_position=resume_position)
+	
+	def write_item(self, item):
+		write_item_output(self.output, item)
+	
+	def close(self):
+		self.output.close()
+
+ITEM_WRITERS = {'text': TextWriter, **RECORD_WRITERS}
+
+def find_chunk_ranges(file_path, workers, chunk_size=CHUNK_SIZE):
+	"""Split a file into (start, end) byte ranges that end on line boundaries."""
+	file_size = os.path.getsize(file_path)
+	chunk_count = max(workers * 4, file_size // chunk_size)
+	target = max(1, file_size // chunk_count)
+	
+	ranges = []
+	with open(file_path, 'rb') as f:
+		start = 0
+		while start < file_size:
+			f.seek(min(start + target, file_size))
+			f.readline()
+			end = min(f.tell(), file_size)
+			ranges.append((start, end))
+			start = end
+	return ranges
+
+def parse_chunk(file_path, start, end, files_only, top_directories=0, max_depth=None, dialect=DEFAULT_DIALECT, item_filter=None,
+				keyword_scanner=None, keyword_paths=DEFAULT_KEYWORD_PATHS):
+	"""Parse one byte range of a tree file without knowing its ancestors.
+	
+	Paths are tracked relative to base_level, the shallowest level seen so far
+	in the chunk: levels below it are inherited from the previous chunk and get
+	filled in when the chunks are stitched back together. The same goes for
+	the directory rollup when top_directories is set and the keyword hits
+	when a keyword_scanner is given. dialect is a stateless
+	TreeDialect or DIALECTS name. item_filter's path glob can only be checked
+	once the records are stitched; its other conditions are checked here.
+	"""
+	with open(file_path, 'rb') as f:
+		f.seek(start)
+		data = f.read(end - start)
+	
+	base_level = None
+	local_path = PathStack()
+	records = []
+	dialect = make_dialect(dialect)
+	files_count = 0
+	extensions = defaultdict(int)
+	size_stats = new_size_stats()
+	rollup = DirectoryRollup(top_directories, max_depth) if top_directories else None
+	keyword_hits = KeywordHits(keyword_scanner, keyword_paths) if keyword_scanner is not None else None
+	# (base_level, leading directories within the chunk) -> bytes of files under directories inherited from earlier chunks
+	inherited_directory_bytes = {}
+	# Records of a whole chunk are held and pickled at once, so repeated folder names share one object;
+	# the main process counts them into its pool
+	chunk_names = ChunkNames()
+	intern_name = chunk_names.intern
+	match_item = item_filter.compile()[0] if item_filter is not None else None
+	
+	for line_num, indent_level, item_name, item_is_file, ext, size in dialect.iter_block_items(data):
+		if not item_is_file:
+			item_name = intern_name(item_name)
+		if rollup is not None:
+			rollup.update(line_num, indent_level, item_name, item_is_file, size, local_path.names)
 		
-		current_path = []
-		files_count = 0
-		total_lines_processed = 0
-		extensions = defaultdict(int)
+		if base_level is None or indent_level < base_level:
+			base_level = indent_level
+			if rollup is not None:
+				rollup.base_level = base_level
+			if keyword_hits is not None:
+				keyword_hits.base_level = base_level
+		local_path.update(indent_level - base_level, item_name)
+		if keyword_hits is not None:
+			matches = keyword_scanner.scan(item_name)
+			if matches:
+				keyword_hits.add(line_num, matches, local_path)
+		if item_is_file:
+			files_count += 1
+			extensions[ext] += 1
+			if size is not None:
+				directories = leading_directories(local_path.names, indent_level - base_level)
+				if base_level == 0:
+					add_file_size(size_stats, ext, directories, size)
+				else:
+					# The names above base_level come first but are only known once stitched
+					add_file_size(size_stats, ext, None, size)
+					key = (base_level, directories)
+					inherited_directory_bytes[key] = inherited_directory_bytes.get(key, 0) + size
+			emit = files_only
+		else:
+			emit = not files_only
+		if emit and match_item is not None:
+			emit = match_item(indent_level, item_name, ext, size)
 		
-		with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-			# Setup progress bar
-			if use_tqdm and total_lines:
-				progress_bar = tqdm(
-					total=total_lines,
-					desc="Processing",
-					unit="lines",
-					unit_scale=True,
-					file=sys.stderr
-				)
-			else:
-				progress_bar = None
-			
-			try:
-				for raw_line in f:
-					total_lines_processed += 1
-					raw_line = raw_line.rstrip('\n\r')
-					
-					if not raw_line.strip():
-						if progress_bar:
-							progress_bar.update(1)
-						continue
-					
-					item = parse_tree_line(total_lines_processed, raw_line)
-					if not item:
-						if progress_bar:
-							progress_bar.update(1)
-						continue
-					
-					# Update path
-					full_path = update_path(current_path, item, item['indent_level'])
-					item['full_path'] = full_path
+		if emit:
+			records.append((line_num, indent_level, item_name, base_level, local_path.full_path(), ext, size))
+	
+	return {
+		"byte_count": end - start,
+		"line_count": dialect.line_count,
+		"files_count": files_count,
+		"extensions": dict(extensions),
+		"sizes": size_stats,
+		"inherited_directory_bytes": inherited_directory_bytes,
+		"names": chunk_names.state(),
+		"rollup": rollup.state() if rollup is not None else None,
+		"keywords": keyword_hits.state() if keyword_hits is not None else None,
+		"records": records,
+		"base_level": base_level,
+		"local_path": local_path.names
+	}
+
+def iter_parsed_chunks(file_path, files_only, workers, top_directories=0, max_depth=None, dialect=DEFAULT_DIALECT, item_filter=None,
+					   keyword_scanner=None, keyword_paths=DEFAULT_KEYWORD_PATHS):
+	"""Parse a file across a process pool, yielding chunk results in file order."""
+	executor = ProcessPoolExecutor(max_workers=workers)
+	pending = deque()
+	try:
+		# Keep a bounded number of chunks in flight so results don't pile up in memory
+		for start, end in find_chunk_ranges(file_path, workers):
+			pending.append(executor.submit(parse_chunk, file_path, start, end, files_only, top_directories, max_depth, dialect, item_filter,
+										   keyword_scanner, keyword_paths))
+			if len(pending) >= workers * 2:
+				yield pending.popleft().result()
+		while pending:
+			yield pending.popleft().result()
+	finally:
+		executor.shutdown(wait=True, cancel_futures=True)
+
+def stitch_chunk_path(inherited_path, base_level):
+	"""Return the inherited ancestor names that sit below base_level."""
+	parts = inherited_path[:base_level]
+	parts.extend([""] * (base_level - len(parts)))
+	return parts
+
+def chunk_path_prefix(inherited_path, base_level):
+	"""Return the stitched path prefix for paths a chunk recorded relative to base_level."""
+	return "/".join(stitch_chunk_path(inherited_path, base_level)) + "/" if base_level else ""
+
+def write_chunk_records(writer, chunk, line_offset, inherited_path, match_path=None):
+	"""Write a chunk's records with full paths, returning the path stack after it.
+	
+	match_path, if given, is checked against each full path first.
+	"""
+	prefixes = {}
+	for line_num, indent_level, item_name, base_level, relative_path, ext, size in chunk['records']:
+		if base_level not in prefixes:
+			prefixes[base_level] = chunk_path_prefix(inherited_path, base_level)
+		full_path = prefixes[base_level] + relative_path
+		if match_path is not None and not match_path(full_path):
+			continue
+		writer.write_item({
+			"line_num": line_offset + line_num,
+			"indent_level": indent_level,
+			"item_name": item_name,
+			"full_path": full_path,
+			"is_file": ext is not None,
+			"extension": ext,
+			"size": size
+		})
+	
+	if chunk['base_level'] is None:
+		return inherited_path
+	return stitch_chunk_path(inherited_path, chunk['base_level']) + chunk['local_path']
+
+def merge_chunk_rollup(rollup, chunk_rollup, line_offset, inherited_path):
+	"""Fold a chunk's rollup into rollup, closing inherited directories it ended."""
+	for files, size, indent_level in chunk_rollup['inherited']:
+		totals = rollup.close_to(indent_level, inherited_path)
+		totals[0] += files
+		totals[1] += size
+	for files, size, indent_level, line_num in chunk_rollup['stack']:
+		rollup.stack.append([files, size, indent_level, line_offset + line_num])
+	
+	prefixes = {}
+	for heap, chunk_heap in ((rollup.by_files, chunk_rollup['by_files']), (rollup.by_bytes, chunk_rollup['by_bytes'])):
+		for key, order, files, size, base_level, relative_path in chunk_heap:
+			if base_level not in prefixes:
+				prefixes[base_level] = chunk_path_prefix(inherited_path, base_level)
+			rollup.offer(heap, (key, order - line_offset, files, size, 0, prefixes[base_level] + relative_path))
+	rollup.ranked += chunk_rollup['ranked']
+
+def process_text_lines(file_path, files_only, writer, stats, progress, checkpoint=None, resume=None, dialect=None, encoding=None, item_filter=None):
+	"""Parse a tree file line by line in text mode, updating stats in place.
+	
+	The file is read in blocks of whole lines, each decoded the way a text-mode
+	file would be and turned into items by dialect (a TreeDialect, Interlock by
+	default); compressed files are decompressed and files in another encoding
+	transcoded on the fly. If checkpoint is given it is saved between blocks
+	when due.
+	resume is an (offset, path_names, dialect_state, interned) tuple to
+	continue from, with stats already restored from the checkpoint.
+	item_filter is an ItemFilter limiting the items written out.
+	"""
+	dialect = make_dialect(dialect or DEFAULT_DIALECT)
+	current_path = PathStack()
+	files_count = stats['files_count']
+	total_lines_processed = dialect.line_count = stats['total_lines']
+	string_pool = StringPool(stats['strings'])
+	intern_name = string_pool.intern
+	start_offset = 0
+	if resume is not None:
+		start_offset, current_path.names, dialect_state, interned = resume
+		dialect.restore(dialect_state)
+		string_pool.restore(interned)
+	extensions = stats['extensions']
+	size_stats = stats['sizes']
+	rollup = stats['rollup']
+	keyword_hits = stats['keywords']
+	next_update = progress.check_every
+	write_item = writer.write_item
+	match_item, match_path = item_filter.compile() if item_filter is not None else (None, None)
+	
+	try:
+		with open_tree_input(file_path, encoding=encoding) as f:
+			if start_offset:
+				f.seek(start_offset)
+			for block in iter_line_blocks(f, dialect.block_size):
+				for total_lines_processed, indent_level, item_name, item_is_file, ext, size in dialect.iter_block_items(block):
+					# Folder names repeat throughout a tree; keep one copy of each on the path
+					if not item_is_file:
+						item_name = intern_name(item_name)
+					# Directories closed by this item roll up before the path moves on
+					if rollup is not None:
+						rollup.update(total_lines_processed, indent_level, item_name, item_is_file, size, current_path.names)
 					
-					# Check if it's a file
-					if is_file(item['item_name']):
+					# Update path; the full path is only built for items that are written out
+					current_path.update(indent_level, item_name)
+					if keyword_hits is not None:
+						matches = keyword_hits.scanner.scan(item_name)
+						if matches:
+							keyword_hits.add(total_lines_processed, matches, current_path)
+					if item_is_file:
 						files_count += 1
 						
-						# Track extensions
-						clean_name = re.sub(r'\s*\([^)]*\)$', '', item['item_name'])
-						if '.' in clean_name:
-							ext = clean_name.split('.')[-1].lower()
-							extensions[ext] += 1
+						# Track extensions and byte volume
+						extensions[ext] += 1
+						if size is not None:
+							add_file_size(size_stats, ext, leading_directories(current_path.names, indent_level), size)
 						
-						# Output if files_only mode
-						if files_only:
-							write_item_output(output_file, item)
-					elif not files_only:
-						# Output all items if not files_only mode
-						write_item_output(output_file, item)
+						# Output files in files_only mode, directories otherwise
+						emit = files_only
+					else:
+						emit = not files_only
+					# Filters that don't need the path run before it is joined
+					if emit and match_item is not None:
+						emit = match_item(indent_level, item_name, ext, size)
 					
-					# Update progress
-					if progress_bar:
-						progress_bar.set_postfix({'Files': f"{files_count:,}"})
-						progress_bar.update(1)
-					elif total_lines_processed % progress_interval == 0:
-						print(f"[Progress: {total_lines_processed:,} lines processed, {files_count:,} files found]", file=sys.stderr)
+					if emit:
+						full_path = current_path.full_path()
+						if match_path is None or match_path(full_path):
+							write_item({
+								"line_num": total_lines_processed,
+								"indent_level": indent_level,
+								"item_name": item_name,
+								"is_file": item_is_file,
+								"extension": ext,
+								"size": size,
+								"full_path": full_path
+							})
 					
-					# Flush output file periodically
-					if output_file and total_lines_processed % 10000 == 0:
-						output_file.flush()
+					# Update progress from the position reached in the file on disk
+					if total_lines_processed >= next_update:
+						progress.update(f.position(), total_lines_processed, files_count)
+						next_update = total_lines_processed + progress.check_every
+				# Blank and skipped lines count too
+				total_lines_processed = dialect.line_count
+				
+				if checkpoint is not None and checkpoint.due():
+					stats['total_lines'] = total_lines_processed
+					stats['files_count'] = files_count
+					checkpoint.save(f.tell(), current_path.names, stats, dialect.state(), string_pool.state())
+			
+			progress.finish(f.position(), total_lines_processed, files_count)
+	finally:
+		stats['total_lines'] = total_lines_processed
+		stats['files_count'] = files_count
+		if rollup is not None:
+			rollup.finish(current_path.names)
+
+def process_mmap_lines(file_path, files_only, writer, stats, progress, item_filter=None):
+	"""Parse a tree file as bytes through mmap, decoding names only for output."""
+	current_path = PathStack(b"/")
+	files_count = 0
+	total_lines_processed = 0
+	extensions = stats['extensions']
+	# Keyed by undecoded names until the loop finishes
+	directory_bytes = {}
+	size_stats = dict(stats['sizes'], directory_bytes=directory_bytes)
+	rollup = stats['rollup']
+	keyword_hits = stats['keywords']
+	intern_name = StringPool(stats['strings']).intern
+	file_size = os.path.getsize(file_path)
+	reader = MmapLineReader(file_path)
+	next_update = progress.check_every
+	write_item = writer.write_item
+	match_item, match_path = item_filter.compile(names_as_bytes=True) if item_filter is not None else (None, None)
+	
+	try:
+		for total_lines_processed, raw_line in reader:
+			token = tokenize_line_bytes(raw_line)
+			if token is None:
+				continue
+			
+			indent_level, item_name = token
+			item_is_file, ext, size_annotation = classify_item_bytes(item_name)
+			size = parse_size(size_annotation) if size_annotation else None
+			if not item_is_file:
+				item_name = intern_name(item_name)
+			if rollup is not None:
+				rollup.update(total_lines_processed, indent_level, item_name, item_is_file, size, current_path.names)
+			current_path.update(indent_level, item_name)
+			if keyword_hits is not None:
+				matches = keyword_hits.scanner.scan(item_name.decode('utf-8'))
+				if matches:
+					keyword_hits.add(total_lines_processed, matches, current_path)
+			if item_is_file:
+				files_count += 1
+				extensions[ext] += 1
+				if size is not None:
+					add_file_size(size_stats, ext, leading_directories(current_path.names, indent_level), size)
+				emit = files_only
+			else:
+				emit = not files_only
+			if emit and match_item is not None:
+				emit = match_item(indent_level, item_name, ext, size)
+			
+			if emit:
+				full_path = current_path.full_path().decode('utf-8')
+				if match_path is not None and not match_path(full_path):
+					emit = False
+			if emit:
+				write_item({
+					"line_num": total_lines_processed,
+					"indent_level": indent_level,
+					"item_name": item_name.decode('utf-8'),
+					"full_path": full_path,
+					"is_file": item_is_file,
+					"extension": ext,
+					"size": size
+				})
+			
+			if total_lines_processed >= next_update:
+				progress.update(reader.position, total_lines_processed, files_count)
+				next_update = total_lines_processed + progress.check_every
+		
+		progress.finish(file_size, total_lines_processed, files_count)
+	finally:
+		stats['total_lines'] = total_lines_processed
+		stats['files_count'] = files_count
+		if rollup is not None:
+			rollup.finish(current_path.names)
+		stats['sizes'].update(size_stats, directory_bytes=stats['sizes']['directory_bytes'])
+		for top, by_below in directory_bytes.items():
+			for below, size in by_below.items():
+				add_directory_bytes(stats['sizes'], (decode_path(top), decode_path(below)), size)
+
+def process_parallel_chunks(file_path, files_only, writer, stats, progress, workers, dialect=DEFAULT_DIALECT, item_filter=None):
+	"""Parse a tree file across a process pool, updating stats in place."""
+	print(f"Parsing in parallel with {workers} workers", file=sys.stderr)
+	current_path = []
+	extensions = stats['extensions']
+	string_pool = StringPool(stats['strings'])
+	file_size = os.path.getsize(file_path)
+	position = 0
+	next_update = progress.check_every
+	
+	rollup = stats['rollup']
+	top_directories, max_depth = (rollup.top, rollup.max_depth) if rollup is not None else (0, None)
+	keyword_hits = stats['keywords']
+	keyword_scanner, keyword_paths = (keyword_hits.scanner, keyword_hits.max_paths) if keyword_hits is not None else (None, 0)
+	match_path = item_filter.compile()[1] if item_filter is not None else None
+	
+	for chunk in iter_parsed_chunks(file_path, files_only, workers, top_directories, max_depth, dialect, item_filter,
+									keyword_scanner, keyword_paths):
+		merge_size_stats(stats['sizes'], chunk['sizes'])
+		for (base_level, directories), size in chunk['inherited_directory_bytes'].items():
+			names = stitch_chunk_path(current_path, base_level) + list(directories)
+			add_directory_bytes(stats['sizes'], leading_directories(names, len(names)), size)
+		if rollup is not None:
+			merge_chunk_rollup(rollup, chunk['rollup'], stats['total_lines'], current_path)
+		if keyword_hits is not None:
+			inherited_path = current_path
+			keyword_hits.merge(chunk['keywords'], stats['total_lines'], lambda base_level: chunk_path_prefix(inherited_path, base_level))
+		current_path = write_chunk_records(writer, chunk, stats['total_lines'], current_path, match_path)
+		stats['total_lines'] += chunk['line_count']
+		stats['files_count'] += chunk['files_count']
+		for ext, count in chunk['extensions'].items():
+			extensions[ext] += count
+		string_pool.merge(chunk['names'])
+		
+		position += chunk['byte_count']
+		if stats['total_lines'] >= next_update:
+			progress.update(position, stats['total_lines'], stats['files_count'])
+			next_update = stats['total_lines'] + progress.check_every
+	
+	progress.finish(file_size, stats['total_lines'], stats['files_count'])
+	if rollup is not None:
+		rollup.finish(current_path)
+
+def process_tree_file(file_path, files_only=False, progress_interval=50000, output_file_path=None, use_tqdm=None,
+					  workers=1, use_mmap=False, progress=None, output_buffer_size=DEFAULT_BUFFER_SIZE, output_format='text',
+					  top_directories=0, max_depth=None, cache=None, checkpoint_interval=0, resume=False,
+					  dialect=DEFAULT_DIALECT, indent_width=None, encoding=None, batch=False,
+					  item_filter=None, keyword_scanner=None, keyword_paths=DEFAULT_KEYWORD_PATHS, extension_categories=EXTENSION_CATEGORIES):
+	"""Process tree file in streaming mode with progress display.
+	
+	progress may be a Progress instance or a PROGRESS_REPORTERS name; when it is
+	None the reporter is picked from use_tqdm. For output formats other than
+	text the statistics are written to stderr instead of the output. When
+	top_directories is set the statistics also rank the directories (no deeper
+	than max_depth levels) holding the most files and bytes. cache may be a
+	ParseCache: a hit replays the recorded items and statistics instead of
+	parsing, and a completed run is stored in it.
+	
+	Serial line-by-line runs into a text, csv or jsonl output file save a
+	checkpoint every checkpoint_interval seconds; resume continues from the
+	last one.
+	
+	dialect is the listing format, a TreeDialect, a DIALECTS name or 'auto'
+	to detect it by sampling the file. indent_width and encoding override the
+	Interlock indent width and the input encoding (UTF-8 by default), or what
+	detection found. batch parses Interlock listings a block at a time with
+	pyarrow compute kernels (InterlockBatchDialect) instead of line by line.
+	
+	item_filter is an ItemFilter: only the items it matches are written out,
+	while the statistics still cover the whole listing. keyword_scanner is a
+	KeywordScanner run over every item name; the statistics then count the
+	items matched per category and list the first keyword_paths paths of each.
+	extension_categories maps extensions to the categories the file types are
+	totalled by (see load_extension_categories).
+	"""
+	print(f"Processing file: {file_path}", file=sys.stderr)
+	
+	if item_filter is not None and not item_filter.active:
+		item_filter = None
+	filter_text = item_filter.describe() if item_filter is not None else None
+	if item_filter is not None:
+		print(f"Filter: {filter_text}", file=sys.stderr)
+		if item_filter.files_only and not files_only:
+			print(f"Note: --ext and --min-size only match files, which are listed with --files-only; no items will be written", file=sys.stderr)
+		for ext in item_filter.unknown_extensions():
+			print(f"Note: .{ext} is not a known file type; no items will match it", file=sys.stderr)
+	
+	# stdin and compressed input are streams: no byte ranges to split or map
+	is_stdin = file_path == STDIN_PATH
+	compression = None if is_stdin else detect_compression(file_path)
+	if compression is not None:
+		print(f"Input is {compression} compressed, decompressing while parsing", file=sys.stderr)
+	
+	if dialect == AUTO_DIALECT:
+		if is_stdin:
+			print(f"Note: detecting the listing format needs a file; assuming {DEFAULT_DIALECT}", file=sys.stderr)
+			dialect = DEFAULT_DIALECT
+		else:
+			detection = detect_dialect(file_path)
+			print(f"Detected listing format: {detection.describe()}", file=sys.stderr)
+			if detection.confidence < MIN_SCORE:
+				print(f"Note: low confidence; pass --dialect, --indent-width or --encoding if the output looks wrong", file=sys.stderr)
+			dialect = detection.dialect
+			indent_width = indent_width or detection.indent_width
+			encoding = encoding or detection.encoding
+	
+	# Other encodings are transcoded while reading, so offsets in the file are lost
+	transcoded = not is_utf8(encoding)
+	if transcoded:
+		print(f"Input is {encoding} encoded, converting to UTF-8 while parsing", file=sys.stderr)
+	if (is_stdin or compression is not None or transcoded) and (workers > 1 or use_mmap):
+		print(f"Note: --workers and --mmap need an uncompressed UTF-8 file; parsing serially in text mode", file=sys.stderr)
+		workers, use_mmap = 1, False
+	
+	# The mmap scanner only knows 4-wide Interlock lines; header-based dialects can't start mid-file
+	dialect = make_dialect(dialect, indent_width)
+	if dialect.name != DEFAULT_DIALECT:
+		print(f"Dialect: {dialect.description}", file=sys.stderr)
+	if use_mmap and (dialect.name != DEFAULT_DIALECT or dialect.indent_width != INDENT_WIDTH):
+		print(f"Note: --mmap only reads Interlock listings indented {INDENT_WIDTH} characters per level; parsing in text mode", file=sys.stderr)
+		use_mmap = False
+	if batch:
+		if not HAS_PYARROW:
+			print(f"Note: --batch needs pyarrow (pip install pyarrow); parsing line by line", file=sys.stderr)
+		elif dialect.name != DEFAULT_DIALECT:
+			print(f"Note: --batch only reads Interlock listings; parsing {dialect.name} line by line", file=sys.stderr)
+		else:
+			dialect = InterlockBatchDialect(dialect.indent_width)
+			if use_mmap:
+				print(f"Note: --batch replaces the --mmap scanner", file=sys.stderr)
+				use_mmap = False
+	if workers > 1 and not dialect.stateless:
+		print(f"Note: {dialect.name} listings can't be split between workers; parsing serially", file=sys.stderr)
+		workers = 1
+	
+	stats = {"total_lines": 0, "files_count": 0, "extensions": defaultdict(int), "sizes": new_size_stats(), "rollup": None, "keywords": None, "strings": new_string_stats()}
+	if top_directories:
+		# The mmap loop works on undecoded names
+		separator = b"/" if use_mmap and workers <= 1 else "/"
+		stats['rollup'] = DirectoryRollup(top_directories, max_depth, separator)
+	keywords_key = None
+	if keyword_scanner is not None:
+		stats['keywords'] = KeywordHits(keyword_scanner, keyword_paths)
+		keywords_key = [keyword_scanner.fingerprint(), keyword_paths]
+	
+	# Checkpoints need exact input offsets (the line-by-line text loop) and an output file that can be truncated
+	checkpoint = resume_state = resume_position = None
+	can_checkpoint = (output_file_path and workers <= 1 and not use_mmap and not isinstance(dialect, InterlockBatchDialect)
+					  and output_format != 'parquet' and compression is None and not is_stdin and not transcoded)
+	if resume and not can_checkpoint:
+		raise ValueError("--resume needs an uncompressed UTF-8 input file and a text, csv or jsonl output file (-o), without --workers, --mmap or --batch")
+	if can_checkpoint and (checkpoint_interval or resume):
+		file_stat = os.stat(file_path)
+		identity = {
+			"input": os.path.abspath(file_path),
+			"size": file_stat.st_size,
+			"mtime_ns": file_stat.st_mtime_ns,
+			"parser_version": PARSER_VERSION,
+			"files_only": files_only,
+			"format": output_format,
+			"top_directories": top_directories,
+			"max_depth": max_depth,
+			"dialect": dialect.name,
+			"indent_width": dialect.indent_width,
+			"item_filter": filter_text,
+			"keywords": keywords_key
+		}
+		checkpoint = Checkpointer(output_file_path, identity, checkpoint_interval or DEFAULT_CHECKPOINT_INTERVAL)
+		if resume:
+			offset, resume_position, path_names, dialect_state, interned, stats = checkpoint.load()
+			resume_state = (offset, path_names, dialect_state, interned)
+			if stats['keywords'] is not None:
+				stats['keywords'].scanner = keyword_scanner
+			print(f"Resuming from line {stats['total_lines']:,} (byte {offset:,})", file=sys.stderr)
+	
+	if output_file_path:
+		print(f"Output will be written to: {output_file_path}", file=sys.stderr)
+	writer = ITEM_WRITERS[output_format](output_file_path, output_buffer_size, resume_position=resume_position)
+	stats_output = writer.output if output_format == 'text' else sys.stderr
+	if checkpoint is not None:
+		checkpoint.output = writer.output
+	
+	# Determine which progress reporter to use
+	if progress is None:
+		progress = 'auto' if use_tqdm is None else ('tqdm' if use_tqdm else 'simple')
+	if not isinstance(progress, Progress):
+		progress = make_progress(progress, progress_interval)
+	
+	# A resumed run only sees part of the items, so it can't fill the cache
+	cached = cache_entry = None
+	if cache is not None and not resume and not is_stdin:
+		cache_key = cache.key(file_path, PARSER_VERSION, files_only=files_only, top_directories=top_directories, max_depth=max_depth,
+								  dialect=dialect.name, indent_width=dialect.indent_width, encoding=encoding if transcoded else DEFAULT_ENCODING,
+								  item_filter=filter_text, keywords=keywords_key)
+		cached = cache.load(cache_key)
+		if cached is None:
+			try:
+				cache_entry = cache.start_entry(cache_key, writer)
+			except OSError as e:
+				print(f"Note: can't write the parse cache ({e}); this run won't be cached", file=sys.stderr)
+	completed = False
+	
+	try:
+		if output_format == 'text' and not resume:
+			section_title = "Files Only" if files_only else "All Items"
+			if item_filter is not None:
+				section_title += f" matching {filter_text}"
+			write_section_header(writer.output, section_title)
+		
+		if cached is not None:
+			print(f"Using cached results from {cached.directory}", file=sys.stderr)
+			for item in cached.items():
+				writer.write_item(item)
+			stats = cached.stats
+		else:
+			item_writer = cache_entry or writer
+			
+			# Progress is driven by byte offset so the file is only read once; stdin has no known size
+			progress.start(None if is_stdin else os.path.getsize(file_path))
 			
-			finally:
-				if progress_bar:
-					progress_bar.close()
+			if workers > 1:
+				process_parallel_chunks(file_path, files_only, item_writer, stats, progress, workers, dialect, item_filter)
+			elif use_mmap:
+				process_mmap_lines(file_path, files_only, item_writer, stats, progress, item_filter)
+			else:
+				process_text_lines(file_path, files_only, item_writer, stats, progress, checkpoint, resume_state, dialect, encoding, item_filter)
+		completed = True
 	
 	except KeyboardInterrupt:
 		print(f"\nProcessing interrupted by user.", file=sys.stderr)
-		print(f"Processed {total_lines_processed:,} lines, found {files_count:,} files.", file=sys.stderr)
+		print(f"Processed {stats['total_lines']:,} lines, found {stats['files_count']:,} files.", file=sys.stderr)
 	
 	finally:
+		progress.close()
+		if cache_entry is not None:
+			try:
+				if completed:
+					cache_entry.commit(stats)
+				else:
+					cache_entry.discard()
+			except OSError as e:
+				print(f"Note: can't store the parse cache entry ({e})", file=sys.stderr)
+				cache_entry.discard()
+		
 		# Final statistics
-		write_statistics(output_file, total_lines_processed, files_count, extensions, files_only)
+		write_statistics(stats_output, stats['total_lines'], stats['files_count'], stats['extensions'], files_only, stats['sizes'], stats['rollup'], stats['keywords'],
+						 extension_categories, stats['strings'])
 		
-		if output_file:
-			output_file.close()
+		writer.close()
+		if checkpoint is not None and completed:
+			checkpoint.remove()
+		if output_file_path:
 			print(f"Output written to: {output_file_path}", file=sys.stderr)
 		
 		# Always show final stats on stderr for progress tracking
 		print(f"\n=== Processing Complete ===", file=sys.stderr)
-		print(f"Total lines processed: {total_lines_processed:,}", file=sys.stderr)
-		print(f"Files found: {files_count:,}", file=sys.stderr)
+		print(f"Total lines processed: {stats['total_lines']:,}", file=sys.stderr)
+		print(f"Files found: {stats['files_count']:,}", file=sys.stderr)
 
 def main():
 	parser = argparse.ArgumentParser(description='Parse large tree output files efficiently')
-	parser.add_argument('file_path', help='Path to the tree output file')
+	parser.add_argument('file_path', help="Path to the tree output file, or - to read it from stdin")
+	parser.add_argument('--dialect', choices=[AUTO_DIALECT] + sorted(DIALECTS), default=AUTO_DIALECT,
+					   help='Listing format: Interlock, Windows tree /F, GNU tree, ls -R or dir /s (default: auto, detected by sampling the file)')
+	parser.add_argument('--indent-width', type=int,
+					   help='Characters per level in Interlock listings (default: detected, else 4)')
+	parser.add_argument('--encoding',
+					   help="Input encoding, e.g. utf-16 or cp437 (default: detected, else utf-8)")
 	parser.add_argument('--files-only', action='store_true', 
 					   help='Show only files, not directories')
+	parser.add_argument('--ext', action='append',
+					   help='Only write files with these extensions, comma-separated or repeated, e.g. pdf,xlsx')
+	parser.add_argument('--path-glob',
+					   help="Only write items whose full path matches this shell-style pattern, e.g. '*/HR/*'")
+	parser.add_argument('--name-regex',
+					   help="Only write items whose name contains a match for this regular expression, e.g. '(?i)payroll'")
+	parser.add_argument('--min-size', type=parse_size,
+					   help="Only write files of at least this size, e.g. '10 MB'")
+	parser.add_argument('--depth-range', type=parse_depth_range,
+					   help="Only write items at these levels, as MIN:MAX, MIN: or :MAX (top level is 0)")
+	parser.add_argument('--keywords', nargs='?', const=DEFAULT_KEYWORDS_FILE,
+					   help='Count item names containing the keywords of this file per category (default file: keywords.txt)')
+	parser.add_argument('--keyword-paths', type=int, default=DEFAULT_KEYWORD_PATHS,
+					   help=f'Matched paths to list per keyword category (default: {DEFAULT_KEYWORD_PATHS})')
+	parser.add_argument('--categories',
+					   help=f'File of [category] sections assigning extensions to categories, overriding the built-in ones '
+							f'(default: {DEFAULT_CATEGORIES_FILE} if it exists)')
 	parser.add_argument('--progress-interval', type=int, default=50000,
 					   help='Show progress every N lines when not using tqdm (default: 50000)')
 	parser.add_argument('--output-file', '-o', type=str,
 					   help='Output file path (if not specified, output goes to console)')
+	parser.add_argument('--format', choices=sorted(ITEM_WRITERS), default='text',
+					   help='Output format: human-readable text, jsonl, csv or parquet (default: text)')
+	parser.add_argument('--output-buffer', type=int, default=DEFAULT_BUFFER_SIZE,
+					   help=f'Output file buffer size in bytes (default: {DEFAULT_BUFFER_SIZE})')
 	parser.add_argument('--no-tqdm', action='store_true',
 					   help='Disable tqdm progress bar even if available')
+	parser.add_argument('--progress', choices=['auto'] + sorted(PROGRESS_REPORTERS), default='auto',
+					   help="Progress reporter: tqdm bar, simple lines, or none for batch jobs (default: auto)")
+	parser.add_argument('--workers', type=int, default=1,
+					   help='Parse the file in N worker processes (default: 1, serial)')
+	parser.add_argument('--mmap', action='store_true',
+					   help='Scan the file as bytes through mmap instead of decoding every line')
+	parser.add_argument('--batch', action='store_true',
+					   help='Parse Interlock listings in blocks of lines with pyarrow compute kernels')
+	parser.add_argument('--top-dirs', type=int, default=0,
+					   help='Rank the N directories holding the most files and bytes (default: 0, off)')
+	parser.add_argument('--max-depth', type=int,
+					   help='Only rank directories up to this many levels deep with --top-dirs')
+	parser.add_argument('--checkpoint-interval', type=int, default=DEFAULT_CHECKPOINT_INTERVAL,
+					   help=f'Save a checkpoint next to the output file every N seconds, 0 to disable (default: {DEFAULT_CHECKPOINT_INTERVAL})')
+	parser.add_argument('--resume', action='store_true',
+					   help='Continue an interrupted run from its checkpoint, with the same arguments')
+	parser.add_argument('--no-cache', action='store_true',
+					   help='Always parse the file, without reading or writing the parse cache')
+	parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR,
+					   help=f'Parse cache directory (default: {DEFAULT_CACHE_DIR})')
+	parser.add_argument('--cache-max-bytes', type=parse_size, default=DEFAULT_CACHE_MAX_BYTES,
+					   help="Evict least recently used cache entries beyond this size, e.g. '500 MB' (default: 2 GB)")
 	
 	args = parser.parse_args()
 	
 	# Print configuration to stderr
 	print(f"Files only: {args.files_only}", file=sys.stderr)
-	if not args.no_tqdm and HAS_TQDM:
+	if args.progress == 'auto':
+		args.progress = 'tqdm' if HAS_TQDM and not args.no_tqdm else 'simple'
+	if args.progress == 'tqdm':
 		print(f"Progress: Using tqdm progress bar", file=sys.stderr)
-	else:
+	elif args.progress == 'simple':
 		print(f"Progress: Simple progress every {args.progress_interval:,} lines", file=sys.stderr)
+	else:
+		print(f"Progress: Disabled", file=sys.stderr)
+	if args.workers > 1:
+		print(f"Workers: {args.workers}", file=sys.stderr)
 	if args.output_file:
 		print(f"Output file: {args.output_file}", file=sys.stderr)
 	else:
@@ -260,8 +853,29 @@ def main():
 	print("-" * 50, file=sys.stderr)
 	
 	try:
-		use_tqdm = not args.no_tqdm
-		process_tree_file(args.file_path, args.files_only, args.progress_interval, args.output_file, use_tqdm)
+		cache = None
+		if not args.no_cache:
+			try:
+				cache = ParseCache(args.cache_dir, args.cache_max_bytes)
+			except OSError as e:
+				# The cache only saves time; a run must never fail because of it
+				print(f"Note: parse cache disabled, can't use {args.cache_dir} ({e})", file=sys.stderr)
+		extension_categories = load_extension_categories(args.categories)
+		for ext in unknown_extensions(extension_categories):
+			print(f"Note: .{ext} in the categories file is not a known file type; its items stay directories", file=sys.stderr)
+		item_filter = ItemFilter(args.ext, args.path_glob, args.name_regex, args.min_size, args.depth_range)
+		keyword_scanner = None
+		if args.keywords:
+			keyword_scanner = KeywordScanner.from_file(args.keywords)
+			print(f"Keywords: {len(keyword_scanner.entries):,} in {len(keyword_scanner.categories)} categories from {args.keywords}", file=sys.stderr)
+		process_tree_file(args.file_path, args.files_only, args.progress_interval, args.output_file,
+						  workers=args.workers, use_mmap=args.mmap, progress=args.progress,
+						  output_buffer_size=args.output_buffer, output_format=args.format,
+						  top_directories=args.top_dirs, max_depth=args.max_depth, cache=cache,
+						  checkpoint_interval=args.checkpoint_interval, resume=args.resume,
+						  dialect=args.dialect, indent_width=args.indent_width, encoding=args.encoding,
+						  batch=args.batch, item_filter=item_filter, keyword_scanner=keyword_scanner,
+						  keyword_paths=args.keyword_paths, extension_categories=extension_categories)
 	except FileNotFoundError:
 		print(f"Error: File '{args.file_path}' not found.", file=sys.stderr)
 	except Exception as e:
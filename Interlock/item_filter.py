@@ -0,0 +1,115 @@
+"""Filters on the items written out, compiled once and run inside the parse loops.
+
+Extension, size, depth and name conditions only need what the dialect has
+already produced for a line, so they are checked before the item's full
+path is joined or its record built: an item they reject costs a few
+comparisons. The path glob needs the joined path and runs last, only for
+items that passed everything else. Statistics still cover the whole listing.
+"""
+import re
+from fnmatch import translate
+
+from file_extensions import FILE_EXTENSIONS
+
+# Upper bound for an open-ended depth range
+MAX_DEPTH = 2 ** 31
+
+
+def parse_depth_range(text):
+	"""Parse 'MIN:MAX', 'MIN:', ':MAX' or a single depth into (min, max) indent levels; top-level items are at depth 0."""
+	low, colon, high = text.partition(':')
+	if not colon:
+		high = low
+	low = int(low) if low.strip() else 0
+	high = int(high) if high.strip() else MAX_DEPTH
+	if low < 0 or high < low:
+		raise ValueError(f"invalid depth range: {text!r}")
+	return low, high
+
+def split_extensions(values):
+	"""Return the lower-cased extensions without dots from comma-separated values."""
+	return frozenset(ext.strip().lower().lstrip('.') for value in values for ext in value.split(',') if ext.strip())
+
+
+class ItemFilter:
+	"""Conditions an item must meet to be written out.
+
+	extensions are matched without the dot and case (comma-separated values
+	are split), path_glob is a shell-style pattern for the full path,
+	name_regex is searched for in the item name, min_size is in bytes and
+	depth_range is a (min, max) pair of indent levels. Only files have an
+	extension and a size, so those conditions never match directories.
+	"""
+
+	def __init__(self, extensions=None, path_glob=None, name_regex=None, min_size=None, depth_range=None):
+		self.extensions = split_extensions(extensions) if extensions else None
+		self.path_glob = path_glob
+		self.name_regex = name_regex
+		self.min_size = min_size
+		self.depth_range = depth_range
+		# Fail on a bad pattern before any parsing starts
+		if name_regex:
+			re.compile(name_regex)
+
+	@property
+	def active(self):
+		"""True when any condition is set."""
+		return bool(self.extensions or self.path_glob or self.name_regex or self.min_size is not None or self.depth_range)
+
+	@property
+	def files_only(self):
+		"""True when only files can match (an extension or size condition is set)."""
+		return bool(self.extensions) or self.min_size is not None
+
+	def unknown_extensions(self):
+		"""Return the requested extensions the classifier doesn't treat as file types."""
+		return sorted(ext for ext in self.extensions or () if '.' + ext not in FILE_EXTENSIONS)
+
+	def describe(self):
+		"""Return the conditions as text, for headers, cache keys and checkpoints."""
+		parts = []
+		if self.extensions:
+			parts.append("ext " + ",".join(sorted(self.extensions)))
+		if self.path_glob:
+			parts.append(f"path {self.path_glob}")
+		if self.name_regex:
+			parts.append(f"name /{self.name_regex}/")
+		if self.min_size is not None:
+			parts.append(f"size >= {self.min_size:,} bytes")
+		if self.depth_range:
+			low, high = self.depth_range
+			parts.append(f"depth {low}-{high}" if high < MAX_DEPTH else f"depth >= {low}")
+		return ", ".join(parts)
+
+	def compile(self, names_as_bytes=False):
+		"""Return (match_item, match_path) predicates, None where there is nothing to check.
+
+		match_item(indent_level, item_name, extension, size) runs before the
+		path is joined, match_path(full_path) after. With names_as_bytes the
+		item names are undecoded UTF-8 (the mmap scanner) and are only decoded
+		for the name regex.
+		"""
+		extensions = self.extensions
+		min_size = self.min_size
+		min_depth, max_depth = self.depth_range or (0, MAX_DEPTH)
+		name_search = re.compile(self.name_regex).search if self.name_regex else None
+		match_path = re.compile(translate(self.path_glob)).match if self.path_glob else None
+
+		if extensions is None and min_size is None and name_search is None and not self.depth_range:
+			return None, match_path
+
+		def match_item(indent_level, item_name, extension, size):
+			if indent_level < min_depth or indent_level > max_depth:
+				return False
+			if extensions is not None and extension not in extensions:
+				return False
+			if min_size is not None and (size is None or size < min_size):
+				return False
+			if name_search is not None:
+				if names_as_bytes:
+					item_name = item_name.decode('utf-8')
+				if name_search(item_name) is None:
+					return False
+			return True
+
+		return match_item, match_path
@@ -0,0 +1,212 @@
+"""Keyword scanning of item names with an Aho-Corasick automaton.
+
+Keywords come from a file of [category] sections (keywords.txt is the
+default). They are compiled once into a deterministic automaton over
+case-folded text, so each name is scanned in a single pass whose cost
+depends on the length of the name, not on how many keywords there are.
+Results are cached per name, since folder names repeat throughout a tree.
+KeywordHits counts the items matched per category and keyword and keeps
+the first paths of each category.
+"""
+import hashlib
+import os
+
+# Keyword file used when --keywords is given without a path
+DEFAULT_KEYWORDS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'keywords.txt')
+
+# Matched paths kept per category by default
+DEFAULT_KEYWORD_PATHS = 20
+
+# Distinct names whose matches are cached before the cache is reset
+SCAN_CACHE_SIZE = 65536
+
+
+def read_keyword_file(file_path):
+	"""Return (category, keyword, whole_word) entries from a keyword file.
+
+	Lines are keywords under a "[category]" header; a leading "=" means the
+	keyword only matches as a whole word (not next to a letter or digit).
+	Blank lines and lines starting with "#" are ignored.
+	"""
+	entries = []
+	category = None
+	with open(file_path, encoding='utf-8') as f:
+		for line_num, line in enumerate(f, 1):
+			line = line.strip()
+			if not line or line.startswith('#'):
+				continue
+			if line.startswith('[') and line.endswith(']'):
+				category = line[1:-1].strip()
+				continue
+			if category is None:
+				raise ValueError(f"{file_path}:{line_num}: keyword {line!r} is not under a [category] header")
+			whole_word = line.startswith('=')
+			keyword = line[1:].strip() if whole_word else line
+			if keyword:
+				entries.append((category, keyword, whole_word))
+	return entries
+
+
+class KeywordScanner:
+	"""Aho-Corasick automaton matching (category, keyword, whole_word) entries in item names, ignoring case."""
+
+	def __init__(self, entries):
+		self.entries = list(dict.fromkeys(entries))
+		self.categories = list(dict.fromkeys(category for category, _, _ in self.entries))
+		self.lengths = []
+		self.whole_word = []
+		# Transitions of the complete automaton; characters missing from a state's dict go back to the root
+		self.transitions = [{}]
+		# Entries ending at each state, including those reached through failure links
+		self.outputs = [()]
+		self.cache = {}
+
+		goto = [{}]
+		for entry_id, (_, keyword, whole_word) in enumerate(self.entries):
+			keyword = keyword.casefold()
+			self.lengths.append(len(keyword))
+			self.whole_word.append(whole_word)
+			state = 0
+			for char in keyword:
+				next_state = goto[state].get(char)
+				if next_state is None:
+					next_state = goto[state][char] = len(goto)
+					goto.append({})
+					self.outputs.append(())
+				state = next_state
+			self.outputs[state] += (entry_id,)
+		self.build(goto)
+
+	def build(self, goto):
+		"""Add failure links to the keyword trie goto, turning it into the complete automaton."""
+		transitions = self.transitions = [None] * len(goto)
+		outputs = self.outputs
+		transitions[0] = dict(goto[0])
+		# Breadth first, so a state's failure state is finished before it
+		queue = [(child, 0) for child in goto[0].values()]
+		for state, fail in queue:
+			outputs[state] += outputs[fail]
+			transitions[state] = dict(transitions[fail])
+			transitions[state].update(goto[state])
+			for char, child in goto[state].items():
+				queue.append((child, transitions[fail].get(char, 0)))
+
+	def fingerprint(self):
+		"""Return a short hash of the entries, for cache keys and checkpoints."""
+		return hashlib.blake2b(repr(self.entries).encode('utf-8'), digest_size=8).hexdigest()
+
+	def scan(self, name):
+		"""Return the sorted ids of the entries found in name."""
+		try:
+			return self.cache[name]
+		except KeyError:
+			pass
+
+		text = name.casefold()
+		transitions = self.transitions
+		outputs = self.outputs
+		found = None
+		state = 0
+		for end, char in enumerate(text):
+			state = transitions[state].get(char, 0)
+			if outputs[state]:
+				for entry_id in outputs[state]:
+					if self.whole_word[entry_id]:
+						start = end - self.lengths[entry_id]
+						if (start >= 0 and text[start].isalnum()) or (end + 1 < len(text) and text[end + 1].isalnum()):
+							continue
+					if found is None:
+						found = set()
+					found.add(entry_id)
+
+		matches = tuple(sorted(found)) if found else ()
+		if len(self.cache) >= SCAN_CACHE_SIZE:
+			self.cache.clear()
+		self.cache[name] = matches
+		return matches
+
+	@classmethod
+	def from_file(cls, file_path=DEFAULT_KEYWORDS_FILE):
+		"""Build a scanner from a keyword file."""
+		return cls(read_keyword_file(file_path))
+
+
+class KeywordHits:
+	"""Items matched per category and keyword, with the first max_paths paths of each category.
+
+	Paths are (line_num, base_level, path) where path is relative to
+	base_level, as in parse_chunk; serial runs use base_level 0.
+	"""
+
+	__slots__ = ('scanner', 'max_paths', 'base_level', 'items', 'categories', 'keywords', 'paths')
+
+	def __init__(self, scanner=None, max_paths=DEFAULT_KEYWORD_PATHS):
+		self.scanner = scanner
+		self.max_paths = max_paths
+		self.base_level = 0
+		# Items matching any keyword
+		self.items = 0
+		self.categories = {}
+		self.keywords = {}
+		self.paths = {}
+
+	def add(self, line_num, matches, path_stack):
+		"""Count an item with the scanner's matches, taking its path from path_stack if still wanted."""
+		self.items += 1
+		entries = self.scanner.entries
+		matched_categories = []
+		for entry_id in matches:
+			category, keyword, _ = entries[entry_id]
+			self.keywords[category, keyword] = self.keywords.get((category, keyword), 0) + 1
+			if category not in matched_categories:
+				matched_categories.append(category)
+
+		for category in matched_categories:
+			self.categories[category] = self.categories.get(category, 0) + 1
+			paths = self.paths.setdefault(category, [])
+			if len(paths) < self.max_paths:
+				path = path_stack.full_path()
+				if isinstance(path, bytes):
+					path = path.decode('utf-8')
+				paths.append((line_num, self.base_level, path))
+
+	def merge(self, state, line_offset, prefix_path):
+		"""Add a chunk's state(); prefix_path(base_level) returns the stitched prefix of its paths."""
+		self.items += state['items']
+		for category, count in state['categories']:
+			self.categories[category] = self.categories.get(category, 0) + count
+		for category, keyword, count in state['keywords']:
+			self.keywords[category, keyword] = self.keywords.get((category, keyword), 0) + count
+		for category, chunk_paths in state['paths']:
+			paths = self.paths.setdefault(category, [])
+			for line_num, base_level, path in chunk_paths[:self.max_paths - len(paths)]:
+				paths.append((line_offset + line_num, 0, prefix_path(base_level) + path))
+
+	def category_totals(self):
+		"""Return (category, items, [(keyword, items), ...], paths) by category, most items first."""
+		totals = []
+		for category, count in sorted(self.categories.items(), key=lambda x: x[1], reverse=True):
+			keywords = sorted(((keyword, hits) for (keyword_category, keyword), hits in self.keywords.items()
+							   if keyword_category == category), key=lambda x: x[1], reverse=True)
+			totals.append((category, count, keywords, [(line_num, path) for line_num, _, path in self.paths.get(category, ())]))
+		return totals
+
+	def state(self):
+		"""Return the hits as plain data, for handing back from a worker process or saving."""
+		return {
+			"max_paths": self.max_paths,
+			"items": self.items,
+			"categories": list(self.categories.items()),
+			"keywords": [(category, keyword, count) for (category, keyword), count in self.keywords.items()],
+			"paths": list(self.paths.items())
+		}
+
+	@classmethod
+	def from_state(cls, state, scanner=None):
+		"""Rebuild hits from state(), also after a JSON round trip."""
+		hits = cls(scanner, state['max_paths'])
+		hits.items = state['items']
+		hits.categories = dict(state['categories'])
+		hits.keywords = {(category, keyword): count for category, keyword, count in state['keywords']}
+		hits.paths = {category: [tuple(entry) for entry in paths] for category, paths in state['paths']}
+		return hits
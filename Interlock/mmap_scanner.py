@@ -0,0 +1,149 @@
+"""Bytes-level scanner for tree files, reading through mmap.
+
+Lines are walked as bytes straight out of the page cache. The common Interlock
+line (space/NBSP/box-drawing prefix followed by an ASCII name) is tokenized
+without decoding: the indent is counted from the UTF-8 prefix bytes and names
+stay as bytes until they are written out. Anything unusual (blank-looking
+lines, other glyphs, names starting with non-ASCII) falls back to decoding the
+line and running tokenize_line, so results always match text mode.
+"""
+import mmap
+import os
+import re
+
+from classifier import EXTENSION_CACHE_SIZE
+from file_extensions import FILE_EXTENSIONS
+from tree_tokenizer import INDENT_WIDTH, tokenize_line
+
+# Bytes making up the fast-path prefix glyphs: space, NBSP and │ ─ └ ├ in UTF-8
+PREFIX_BYTES = b' \xc2\xa0\xe2\x94\x82\x80\x9c'
+PREFIX_BYTES_PATTERN = re.compile(rb'(?: |\xc2\xa0|\xe2\x94[\x82\x80\x94\x9c])*')
+
+# Maps the ASCII separators str.isspace() accepts but bytes.split() does not onto a space
+SEPARATOR_TABLE = bytes.maketrans(b'\x1c\x1d\x1e\x1f', b'    ')
+
+# Bytes read from the map per block before splitting into lines
+BLOCK_SIZE = 1024 * 1024
+
+# Indent level per distinct prefix, or None where the prefix is not made of whole glyphs
+_prefix_levels = {}
+
+# Raw bytes after the last dot -> lower-cased extension (str) if it is a known file type, else None
+_extension_cache = {}
+
+
+class MmapLineReader:
+	"""Iterate a file's lines as bytes through mmap, tracking the byte position reached."""
+	
+	def __init__(self, file_path, block_size=BLOCK_SIZE):
+		self.file_path = file_path
+		self.block_size = block_size
+		self.position = 0
+	
+	def __iter__(self):
+		"""Yield (line_num, line) as bytes, numbering lines the same way text mode does."""
+		file_size = os.path.getsize(self.file_path)
+		if file_size == 0:
+			return
+		
+		line_num = 0
+		with open(self.file_path, 'rb') as f:
+			with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+				can_advise = hasattr(mm, 'madvise')
+				if can_advise:
+					mm.madvise(mmap.MADV_SEQUENTIAL)
+				
+				start = 0
+				while start < file_size:
+					end = min(start + self.block_size, file_size)
+					if end < file_size:
+						newline = mm.rfind(b'\n', start, end)
+						if newline == -1:
+							newline = mm.find(b'\n', end)
+						end = newline + 1 if newline != -1 else file_size
+					
+					block = mm[start:end]
+					if can_advise:
+						# Drop pages already copied out so RSS stays flat on multi-GB files
+						released = start - start % mmap.PAGESIZE
+						mm.madvise(mmap.MADV_DONTNEED, released, end - released)
+					start = self.position = end
+					lines = block.split(b'\n')
+					if block.endswith(b'\n'):
+						lines.pop()
+					
+					if b'\r' not in block:
+						for line in lines:
+							line_num += 1
+							yield line_num, line
+						continue
+					
+					for line in lines:
+						# Text mode treats a lone \r as a line break too
+						for part in line.removesuffix(b'\r').split(b'\r'):
+							line_num += 1
+							yield line_num, part
+
+def prefix_level(prefix):
+	"""Return the indent level of a prefix, or None if it is not made of whole glyphs."""
+	level = _prefix_levels.get(prefix, False)
+	if level is False:
+		if PREFIX_BYTES_PATTERN.fullmatch(prefix):
+			chars = prefix.count(b' ') + prefix.count(b'\xc2') + prefix.count(b'\xe2')
+			level = chars // INDENT_WIDTH
+		else:
+			level = None
+		if len(_prefix_levels) >= 4096:
+			_prefix_levels.clear()
+		_prefix_levels[prefix] = level
+	return level
+
+def tokenize_line_bytes(raw_line):
+	"""Return (indent_level, item_name) with item_name as UTF-8 bytes, or None for a blank line."""
+	content = raw_line.lstrip(PREFIX_BYTES)
+	
+	if content and 0x20 < content[0] < 0x80:
+		indent_level = prefix_level(raw_line[:len(raw_line) - len(content)])
+		if indent_level is not None:
+			if content.isascii():
+				return indent_level, b' '.join(content.translate(SEPARATOR_TABLE).split())
+			item_name = ' '.join(content.decode('utf-8', errors='ignore').split())
+			return indent_level, item_name.encode('utf-8')
+	
+	# Slow path: decode the whole line and use the text tokenizer
+	text_line = raw_line.decode('utf-8', errors='ignore')
+	if not text_line.strip():
+		return None
+	indent_level, item_name = tokenize_line(text_line)
+	return indent_level, item_name.encode('utf-8')
+
+def classify_item_bytes(item_name):
+	"""Return (is_file, extension, size_annotation) for a bytes name, like classifier.classify_item.
+	
+	extension and size_annotation are returned as str.
+	"""
+	size_annotation = None
+	clean_name = item_name
+	if item_name.endswith(b')'):
+		close = len(item_name) - 1
+		start = item_name.find(b'(', item_name.rfind(b')', 0, close) + 1, close)
+		if start != -1:
+			clean_name = item_name[:start].rstrip()
+			size_annotation = item_name[start + 1:close].decode('utf-8')
+	
+	_, dot, suffix = clean_name.rpartition(b'.')
+	if not dot:
+		return False, None, size_annotation
+	
+	try:
+		extension = _extension_cache[suffix]
+	except KeyError:
+		# Non-ASCII suffixes can lower-case onto ASCII ones (e.g. the Kelvin sign)
+		extension = suffix.decode('utf-8').lower()
+		if '.' + extension not in FILE_EXTENSIONS:
+			extension = None
+		if len(_extension_cache) >= EXTENSION_CACHE_SIZE:
+			_extension_cache.clear()
+		_extension_cache[suffix] = extension
+	
+	return extension is not None, extension, size_annotation
@@ -0,0 +1,64 @@
+"""Batched output sink for parser results.
+
+Formatted records are collected in a list and joined into one large write
+every batch_records records, on top of a stream opened with a large
+buffer. Nothing is flushed until flush() or close() is called, so console
+output is not line-buffered record by record.
+"""
+import sys
+
+# Records collected before they are joined and handed to the stream
+DEFAULT_BATCH_RECORDS = 4096
+
+# Buffer size for output files, in bytes
+DEFAULT_BUFFER_SIZE = 1024 * 1024
+
+
+class OutputSink:
+	"""Collect output text and write it to a stream in bulk."""
+
+	def __init__(self, stream, batch_records=DEFAULT_BATCH_RECORDS, close_stream=True):
+		self.stream = stream
+		self.batch_records = batch_records
+		self.close_stream = close_stream
+		self.pending = []
+
+	def write(self, text):
+		"""Queue text for output, writing the batch once it is full."""
+		self.pending.append(text)
+		if len(self.pending) >= self.batch_records:
+			self.write_pending()
+
+	def write_pending(self):
+		"""Hand queued text to the stream as a single write."""
+		if self.pending:
+			self.stream.write(''.join(self.pending))
+			self.pending.clear()
+
+	def flush(self):
+		"""Write queued text and flush the stream."""
+		self.write_pending()
+		self.stream.flush()
+
+	def close(self):
+		"""Flush everything and close the stream if the sink owns it."""
+		self.flush()
+		if self.close_stream:
+			self.stream.close()
+
+
+def open_output_sink(output_file_path=None, buffer_size=DEFAULT_BUFFER_SIZE, batch_records=DEFAULT_BATCH_RECORDS, resume_position=None):
+	"""Open a sink on output_file_path, or on stdout when no path is given.
+	
+	With resume_position the existing file is kept up to that position and
+	writing continues from there.
+	"""
+	if output_file_path:
+		if resume_position is None:
+			stream = open(output_file_path, 'w', encoding='utf-8', buffering=buffer_size)
+		else:
+			stream = open(output_file_path, 'r+', encoding='utf-8', buffering=buffer_size)
+			stream.seek(resume_position)
+			stream.truncate()
+		return OutputSink(stream, batch_records)
+	return OutputSink(sys.stdout, batch_records, close_stream=False)
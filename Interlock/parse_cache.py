@@ -0,0 +1,230 @@
+"""On-disk cache of parse results for unchanged tree files.
+
+Entries are keyed on the input's size, mtime and a sampled content hash,
+the parser version and the options that change the result. Each entry is
+a directory holding the final statistics as JSON and the written items as
+zlib-compressed marshal batches, so a rerun replays the items into any
+output format without tokenizing the tree again. Entries are evicted least
+recently used first once the cache grows past max_bytes.
+"""
+import hashlib
+import json
+import marshal
+import os
+import shutil
+import struct
+import sys
+import tempfile
+import zlib
+from collections import defaultdict
+
+from keyword_scanner import KeywordHits
+from record_writers import RECORD_FIELDS, item_record
+from rollup import DirectoryRollup
+
+DEFAULT_CACHE_DIR = os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'), 'interlock')
+
+DEFAULT_CACHE_MAX_BYTES = 2 * 1024 ** 3
+
+# Bytes hashed at each of SAMPLE_COUNT evenly spaced offsets (including head and tail)
+SAMPLE_SIZE = 1024 * 1024
+SAMPLE_COUNT = 16
+
+# Records per compressed batch
+RECORD_BATCH_SIZE = 10000
+
+STATS_FILE = 'stats.json'
+RECORDS_FILE = 'records.bin'
+BATCH_HEADER = struct.Struct('<I')
+
+
+def file_fingerprint(file_path):
+	"""Hash evenly spaced samples of a file; the whole file if it is small."""
+	file_size = os.path.getsize(file_path)
+	digest = hashlib.blake2b(str(file_size).encode(), digest_size=16)
+	with open(file_path, 'rb') as f:
+		if file_size <= SAMPLE_SIZE * SAMPLE_COUNT:
+			for block in iter(lambda: f.read(SAMPLE_SIZE), b''):
+				digest.update(block)
+		else:
+			step = (file_size - SAMPLE_SIZE) // (SAMPLE_COUNT - 1)
+			for sample in range(SAMPLE_COUNT):
+				f.seek(sample * step)
+				digest.update(f.read(SAMPLE_SIZE))
+	return digest.hexdigest()
+
+def stats_to_json(stats):
+	"""Return the parser's stats dict as JSON-compatible data."""
+	data = {
+		"total_lines": stats['total_lines'],
+		"files_count": stats['files_count'],
+		"extensions": stats['extensions'],
+		"sizes": stats['sizes'],
+		"rollup": None,
+		"keywords": stats['keywords'].state() if stats['keywords'] is not None else None,
+		"strings": stats['strings']
+	}
+	if stats['rollup'] is not None:
+		data['rollup'] = rollup_state = stats['rollup'].state()
+		for heap in ('by_files', 'by_bytes'):
+			rollup_state[heap] = [entry[:5] + (decode_path(entry[5]),) for entry in rollup_state[heap]]
+	return data
+
+def stats_from_json(data):
+	"""Rebuild a stats dict written by stats_to_json."""
+	sizes = data['sizes']
+	sizes['extension_bytes'] = defaultdict(int, sizes['extension_bytes'])
+	stats = {
+		"total_lines": data['total_lines'],
+		"files_count": data['files_count'],
+		"extensions": defaultdict(int, data['extensions']),
+		"sizes": sizes,
+		"rollup": None,
+		"keywords": KeywordHits.from_state(data['keywords']) if data['keywords'] is not None else None,
+		"strings": data['strings']
+	}
+	if data['rollup'] is not None:
+		stats['rollup'] = DirectoryRollup.from_state(data['rollup'])
+	return stats
+
+def decode_path(path):
+	"""Return path (or a name) as str; the mmap loop works on undecoded ones."""
+	return path.decode('utf-8') if isinstance(path, bytes) else path
+
+
+class CacheEntry:
+	"""Item writer that forwards to writer and records the items for the cache."""
+
+	def __init__(self, cache, key, writer):
+		self.cache = cache
+		self.key = key
+		self.writer = writer
+		self.directory = tempfile.mkdtemp(prefix='.tmp-', dir=cache.cache_dir)
+		self.records_file = open(os.path.join(self.directory, RECORDS_FILE), 'wb')
+		self.batch = []
+		self.bytes_written = 0
+
+	def write_item(self, item):
+		self.writer.write_item(item)
+		if self.records_file is not None:
+			self.batch.append(item_record(item))
+			if len(self.batch) >= RECORD_BATCH_SIZE:
+				self.write_batch()
+
+	def write_batch(self):
+		"""Compress and write the pending records, giving up once the entry is too big or can't be written."""
+		data = zlib.compress(marshal.dumps(self.batch), 1)
+		self.batch.clear()
+		try:
+			self.records_file.write(BATCH_HEADER.pack(len(data)) + data)
+		except OSError as e:
+			print(f"Note: can't write the parse cache ({e}); this run won't be cached", file=sys.stderr)
+			self.records_file.close()
+			self.records_file = None
+			return
+		self.bytes_written += BATCH_HEADER.size + len(data)
+		if self.bytes_written > self.cache.max_bytes:
+			self.records_file.close()
+			self.records_file = None
+
+	def commit(self, stats):
+		"""Store the entry with its final stats and apply the size limit."""
+		if self.records_file is None:
+			self.discard()
+			return
+		if self.batch:
+			self.write_batch()
+		if self.records_file is None:
+			self.discard()
+			return
+		self.records_file.close()
+
+		with open(os.path.join(self.directory, STATS_FILE), 'w', encoding='utf-8') as f:
+			json.dump(stats_to_json(stats), f)
+		entry_directory = os.path.join(self.cache.cache_dir, self.key)
+		shutil.rmtree(entry_directory, ignore_errors=True)
+		os.rename(self.directory, entry_directory)
+		self.cache.evict()
+
+	def discard(self):
+		"""Drop the partly written entry, e.g. after an interrupt."""
+		if self.records_file is not None:
+			self.records_file.close()
+			self.records_file = None
+		shutil.rmtree(self.directory, ignore_errors=True)
+
+
+class CachedResult:
+	"""A cache hit: final stats plus the recorded items."""
+
+	def __init__(self, directory, stats):
+		self.directory = directory
+		self.stats = stats
+
+	def items(self):
+		"""Yield the recorded items as the item dicts the writers take."""
+		with open(os.path.join(self.directory, RECORDS_FILE), 'rb') as f:
+			while True:
+				header = f.read(BATCH_HEADER.size)
+				if not header:
+					break
+				data = f.read(BATCH_HEADER.unpack(header)[0])
+				for record in marshal.loads(zlib.decompress(data)):
+					yield dict(zip(RECORD_FIELDS, record))
+
+
+class ParseCache:
+	"""Directory of cached parse results with a total size limit."""
+
+	def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_CACHE_MAX_BYTES):
+		self.cache_dir = cache_dir
+		self.max_bytes = max_bytes
+		os.makedirs(cache_dir, exist_ok=True)
+
+	def key(self, file_path, parser_version, **options):
+		"""Return the cache key for parsing file_path with options."""
+		file_stat = os.stat(file_path)
+		key_data = [parser_version, file_stat.st_size, file_stat.st_mtime_ns, file_fingerprint(file_path), sorted(options.items())]
+		return hashlib.blake2b(json.dumps(key_data).encode(), digest_size=16).hexdigest()
+
+	def load(self, key):
+		"""Return the CachedResult for key, or None on a miss."""
+		entry_directory = os.path.join(self.cache_dir, key)
+		stats_path = os.path.join(entry_directory, STATS_FILE)
+		try:
+			with open(stats_path, encoding='utf-8') as f:
+				stats = stats_from_json(json.load(f))
+		except (OSError, ValueError, KeyError):
+			return None
+		# The stats file's mtime is the entry's last use, for eviction
+		try:
+			os.utime(stats_path)
+		except OSError:
+			pass
+		return CachedResult(entry_directory, stats)
+
+	def start_entry(self, key, writer):
+		"""Return a CacheEntry that records what is written through it."""
+		return CacheEntry(self, key, writer)
+
+	def evict(self):
+		"""Remove least recently used entries until the cache fits in max_bytes."""
+		entries = []
+		total_bytes = 0
+		for name in os.listdir(self.cache_dir):
+			entry_directory = os.path.join(self.cache_dir, name)
+			if name.startswith('.') or not os.path.isdir(entry_directory):
+				continue
+			try:
+				last_used = os.path.getmtime(os.path.join(entry_directory, STATS_FILE))
+				entry_bytes = sum(entry.stat().st_size for entry in os.scandir(entry_directory))
+			except OSError:
+				continue
+			entries.append((last_used, entry_bytes, entry_directory))
+			total_bytes += entry_bytes
+
+		for last_used, entry_bytes, entry_directory in sorted(entries):
+			if total_bytes <= self.max_bytes:
+				break
+			shutil.rmtree(entry_directory, ignore_errors=True)
+			total_bytes -= entry_bytes
@@ -0,0 +1,48 @@
+"""Incremental ancestor stack for building full paths lazily.
+
+The joined path of the current item's parent is cached, so runs of sibling
+items (the bulk of any tree) cost a single concatenation each, and the parent
+is only re-joined after the stack changes above the last level. Full paths
+are only built when an item is actually written out. Works on str or bytes
+names depending on the separator it is created with.
+"""
+
+
+class PathStack:
+	"""Ancestor names by indent level, with a cached parent prefix."""
+
+	__slots__ = ('separator', 'names', 'parent_path')
+
+	def __init__(self, separator="/"):
+		self.separator = separator
+		self.names = []
+		# separator.join(names[:-1]) + separator, or None once it is stale
+		self.parent_path = None
+
+	def update(self, indent_level, name):
+		"""Set name at indent_level, dropping deeper levels.
+
+		Missing levels in between are padded with empty names, as the original
+		update_path did for malformed trees.
+		"""
+		names = self.names
+		if indent_level == len(names) - 1:
+			# Sibling of the previous item: the parent is unchanged
+			names[-1] = name
+			return
+
+		if indent_level < len(names):
+			del names[indent_level:]
+		elif indent_level > len(names):
+			names.extend([self.separator[:0]] * (indent_level - len(names)))
+		names.append(name)
+		self.parent_path = None
+
+	def full_path(self):
+		"""Return the joined path of the current item."""
+		names = self.names
+		if len(names) == 1:
+			return names[0]
+		if self.parent_path is None:
+			self.parent_path = self.separator.join(names[:-1]) + self.separator
+		return self.parent_path + names[-1]
@@ -0,0 +1,125 @@
+"""Throttled progress reporters for the tree parser.
+
+The parsing loops never talk to tqdm or print directly. They keep a local
+line threshold and only call reporter.update() once check_every lines have
+gone by, so the per-line cost is a single integer comparison. Reporters can
+throttle further by wall-clock time before doing any formatting.
+
+To add a reporter, subclass Progress and register it in PROGRESS_REPORTERS.
+"""
+import sys
+import time
+
+from sizes import format_bytes
+
+try:
+	from tqdm import tqdm
+	HAS_TQDM = True
+except ImportError:
+	HAS_TQDM = False
+
+
+class Progress:
+	"""Base reporter that does nothing; also the interface the parsing loops use."""
+
+	# Lines between update() calls; sys.maxsize means update() is never called
+	check_every = sys.maxsize
+
+	def start(self, total_bytes):
+		"""Called once before parsing with the input size in bytes, or None if unknown (stdin)."""
+
+	def update(self, position, total_lines, files_count):
+		"""Called every check_every lines with the byte position reached."""
+
+	def finish(self, position, total_lines, files_count):
+		"""Called after the last line has been parsed."""
+
+	def close(self):
+		"""Called once when parsing stops, including after an interrupt."""
+
+
+class NullProgress(Progress):
+	"""Silent reporter for batch jobs."""
+
+
+class SimpleProgress(Progress):
+	"""Print a plain progress line to stderr every interval lines."""
+
+	def __init__(self, interval=50000):
+		self.check_every = interval
+		self.total_bytes = 0
+
+	def start(self, total_bytes):
+		self.total_bytes = total_bytes
+
+	def update(self, position, total_lines, files_count):
+		if self.total_bytes is None:
+			done = f"{format_bytes(position)} read"
+		else:
+			done = f"{position / self.total_bytes * 100 if self.total_bytes else 100.0:.1f}% of input"
+		print(f"[Progress: {total_lines:,} lines processed, {files_count:,} files found, {done}]", file=sys.stderr)
+
+
+class TqdmProgress(Progress):
+	"""Byte-based tqdm bar, redrawn at most every min_interval seconds."""
+
+	def __init__(self, check_every=1000, min_interval=0.1):
+		self.check_every = check_every
+		self.min_interval = min_interval
+		self.progress_bar = None
+		self.last_refresh = 0.0
+
+	def start(self, total_bytes):
+		self.progress_bar = tqdm(
+			total=total_bytes,
+			desc="Processing",
+			unit="B",
+			unit_scale=True,
+			unit_divisor=1024,
+			file=sys.stderr
+		)
+		self.last_refresh = time.monotonic()
+
+	def update(self, position, total_lines, files_count):
+		now = time.monotonic()
+		if now - self.last_refresh >= self.min_interval:
+			self.last_refresh = now
+			self.refresh(position, total_lines, files_count)
+
+	def finish(self, position, total_lines, files_count):
+		self.refresh(position, total_lines, files_count)
+
+	def refresh(self, position, total_lines, files_count):
+		"""Redraw the bar at position with up to date counters."""
+		elapsed = time.time() - self.progress_bar.start_t
+		lines_rate = total_lines / elapsed if elapsed > 0 else 0
+		self.progress_bar.set_postfix({
+			'Lines': f"{total_lines:,}",
+			'Lines/s': f"{lines_rate:,.0f}",
+			'Files': f"{files_count:,}"
+		}, refresh=False)
+		self.progress_bar.update(position - self.progress_bar.n)
+
+	def close(self):
+		if self.progress_bar is not None:
+			self.progress_bar.close()
+
+
+PROGRESS_REPORTERS = {
+	'none': NullProgress,
+	'simple': SimpleProgress,
+	'tqdm': TqdmProgress,
+}
+
+
+def make_progress(mode, progress_interval=50000):
+	"""Build a reporter by name, falling back to simple progress if tqdm is missing."""
+	if mode == 'auto':
+		mode = 'tqdm' if HAS_TQDM else 'simple'
+	elif mode == 'tqdm' and not HAS_TQDM:
+		print("Warning: tqdm not available, falling back to simple progress", file=sys.stderr)
+		mode = 'simple'
+
+	if mode == 'simple':
+		return SimpleProgress(progress_interval)
+	return PROGRESS_REPORTERS[mode]()
@@ -0,0 +1,113 @@
+"""Machine-readable record writers: JSON Lines, CSV and Parquet.
+
+Each writer takes the same item dicts the text output uses (with is_file,
+extension and size filled in by the parser) and streams them out one record
+per item. Parquet is written in row groups of row_group_size rows so memory stays
+bounded regardless of input size.
+"""
+import csv
+import json
+
+from output_sink import DEFAULT_BUFFER_SIZE, open_output_sink
+
+try:
+	import pyarrow as pa
+	import pyarrow.parquet as pq
+	HAS_PYARROW = True
+except ImportError:
+	HAS_PYARROW = False
+
+RECORD_FIELDS = ('line_num', 'indent_level', 'item_name', 'full_path', 'is_file', 'extension', 'size')
+
+# Rows buffered per Parquet row group
+ROW_GROUP_SIZE = 100000
+
+
+def item_record(item):
+	"""Return the RECORD_FIELDS values for an item."""
+	return (
+		item['line_num'],
+		item['indent_level'],
+		item['item_name'],
+		item['full_path'],
+		item['is_file'],
+		item['extension'],
+		item['size']
+	)
+
+
+class JsonLinesWriter:
+	"""Write one JSON object per item."""
+
+	def __init__(self, output_file_path=None, buffer_size=DEFAULT_BUFFER_SIZE, resume_position=None):
+		self.output = open_output_sink(output_file_path, buffer_size, resume_position=resume_position)
+
+	def write_item(self, item):
+		self.output.write(json.dumps(dict(zip(RECORD_FIELDS, item_record(item))), ensure_ascii=False) + '\n')
+
+	def close(self):
+		self.output.close()
+
+
+class CsvWriter:
+	"""Write items as CSV rows with a header row."""
+
+	def __init__(self, output_file_path=None, buffer_size=DEFAULT_BUFFER_SIZE, resume_position=None):
+		self.output = open_output_sink(output_file_path, buffer_size, resume_position=resume_position)
+		self.writer = csv.writer(self.output, lineterminator='\n')
+		if resume_position is None:
+			self.writer.writerow(RECORD_FIELDS)
+
+	def write_item(self, item):
+		self.writer.writerow(item_record(item))
+
+	def close(self):
+		self.output.close()
+
+
+class ParquetWriter:
+	"""Write items to a Parquet file in fixed-size row groups."""
+
+	def __init__(self, output_file_path=None, buffer_size=DEFAULT_BUFFER_SIZE, resume_position=None, row_group_size=ROW_GROUP_SIZE):
+		if not HAS_PYARROW:
+			raise RuntimeError("pyarrow is required for --format parquet (pip install pyarrow)")
+		if not output_file_path:
+			raise ValueError("--format parquet needs an output file (-o)")
+		if resume_position is not None:
+			raise ValueError("--resume is not supported with --format parquet")
+
+		self.schema = pa.schema([
+			('line_num', pa.uint64()),
+			('indent_level', pa.uint16()),
+			('item_name', pa.string()),
+			('full_path', pa.string()),
+			('is_file', pa.bool_()),
+			('extension', pa.string()),
+			('size', pa.uint64())
+		])
+		self.writer = pq.ParquetWriter(output_file_path, self.schema)
+		self.row_group_size = row_group_size
+		self.columns = [[] for _ in RECORD_FIELDS]
+
+	def write_item(self, item):
+		for column, value in zip(self.columns, item_record(item)):
+			column.append(value)
+		if len(self.columns[0]) >= self.row_group_size:
+			self.write_row_group()
+
+	def write_row_group(self):
+		"""Write buffered rows as one row group."""
+		if self.columns[0]:
+			self.writer.write_table(pa.Table.from_arrays(self.columns, schema=self.schema))
+			self.columns = [[] for _ in RECORD_FIELDS]
+
+	def close(self):
+		self.write_row_group()
+		self.writer.close()
+
+
+RECORD_WRITERS = {
+	'jsonl': JsonLinesWriter,
+	'csv': CsvWriter,
+	'parquet': ParquetWriter,
+}
@@ -0,0 +1,120 @@
+"""Streaming per-directory rollup of file counts and bytes.
+
+Open directories are kept on a stack. Files count towards the innermost open
+directory, and when a directory closes (an item at the same or a shallower
+level appears) its totals are final: they are added to its parent and offered
+to two bounded top-N heaps, by file count and by bytes. Memory is the depth of
+the tree plus 2 * top entries, however many directories the listing has.
+max_depth limits which directories are ranked; deeper ones still count
+towards their ancestors and never have their path joined.
+"""
+import heapq
+
+# Directories listed by default in each ranking
+DEFAULT_TOP_DIRECTORIES = 20
+
+
+class DirectoryRollup:
+	"""Per-directory file and byte totals, keeping only the top directories."""
+
+	__slots__ = ('top', 'max_depth', 'separator', 'base_level', 'stack', 'inherited', 'by_files', 'by_bytes', 'ranked')
+
+	def __init__(self, top=DEFAULT_TOP_DIRECTORIES, max_depth=None, separator="/"):
+		self.top = top
+		self.max_depth = max_depth
+		self.separator = separator
+		# Indent level of names[0] in the names lists passed in (parse_chunk tracks relative paths)
+		self.base_level = 0
+		# [files, bytes, indent_level, line_num] for each open directory, outermost first
+		self.stack = []
+		# [files, bytes, indent_level] for totals that belong to directories opened
+		# before this rollup started: items at indent_level close those at that
+		# level or deeper, then the totals go to the innermost one still open
+		self.inherited = []
+		# Min-heaps of (key, -line_num, files, bytes, base_level, path)
+		self.by_files = []
+		self.by_bytes = []
+		self.ranked = 0
+
+	def update(self, line_num, indent_level, item_name, is_file, size, names):
+		"""Account for one item; names is the path stack before the item is added.
+
+		An empty name (a line of tree glyphs only) closes directories like any
+		item but opens none, so what follows it counts towards the enclosing one.
+		"""
+		totals = self.close_to(indent_level, names)
+		if is_file:
+			totals[0] += 1
+			if size:
+				totals[1] += size
+		elif item_name:
+			self.stack.append([0, 0, indent_level, line_num])
+
+	def close_to(self, indent_level, names):
+		"""Close directories at indent_level or deeper and return the totals new items count towards."""
+		stack = self.stack
+		while stack and stack[-1][2] >= indent_level:
+			self.close_directory(names)
+		if stack:
+			return stack[-1]
+
+		inherited = self.inherited
+		if not inherited or indent_level < inherited[-1][2]:
+			inherited.append([0, 0, indent_level])
+		return inherited[-1]
+
+	def close_directory(self, names):
+		"""Pop the innermost open directory, add it to its parent and rank it."""
+		files, size, indent_level, line_num = self.stack.pop()
+		parent = self.stack[-1] if self.stack else self.inherited[-1]
+		parent[0] += files
+		parent[1] += size
+
+		if self.max_depth is None or indent_level < self.max_depth:
+			self.ranked += 1
+			order = -line_num
+			candidates = [(heap, key) for heap, key in ((self.by_files, files), (self.by_bytes, size))
+						  if len(heap) < self.top or (key, order) > heap[0][:2]]
+			if candidates:
+				path = self.separator.join(names[:indent_level - self.base_level + 1])
+				for heap, key in candidates:
+					self.offer(heap, (key, order, files, size, self.base_level, path))
+
+	def offer(self, heap, entry):
+		"""Push entry onto heap, dropping the smallest once it holds top entries."""
+		if len(heap) < self.top:
+			heapq.heappush(heap, entry)
+		elif entry > heap[0]:
+			heapq.heapreplace(heap, entry)
+
+	def finish(self, names):
+		"""Close every directory still open at the end of the input."""
+		while self.stack:
+			self.close_directory(names)
+
+	def state(self):
+		"""Return the rollup as plain data, for handing back from a worker process or saving."""
+		return {
+			"top": self.top,
+			"max_depth": self.max_depth,
+			"inherited": self.inherited,
+			"stack": self.stack,
+			"by_files": self.by_files,
+			"by_bytes": self.by_bytes,
+			"ranked": self.ranked
+		}
+
+	@classmethod
+	def from_state(cls, state, separator="/"):
+		"""Rebuild a rollup from state(), also after a JSON round trip."""
+		rollup = cls(state['top'], state['max_depth'], separator)
+		rollup.inherited = [list(totals) for totals in state['inherited']]
+		rollup.stack = [list(entry) for entry in state['stack']]
+		rollup.by_files = [tuple(entry) for entry in state['by_files']]
+		rollup.by_bytes = [tuple(entry) for entry in state['by_bytes']]
+		rollup.ranked = state['ranked']
+		return rollup
+
+	def top_directories(self, heap):
+		"""Return (path, files, bytes) for heap, largest first."""
+		return [(path, files, size) for _, _, files, size, _, path in sorted(heap, reverse=True)]
@@ -0,0 +1,151 @@
+"""Size annotation parsing and byte-volume statistics.
+
+Size annotations like "1.2 MB", "1,234 KB", "3,5 GiB" or "512 bytes" are
+decoded to integer bytes. KB/MB/GB are treated as binary multiples, the same
+as the KiB/MiB/GiB forms, matching how tree listings on Windows and most
+leak sites report sizes. Aggregates are kept in a handful of counters whose
+size depends on the number of extensions and top-level directories (and the
+directories right below them), not on the number of files.
+"""
+import re
+from collections import defaultdict
+
+SIZE_UNITS = {
+	'': 1, 'b': 1, 'byte': 1, 'bytes': 1,
+	'k': 1024, 'kb': 1024, 'kib': 1024,
+	'm': 1024 ** 2, 'mb': 1024 ** 2, 'mib': 1024 ** 2,
+	'g': 1024 ** 3, 'gb': 1024 ** 3, 'gib': 1024 ** 3,
+	't': 1024 ** 4, 'tb': 1024 ** 4, 'tib': 1024 ** 4,
+	'p': 1024 ** 5, 'pb': 1024 ** 5, 'pib': 1024 ** 5,
+}
+
+SIZE_PATTERN = re.compile(r'\s*(\d[\d,.]*)\s*([A-Za-z]*)\s*$')
+
+# Digit groups after the first comma that mark it as a thousands separator
+THOUSANDS_PATTERN = re.compile(r'\d{1,3}(?:,\d{3})+$')
+
+# Annotation text -> bytes (or None), reset once it grows past SIZE_CACHE_SIZE
+_size_cache = {}
+SIZE_CACHE_SIZE = 65536
+
+# Largest size kept; SQLite integers, the parquet size column and TreeTable's
+# array('q') are all signed 64-bit
+MAX_SIZE = 2 ** 63 - 1
+
+# Buckets are powers of two: bucket n holds sizes with bit_length() == n
+HISTOGRAM_BUCKETS = 65
+
+# Name used for files that sit directly at the top level
+TOP_LEVEL_FILES = "(top level)"
+
+
+def parse_number(text):
+	"""Parse a number that may use ',' or '.' as thousands or decimal separator."""
+	if ',' in text and '.' in text:
+		if text.rfind(',') > text.rfind('.'):
+			text = text.replace('.', '').replace(',', '.')
+		else:
+			text = text.replace(',', '')
+	elif ',' in text:
+		text = text.replace(',', '') if THOUSANDS_PATTERN.match(text) else text.replace(',', '.')
+	return float(text)
+
+def parse_size(size_annotation):
+	"""Return the size annotation in bytes, or None if it is not a size or beyond MAX_SIZE."""
+	try:
+		return _size_cache[size_annotation]
+	except KeyError:
+		pass
+
+	size = None
+	size_match = SIZE_PATTERN.match(size_annotation)
+	if size_match:
+		multiplier = SIZE_UNITS.get(size_match.group(2).lower())
+		if multiplier is not None:
+			try:
+				size = round(parse_number(size_match.group(1)) * multiplier)
+			except (ValueError, OverflowError):
+				# A long enough digit run parses as inf
+				size = None
+			if size is not None and size > MAX_SIZE:
+				size = None
+
+	if len(_size_cache) >= SIZE_CACHE_SIZE:
+		_size_cache.clear()
+	_size_cache[size_annotation] = size
+	return size
+
+def format_bytes(size):
+	"""Format a byte count for humans, e.g. 1536 -> '1.5 KB'."""
+	for unit in ('B', 'KB', 'MB', 'GB', 'TB', 'PB'):
+		if size < 1024 or unit == 'PB':
+			return f"{size:,} B" if unit == 'B' else f"{size:,.1f} {unit}"
+		size /= 1024
+
+def new_size_stats():
+	"""Return empty byte-volume counters."""
+	return {
+		"sized_files": 0,
+		"total_bytes": 0,
+		"extension_bytes": defaultdict(int),
+		# Top-level directory -> directory below it -> bytes
+		"directory_bytes": {},
+		"histogram": [0] * HISTOGRAM_BUCKETS
+	}
+
+def leading_directories(names, depth):
+	"""Return the first two non-empty names among names[:depth], the directories a file is counted under.
+
+	Padded levels of malformed or indented listings have empty names and are
+	skipped. The second name is only reported when everything turns out to
+	sit under a single root.
+	"""
+	found = ()
+	for index in range(depth):
+		if names[index]:
+			found += (names[index],)
+			if len(found) == 2:
+				break
+	return found
+
+def add_directory_bytes(size_stats, directories, size):
+	"""Add size under the leading_directories() of a file."""
+	top = directories[0] if directories else TOP_LEVEL_FILES
+	below = directories[1] if len(directories) > 1 else TOP_LEVEL_FILES
+	by_below = size_stats['directory_bytes'].setdefault(top, {})
+	by_below[below] = by_below.get(below, 0) + size
+
+def add_file_size(size_stats, extension, directories, size):
+	"""Count one file of size bytes under its extension and leading directories (None leaves them to the caller)."""
+	size_stats['sized_files'] += 1
+	size_stats['total_bytes'] += size
+	size_stats['extension_bytes'][extension] += size
+	if directories is not None:
+		add_directory_bytes(size_stats, directories, size)
+	size_stats['histogram'][min(size.bit_length(), HISTOGRAM_BUCKETS - 1)] += 1
+
+def merge_size_stats(size_stats, other):
+	"""Add other into size_stats."""
+	size_stats['sized_files'] += other['sized_files']
+	size_stats['total_bytes'] += other['total_bytes']
+	for extension, size in other['extension_bytes'].items():
+		size_stats['extension_bytes'][extension] += size
+	for top, by_below in other['directory_bytes'].items():
+		for below, size in by_below.items():
+			add_directory_bytes(size_stats, (top, below), size)
+	for bucket, count in enumerate(other['histogram']):
+		size_stats['histogram'][bucket] += count
+
+def directory_totals(directory_bytes):
+	"""Return (root, {directory: bytes}): per top-level directory, or per directory below the root when there is only one."""
+	if len(directory_bytes) == 1 and TOP_LEVEL_FILES not in directory_bytes:
+		(root, by_below), = directory_bytes.items()
+		return root, by_below
+	return None, {top: sum(by_below.values()) for top, by_below in directory_bytes.items()}
+
+def histogram_ranges(histogram):
+	"""Yield (low, limit, count) for the non-empty histogram buckets, holding sizes from low up to but excluding limit."""
+	for bucket, count in enumerate(histogram):
+		if count:
+			low = 0 if bucket == 0 else 1 << (bucket - 1)
+			yield low, 1 << bucket, count
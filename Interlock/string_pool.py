@@ -0,0 +1,111 @@
+"""Interning of the strings a leak tree repeats many times.
+
+Folder names like "Documents", "Archive", "2023" or a user name come back
+for every directory that holds them. A StringPool hands out one canonical
+object per distinct value, so path stacks and records share it instead of
+keeping a copy per occurrence, and counts what that saved for the final
+statistics. Works on str or bytes; sizes are always those of the str, so
+the counters come out the same whichever loop parsed the file. Worker
+processes record their chunk's names with ChunkNames, which the main
+process merges into its pool as if it had seen the names itself.
+"""
+import sys
+from array import array
+
+# Distinct strings kept before the pool is reset, so unique names can't grow it without bound
+STRING_POOL_SIZE = 65536
+
+
+def new_string_stats():
+	"""Return empty interning counters."""
+	return {"unique": 0, "repeats": 0, "saved_bytes": 0}
+
+def str_size(value):
+	"""Return the memory a copy of value takes as a str."""
+	return sys.getsizeof(value.decode('utf-8', 'surrogateescape') if isinstance(value, bytes) else value)
+
+
+class StringPool:
+	"""Canonical instances of repeated strings, counting unique values, repeats and bytes saved.
+
+	stats is a new_string_stats() dict updated in place; once max_size
+	distinct values are held the pool starts over, so values seen again
+	after that count as unique once more.
+	"""
+
+	__slots__ = ('strings', 'stats', 'max_size')
+
+	def __init__(self, stats=None, max_size=STRING_POOL_SIZE):
+		# value -> (canonical value, str_size(value))
+		self.strings = {}
+		self.stats = new_string_stats() if stats is None else stats
+		self.max_size = max_size
+
+	def intern(self, value):
+		"""Return the pool's instance of value, adding value if it is new."""
+		try:
+			canonical, size = self.strings[value]
+		except KeyError:
+			if len(self.strings) >= self.max_size:
+				self.strings.clear()
+			self.strings[value] = (value, str_size(value))
+			self.stats['unique'] += 1
+			return value
+
+		# The caller's copy can now be freed
+		self.stats['repeats'] += 1
+		self.stats['saved_bytes'] += size
+		return canonical
+
+	def merge(self, chunk_names):
+		"""Count a ChunkNames state() as if its names had been interned here, in order."""
+		names, counts, sequence = chunk_names
+		intern = self.intern
+		if len(self.strings) + len(names) > self.max_size:
+			# The pool may reset part way, so which repeats it catches depends on the order
+			for name_id in sequence:
+				intern(names[name_id])
+			return
+
+		# No reset can happen: each name's first occurrence decides, later ones are repeats
+		stats = self.stats
+		for name, count in zip(names, counts):
+			intern(name)
+			if count > 1:
+				stats['repeats'] += count - 1
+				stats['saved_bytes'] += (count - 1) * self.strings[name][1]
+
+	def state(self):
+		"""Return the pooled values as str, for a checkpoint."""
+		return [value.decode('utf-8', 'surrogateescape') if isinstance(value, bytes) else value for value in self.strings]
+
+	def restore(self, values):
+		"""Continue with the values of a state() taken earlier."""
+		self.strings = {value: (value, str_size(value)) for value in values}
+
+
+class ChunkNames:
+	"""The names interned in one worker chunk: each distinct one once, with its count and the order they came in."""
+
+	__slots__ = ('ids', 'names', 'counts', 'sequence')
+
+	def __init__(self):
+		self.ids = {}
+		self.names = []
+		self.counts = []
+		self.sequence = array('I')
+
+	def intern(self, value):
+		"""Return the chunk's instance of value, recording the occurrence."""
+		name_id = self.ids.get(value)
+		if name_id is None:
+			name_id = self.ids[value] = len(self.names)
+			self.names.append(value)
+			self.counts.append(0)
+		self.counts[name_id] += 1
+		self.sequence.append(name_id)
+		return self.names[name_id]
+
+	def state(self):
+		"""Return (names, counts, sequence) for StringPool.merge in the main process."""
+		return self.names, self.counts, self.sequence
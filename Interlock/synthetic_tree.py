@@ -0,0 +1,139 @@
+"""Deterministic synthetic Interlock-style tree listings for benchmarks.
+
+The same seed and options always give the same listing, so timings and
+outputs can be compared between revisions. Lines are drawn like the real
+leak listings (│\\xa0\\xa0 continuation units, ├── / └── connectors, "(549 KB)"
+size annotations), and a share of them are malformed the ways real dumps
+are: blank and glyph-only lines, odd indentation, skipped levels, stray
+whitespace, broken size annotations, invalid UTF-8 bytes and CRLF endings.
+
+    python synthetic_tree.py tree.txt --lines 1000000 --malformed 0.02
+"""
+import argparse
+import random
+
+FOLDER_NAMES = (
+	'Documents', 'Finance', 'HR', 'Archive', '2023', '2024', 'Backup', 'Scans', 'Payroll',
+	'Contracts', 'Invoices', 'Users', 'jsmith', 'Shared', 'Projects', 'Old', 'Temp',
+	'Übersicht', 'Contabilità', 'Документы', 'Desktop  Copy', 'Q1 (draft)'
+)
+
+# Extension -> relative weight; names ending in other text are directories to the parser
+DEFAULT_EXTENSIONS = {
+	'pdf': 20, 'docx': 15, 'xlsx': 12, 'jpg': 15, 'msg': 8, 'txt': 8, 'png': 6, 'zip': 5,
+	'eml': 4, 'csv': 3, 'sql': 2, 'bak': 2, 'pst': 1, 'ts': 1, 'PDF': 1, 'tar.gz': 1, 'unknownext': 2
+}
+
+SIZE_UNITS = ('B', 'KB', 'KB', 'KB', 'MB', 'MB', 'GB')
+
+# Characters for one level of indentation before the connector
+INDENT_UNITS = ('│\xa0\xa0 ', '│   ')
+CONNECTORS = ('├── ', '└── ')
+
+MALFORMED_KINDS = (
+	'blank', 'glyphs', 'odd_indent', 'skipped_levels', 'whitespace',
+	'broken_size', 'invalid_utf8', 'crlf'
+)
+
+
+def size_annotation(rng):
+	"""Return a random "(size unit)" annotation, sometimes with decimals or separators."""
+	unit = rng.choice(SIZE_UNITS)
+	if rng.random() < 0.2:
+		return f"({rng.randrange(1, 1000)}.{rng.randrange(10)} {unit})"
+	if unit == 'B' and rng.random() < 0.5:
+		return f"({rng.randrange(1000, 100000):,} {unit})"
+	return f"({rng.randrange(1, 1000)} {unit})"
+
+def generate_lines(count, seed=1, max_depth=12, descend=0.5, file_ratio=0.7, extensions=None,
+				   size_ratio=0.9, nbsp_ratio=0.8, malformed_ratio=0.0):
+	"""Yield count synthetic tree lines, without line endings except for CRLF ones.
+
+	Directories open one level below the current one with probability
+	descend (up to max_depth), otherwise a random number of levels higher
+	up; file_ratio of the items are files in the current directory.
+	extensions maps extensions to weights (DEFAULT_EXTENSIONS), size_ratio
+	of the files carry a size annotation, nbsp_ratio of the lines indent
+	with non-breaking spaces and malformed_ratio of them are malformed.
+	Invalid UTF-8 shows up as lone surrogates, to be written with
+	errors='surrogateescape'.
+	"""
+	rng = random.Random(seed)
+	extensions = extensions or DEFAULT_EXTENSIONS
+	extension_names = list(extensions)
+	extension_weights = list(extensions.values())
+	depth = 0
+
+	for line_num in range(count):
+		if rng.random() < file_ratio:
+			level = depth + 1 if depth < max_depth else depth
+			name = f"{rng.choice(FOLDER_NAMES)} file_{line_num}.{rng.choices(extension_names, extension_weights)[0]}"
+			if rng.random() < size_ratio:
+				name += ' ' + size_annotation(rng)
+		else:
+			if rng.random() < descend:
+				depth = min(depth + 1, max_depth)
+			else:
+				depth = max(0, depth - rng.randrange(1, 4))
+			level = depth
+			name = rng.choice(FOLDER_NAMES)
+
+		unit = INDENT_UNITS[0] if rng.random() < nbsp_ratio else INDENT_UNITS[1]
+		prefix = unit * level + rng.choice(CONNECTORS)
+		ending = ''
+		if malformed_ratio and rng.random() < malformed_ratio:
+			kind = rng.choice(MALFORMED_KINDS)
+			if kind == 'blank':
+				prefix, name = '', ' ' * rng.randrange(4)
+			elif kind == 'glyphs':
+				prefix, name = unit * level + '│', ''
+			elif kind == 'odd_indent':
+				prefix = ' ' * rng.randrange(1, 4) + prefix
+			elif kind == 'skipped_levels':
+				prefix = unit * (level + rng.randrange(2, 4)) + CONNECTORS[0]
+			elif kind == 'whitespace':
+				name = name.replace(' ', rng.choice(('  ', '\t', ' \xa0'))) + ' '
+			elif kind == 'broken_size':
+				name += ' (12 KB'
+			elif kind == 'invalid_utf8':
+				name = name[:3] + '\udcff' + name[3:]
+			else:
+				ending = '\r\n'
+		yield prefix + name + ending
+
+def write_tree_file(path, count, **options):
+	"""Write a synthetic tree listing of count lines to path; options go to generate_lines."""
+	with open(path, 'w', encoding='utf-8', errors='surrogateescape', newline='') as f:
+		for raw_line in generate_lines(count, **options):
+			f.write(raw_line if raw_line.endswith('\r\n') else raw_line + '\n')
+
+def main():
+	parser = argparse.ArgumentParser(description='Write a deterministic synthetic Interlock-style tree listing')
+	parser.add_argument('output_file', help='Where to write the listing')
+	parser.add_argument('--lines', type=int, default=1000000, help='Number of lines (default: 1000000)')
+	parser.add_argument('--seed', type=int, default=1, help='Random seed (default: 1)')
+	parser.add_argument('--max-depth', type=int, default=12, help='Deepest directory level (default: 12)')
+	parser.add_argument('--descend', type=float, default=0.5,
+					   help='Chance a new directory nests inside the current one (default: 0.5)')
+	parser.add_argument('--file-ratio', type=float, default=0.7, help='Share of items that are files (default: 0.7)')
+	parser.add_argument('--size-ratio', type=float, default=0.9,
+					   help='Share of files with a size annotation (default: 0.9)')
+	parser.add_argument('--nbsp-ratio', type=float, default=0.8,
+					   help='Share of lines indented with non-breaking spaces (default: 0.8)')
+	parser.add_argument('--malformed', type=float, default=0.0, help='Share of malformed lines (default: 0)')
+	parser.add_argument('--ext', action='append',
+					   help='Extension and weight as EXT=WEIGHT, repeatable (default: a typical leak mix)')
+
+	args = parser.parse_args()
+	extensions = None
+	if args.ext:
+		extensions = {}
+		for option in args.ext:
+			extension, _, weight = option.partition('=')
+			extensions[extension.lstrip('.')] = float(weight or 1)
+	write_tree_file(args.output_file, args.lines, seed=args.seed, max_depth=args.max_depth, descend=args.descend,
+					file_ratio=args.file_ratio, extensions=extensions, size_ratio=args.size_ratio,
+					nbsp_ratio=args.nbsp_ratio, malformed_ratio=args.malformed)
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,85 @@
+"""Check --workers writes the same items and statistics as a serial run.
+
+Run with: python -m unittest test_parallel_chunks
+"""
+import contextlib
+import functools
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import interlock_tree_parser
+from interlock_tree_parser import find_chunk_ranges, process_tree_file
+from item_filter import ItemFilter
+from keyword_scanner import KeywordScanner
+from synthetic_tree import write_tree_file
+from tree_tokenizer import tokenize_line
+
+# Small enough that a few thousand lines split into dozens of chunks
+TEST_CHUNK_SIZE = 4096
+
+
+class ParallelChunksTest(unittest.TestCase):
+
+	@classmethod
+	def setUpClass(cls):
+		cls.tmp_dir = tempfile.TemporaryDirectory()
+		cls.tree_path = os.path.join(cls.tmp_dir.name, 'tree.txt')
+		write_tree_file(cls.tree_path, 5000, max_depth=8, malformed_ratio=0.05)
+		cls.chunk_ranges = functools.partial(find_chunk_ranges, chunk_size=TEST_CHUNK_SIZE)
+
+	@classmethod
+	def tearDownClass(cls):
+		cls.tmp_dir.cleanup()
+
+	def run_parser(self, **options):
+		"""Return the whole output file of a run, statistics included."""
+		output_path = os.path.join(self.tmp_dir.name, 'out.txt')
+		messages = io.StringIO()
+		with mock.patch.object(interlock_tree_parser, 'find_chunk_ranges', self.chunk_ranges), \
+				contextlib.redirect_stderr(messages):
+			process_tree_file(self.tree_path, output_file_path=output_path, progress='none', **options)
+		# A silent fallback to the serial loop would make the comparison pointless
+		self.assertEqual(options.get('workers', 1) > 1, 'Parsing in parallel' in messages.getvalue())
+		with open(output_path, encoding='utf-8') as f:
+			return f.read()
+
+	def assert_same_as_serial(self, **options):
+		expected = self.run_parser(**options)
+		for workers in (2, 3):
+			with self.subTest(workers=workers, **options):
+				self.assertEqual(self.run_parser(workers=workers, **options), expected)
+
+	def test_chunks_start_inside_directories(self):
+		ranges = self.chunk_ranges(self.tree_path, 2)
+		self.assertGreater(len(ranges), 20)
+		nested_starts = 0
+		with open(self.tree_path, 'rb') as f:
+			for start, _ in ranges[1:]:
+				f.seek(start)
+				indent_level, _ = tokenize_line(f.readline().decode('utf-8', 'surrogateescape').rstrip('\r\n'))
+				nested_starts += indent_level > 0
+		self.assertGreater(nested_starts, len(ranges) // 2)
+
+	def test_all_items(self):
+		self.assert_same_as_serial()
+
+	def test_files_only(self):
+		self.assert_same_as_serial(files_only=True)
+
+	def test_rollup_and_depth(self):
+		self.assert_same_as_serial(top_directories=10, max_depth=3)
+
+	def test_keywords_and_path_filter(self):
+		self.assert_same_as_serial(keyword_scanner=KeywordScanner.from_file(),
+								   item_filter=ItemFilter(path_glob='*/HR/*'))
+
+	def test_record_formats(self):
+		for output_format in ('csv', 'jsonl'):
+			self.assert_same_as_serial(output_format=output_format)
+
+
+if __name__ == '__main__':
+	unittest.main()
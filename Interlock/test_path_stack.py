@@ -0,0 +1,97 @@
+"""Check PathStack builds exactly the paths the original update_path did.
+
+Run with: python -m unittest test_path_stack
+"""
+import random
+import unittest
+
+from benchmark import legacy_update_path
+from path_stack import PathStack
+
+
+def legacy_paths(tokens):
+	"""Return the path update_path gave each (indent_level, name) token."""
+	current_path = []
+	return [legacy_update_path(current_path, {'item_name': name}, indent_level) for indent_level, name in tokens]
+
+def stack_paths(tokens, separator="/"):
+	"""Return the path PathStack gives each (indent_level, name) token."""
+	path_stack = PathStack(separator)
+	paths = []
+	for indent_level, name in tokens:
+		path_stack.update(indent_level, name)
+		paths.append(path_stack.full_path())
+	return paths
+
+def random_tokens(rng, count, max_depth=10):
+	"""Return (indent_level, name) tokens that move up and down, skipping levels now and then."""
+	tokens = []
+	depth = 0
+	for line_num in range(count):
+		roll = rng.random()
+		if roll < 0.1:
+			depth = min(max_depth, depth + rng.randint(2, 4))
+		elif roll < 0.3:
+			depth = max(0, depth - rng.randint(1, 5))
+		elif roll < 0.45:
+			depth = min(max_depth, depth + 1)
+		name = rng.choice(('Documents', 'Archive', '2023', 'jsmith', 'Übersicht', '')) if roll < 0.02 else f"item_{line_num}"
+		tokens.append((depth, name))
+	return tokens
+
+
+class PathStackTest(unittest.TestCase):
+
+	def assert_same_as_legacy(self, tokens):
+		self.assertEqual(stack_paths(tokens), legacy_paths(tokens))
+
+	def test_skipped_levels_are_padded_with_empty_names(self):
+		tokens = [(0, 'Users'), (3, 'deep'), (4, 'file.pdf'), (2, 'half'), (6, 'deeper.txt')]
+		self.assertEqual(stack_paths(tokens), ['Users', 'Users///deep', 'Users///deep/file.pdf', 'Users//half', 'Users//half////deeper.txt'])
+		self.assert_same_as_legacy(tokens)
+
+	def test_first_item_below_the_top_level(self):
+		tokens = [(2, 'HR'), (3, 'payroll.xlsx'), (0, 'Archive')]
+		self.assertEqual(stack_paths(tokens), ['//HR', '//HR/payroll.xlsx', 'Archive'])
+		self.assert_same_as_legacy(tokens)
+
+	def test_siblings_reuse_the_parent(self):
+		tokens = [(0, 'Users'), (1, 'jsmith'), (2, 'a.txt'), (2, 'b.txt'), (2, 'c.txt'), (1, 'admin'), (2, 'd.txt'), (2, 'e.txt')]
+		self.assertEqual(stack_paths(tokens)[2:5], ['Users/jsmith/a.txt', 'Users/jsmith/b.txt', 'Users/jsmith/c.txt'])
+		self.assert_same_as_legacy(tokens)
+
+	def test_moving_up_several_levels(self):
+		tokens = [(0, 'a'), (1, 'b'), (2, 'c'), (3, 'd'), (4, 'e'), (5, 'f.txt'), (1, 'g'), (2, 'h.txt'), (0, 'i'), (1, 'j.txt')]
+		self.assertEqual(stack_paths(tokens)[6:], ['a/g', 'a/g/h.txt', 'i', 'i/j.txt'])
+		self.assert_same_as_legacy(tokens)
+
+	def test_empty_names(self):
+		# Lines made only of tree glyphs give empty names at level 0
+		self.assert_same_as_legacy([(0, 'a'), (1, 'b'), (0, ''), (2, 'c'), (2, 'd'), (0, ''), (0, 'e')])
+
+	def test_full_path_only_for_some_items(self):
+		# --files-only only joins file paths, so the cached parent must not go stale in between
+		rng = random.Random(2)
+		tokens = random_tokens(rng, 5000)
+		expected = legacy_paths(tokens)
+		path_stack = PathStack()
+		for index, (indent_level, name) in enumerate(tokens):
+			path_stack.update(indent_level, name)
+			if rng.random() < 0.3:
+				self.assertEqual(path_stack.full_path(), expected[index], index)
+
+	def test_random_walk(self):
+		self.assert_same_as_legacy(random_tokens(random.Random(1), 20000))
+
+	def test_bytes_separator(self):
+		# The --mmap loop keeps undecoded names; padded levels are empty bytes
+		tokens = random_tokens(random.Random(3), 5000)
+		byte_tokens = [(indent_level, name.encode('utf-8')) for indent_level, name in tokens]
+		paths = stack_paths(byte_tokens, b"/")
+		self.assertTrue(all(isinstance(path, bytes) for path in paths))
+		self.assertEqual([path.decode('utf-8') for path in paths], legacy_paths(tokens))
+		self.assertEqual(stack_paths([(0, b'C:'), (2, b'x.txt')], b"/"), [b'C:', b'C://x.txt'])
+
+
+if __name__ == '__main__':
+	unittest.main()
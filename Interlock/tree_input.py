@@ -0,0 +1,266 @@
+"""Tree file input with transparent streaming decompression.
+
+gzip, bzip2, xz and zstd files are recognised by their magic bytes, not
+their extension, and decompressed on the fly into the same line pipeline as
+plain files. When a command-line decompressor is installed (pigz, lbzip2,
+xz -T0, zstd -T0, ...) it runs as a child process reading the file directly,
+so decompression happens on another core while this process parses. The
+Python modules (gzip, bz2, lzma and the optional zstandard) are the
+fallback. Progress is always reported in bytes of the file on disk.
+
+A file path of "-" reads standard input, so a listing can be parsed while it
+is still downloading. stdin is decompressed in process and progress counts
+the bytes read from it.
+
+Listings in an encoding other than UTF-8 (UTF-16 from PowerShell, the OEM
+code page from cmd) are transcoded to UTF-8 as they are read, so the parsers
+only ever see UTF-8.
+"""
+import bz2
+import codecs
+import gzip
+import io
+import lzma
+import os
+import shutil
+import subprocess
+import sys
+
+try:
+	import zstandard
+	HAS_ZSTANDARD = True
+except ImportError:
+	HAS_ZSTANDARD = False
+
+# Name, magic bytes and decompressor commands to try, fastest first
+COMPRESSION_FORMATS = (
+	('gzip', b'\x1f\x8b', (['pigz', '-dc'], ['gzip', '-dc'])),
+	('bzip2', b'BZh', (['lbzip2', '-dc'], ['pbzip2', '-dc'], ['bzip2', '-dc'])),
+	('xz', b'\xfd7zXZ\x00', (['xz', '-dc', '-T0'],)),
+	('zstd', b'\x28\xb5\x2f\xfd', (['zstd', '-dcq', '-T0'],)),
+)
+
+MAGIC_SIZE = max(len(magic) for _, magic, _ in COMPRESSION_FORMATS)
+
+# Bytes read per block of whole lines
+BLOCK_SIZE = 1024 * 1024
+
+# File path meaning standard input
+STDIN_PATH = '-'
+
+DEFAULT_ENCODING = 'utf-8'
+
+
+def detect_compression(file_path):
+	"""Return the compression format name of a file from its magic bytes, or None."""
+	with open(file_path, 'rb') as f:
+		return compression_from_magic(f.read(MAGIC_SIZE))
+
+def compression_from_magic(magic):
+	"""Return the compression format name for the first bytes of a stream, or None."""
+	for name, signature, _ in COMPRESSION_FORMATS:
+		if magic.startswith(signature):
+			return name
+	return None
+
+def open_decompressor(compression, raw_file):
+	"""Return a binary stream decompressing raw_file in this process."""
+	if compression == 'gzip':
+		return gzip.GzipFile(fileobj=raw_file)
+	if compression == 'bzip2':
+		return bz2.BZ2File(raw_file)
+	if compression == 'xz':
+		return lzma.LZMAFile(raw_file)
+	if not HAS_ZSTANDARD:
+		raise RuntimeError("zstd input needs the zstd command or the zstandard module (pip install zstandard)")
+	return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(raw_file))
+
+def is_utf8(encoding):
+	"""Return True if text in encoding can be read as UTF-8 without transcoding."""
+	return encoding is None or codecs.lookup(encoding).name in ('utf-8', 'ascii')
+
+def open_tree_input(file_path, use_external=True, encoding=None):
+	"""Open a tree file, or stdin for "-", for reading as UTF-8 bytes, decompressing it if needed."""
+	tree_input = open_stdin_input() if file_path == STDIN_PATH else open_tree_file(file_path, use_external)
+	if not is_utf8(encoding):
+		tree_input.stream = TranscodingReader(tree_input.stream, encoding)
+		tree_input.encoding = encoding
+	return tree_input
+
+def open_tree_file(file_path, use_external=True):
+	"""Open a tree file for reading as bytes, decompressing it if needed."""
+	compression = detect_compression(file_path)
+	raw_file = open(file_path, 'rb')
+	size = os.fstat(raw_file.fileno()).st_size
+	if compression is None:
+		return TreeInput(raw_file, size)
+
+	try:
+		if use_external:
+			for name, _, commands in COMPRESSION_FORMATS:
+				if name != compression:
+					continue
+				for command in commands:
+					if shutil.which(command[0]):
+						# The child reads the file descriptor directly, so its offset tracks progress
+						process = subprocess.Popen(command, stdin=raw_file, stdout=subprocess.PIPE)
+						return TreeInput(raw_file, size, process.stdout, compression, process)
+		return TreeInput(raw_file, size, open_decompressor(compression, raw_file), compression)
+	except BaseException:
+		raw_file.close()
+		raise
+
+def open_stdin_input():
+	"""Open standard input as a TreeInput of unknown size."""
+	head = sys.stdin.buffer.read(MAGIC_SIZE)
+	raw_file = StdinReader(sys.stdin.buffer, head)
+	compression = compression_from_magic(head)
+	stream = open_decompressor(compression, raw_file) if compression is not None else None
+	return TreeInput(raw_file, None, stream, compression)
+
+
+class StdinReader:
+	"""Reads stdin after the magic bytes already taken from it, counting bytes read."""
+
+	def __init__(self, stream, head=b''):
+		self.stream = stream
+		self.head = head
+		self.bytes_read = 0
+
+	def read(self, size=-1):
+		if self.head:
+			data, self.head = self.head, b''
+			if size is None or size < 0:
+				data += self.stream.read()
+			elif size > len(data):
+				data += self.stream.read(size - len(data))
+			else:
+				data, self.head = data[:size], data[size:]
+		else:
+			data = self.stream.read(size)
+		self.bytes_read += len(data)
+		return data
+
+	def readline(self):
+		if self.head:
+			newline = self.head.find(b'\n')
+			if newline != -1:
+				return self.read(newline + 1)
+			return self.read(len(self.head)) + self.readline()
+		line = self.stream.readline()
+		self.bytes_read += len(line)
+		return line
+
+	def readable(self):
+		return True
+
+	def tell(self):
+		return self.bytes_read
+
+	def close(self):
+		"""Leave stdin itself open."""
+
+
+class TranscodingReader:
+	"""Reads a binary stream in another encoding as UTF-8 bytes."""
+
+	def __init__(self, stream, encoding):
+		self.stream = stream
+		self.decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+
+	def read(self, size=-1):
+		while True:
+			data = self.stream.read(size)
+			text = self.decoder.decode(data, final=not data)
+			# A read can end part way through a character
+			if text or not data:
+				return text.encode('utf-8')
+
+	def readline(self):
+		"""Return the rest of the line; it can also hold the start of the next one."""
+		text = ''
+		while not text.endswith('\n'):
+			data = self.stream.readline()
+			text += self.decoder.decode(data, final=not data)
+			if not data:
+				break
+		return text.encode('utf-8')
+
+	def close(self):
+		self.stream.close()
+
+
+class TreeInput:
+	"""Binary input stream over a tree file, with progress in on-disk bytes."""
+
+	def __init__(self, raw_file, size, stream=None, compression=None, process=None):
+		self.raw_file = raw_file
+		# Size of the file on disk; None when reading stdin
+		self.size = size
+		self.stream = stream if stream is not None else raw_file
+		self.compression = compression
+		self.process = process
+		# Set when the stream is transcoded to UTF-8
+		self.encoding = None
+
+	def read(self, size=-1):
+		data = self.stream.read(size)
+		if not data and self.process is not None:
+			self.check_process()
+		return data
+
+	def readline(self):
+		return self.stream.readline()
+
+	def seek(self, offset):
+		"""Seek to offset; only plain UTF-8 files are seekable."""
+		if self.compression is not None or self.size is None or self.encoding is not None:
+			raise ValueError("cannot seek in compressed or transcoded input or stdin")
+		self.raw_file.seek(offset)
+
+	def tell(self):
+		"""Return the offset reached in the uncompressed data; only exact for plain files."""
+		return self.stream.tell()
+
+	def position(self):
+		"""Return how many bytes of the file on disk (or of stdin) have been consumed."""
+		if self.process is None:
+			return self.raw_file.tell()
+		return min(os.lseek(self.raw_file.fileno(), 0, os.SEEK_CUR), self.size)
+
+	def check_process(self):
+		"""Raise if the decompressor process failed."""
+		if self.process.wait() != 0:
+			raise OSError(f"{self.process.args[0]} failed to decompress the input (exit status {self.process.returncode})")
+
+	def close(self):
+		if self.process is not None:
+			self.stream.close()
+			if self.process.poll() is None:
+				self.process.terminate()
+			self.process.wait()
+		elif self.stream is not self.raw_file:
+			self.stream.close()
+		self.raw_file.close()
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *exc_info):
+		self.close()
+
+
+def iter_line_blocks(tree_input, block_size=BLOCK_SIZE):
+	"""Yield blocks of whole lines read from tree_input."""
+	while True:
+		block = tree_input.read(block_size)
+		if not block:
+			return
+		if not block.endswith(b'\n'):
+			block += tree_input.readline()
+		yield block
+
+def iter_text_lines(tree_input, block_size=BLOCK_SIZE):
+	"""Yield decoded lines from tree_input exactly as a text-mode file would."""
+	for block in iter_line_blocks(tree_input, block_size):
+		yield from io.TextIOWrapper(io.BytesIO(block), encoding='utf-8', errors='ignore')
@@ -0,0 +1,272 @@
+"""SQLite store for parsed tree listings.
+
+`ingest` parses a tree file once into an items table (one row per item in
+listing order, with the line it came from) so later questions are indexed
+queries instead of a rescan of the raw text. Rows are inserted with
+executemany in batches inside large transactions on a WAL-mode database, and
+the indexes on extension, parent and name are built after the load, which is
+much faster than keeping them up to date row by row.
+
+    python tree_store.py ingest tree.txt leak.db
+    python tree_store.py stats leak.db
+    python tree_store.py find leak.db --ext pdf --ext xlsx
+"""
+import argparse
+import os
+import sqlite3
+import sys
+
+from dialects import DEFAULT_DIALECT, DIALECTS, make_dialect
+from dialects.detect import AUTO_DIALECT, detect_dialect
+from progress import PROGRESS_REPORTERS, make_progress
+from sizes import format_bytes, parse_size
+from tree_input import STDIN_PATH, iter_line_blocks, open_tree_input
+
+# Rows handed to each executemany call
+INSERT_BATCH_SIZE = 50000
+
+# Rows inserted per transaction
+COMMIT_ROWS = 1000000
+
+SCHEMA = """
+CREATE TABLE items (
+	id INTEGER PRIMARY KEY,
+	line INTEGER NOT NULL,
+	parent_id INTEGER,
+	depth INTEGER NOT NULL,
+	name TEXT NOT NULL,
+	is_file INTEGER NOT NULL,
+	extension TEXT,
+	size INTEGER
+);
+CREATE TABLE metadata (
+	key TEXT PRIMARY KEY,
+	value TEXT
+);
+"""
+
+INDEXES = """
+CREATE INDEX items_extension ON items (extension, size);
+CREATE INDEX items_parent ON items (parent_id);
+CREATE INDEX items_name ON items (name);
+"""
+
+
+def open_store(database_path):
+	"""Open a store database in WAL mode with autocommit off."""
+	connection = sqlite3.connect(database_path, isolation_level=None)
+	connection.execute("PRAGMA journal_mode = WAL")
+	connection.execute("PRAGMA synchronous = NORMAL")
+	return connection
+
+def create_store(connection):
+	"""Create empty tables, replacing any earlier ingest."""
+	connection.executescript("DROP TABLE IF EXISTS items; DROP TABLE IF EXISTS metadata;" + SCHEMA)
+
+def iter_item_rows(file_path, progress, dialect=None, encoding=None):
+	"""Parse a tree file and yield (id, line, parent_id, depth, name, is_file, extension, size) rows.
+
+	An item's parent is the closest preceding item at a shallower level, so
+	levels skipped in a malformed tree are left out of the chain.
+	"""
+	dialect = make_dialect(dialect or DEFAULT_DIALECT)
+	# Item id at each indent level of the current path, None for skipped levels
+	ancestors = []
+	item_id = 0
+	files_count = 0
+	next_update = progress.check_every
+
+	with open_tree_input(file_path, encoding=encoding) as f:
+		for block in iter_line_blocks(f, dialect.block_size):
+			for line_num, indent_level, item_name, item_is_file, ext, size in dialect.iter_block_items(block):
+				files_count += item_is_file
+				item_id += 1
+
+				del ancestors[indent_level:]
+				parent_id = None
+				for ancestor_id in reversed(ancestors):
+					if ancestor_id is not None:
+						parent_id = ancestor_id
+						break
+				ancestors.extend([None] * (indent_level - len(ancestors)))
+				ancestors.append(item_id)
+
+				yield item_id, line_num, parent_id, indent_level, item_name, item_is_file, ext, size
+
+				if line_num >= next_update:
+					progress.update(f.position(), line_num, files_count)
+					next_update = line_num + progress.check_every
+
+		progress.finish(f.position(), dialect.line_count, files_count)
+
+def ingest_tree_file(file_path, database_path, progress, batch_size=INSERT_BATCH_SIZE, dialect=DEFAULT_DIALECT, encoding=None):
+	"""Load a tree file into database_path and return the number of items stored.
+
+	dialect is a TreeDialect or DIALECTS name, encoding the input encoding (UTF-8 by default).
+	"""
+	dialect = make_dialect(dialect)
+	connection = open_store(database_path)
+	item_count = 0
+	try:
+		create_store(connection)
+		is_stdin = file_path == STDIN_PATH
+		progress.start(None if is_stdin else os.path.getsize(file_path))
+
+		connection.execute("BEGIN")
+		batch = []
+		uncommitted = 0
+		for row in iter_item_rows(file_path, progress, dialect, encoding):
+			batch.append(row)
+			if len(batch) >= batch_size:
+				connection.executemany("INSERT INTO items VALUES (?, ?, ?, ?, ?, ?, ?, ?)", batch)
+				item_count += len(batch)
+				uncommitted += len(batch)
+				batch.clear()
+				if uncommitted >= COMMIT_ROWS:
+					connection.execute("COMMIT")
+					connection.execute("BEGIN")
+					uncommitted = 0
+		connection.executemany("INSERT INTO items VALUES (?, ?, ?, ?, ?, ?, ?, ?)", batch)
+		item_count += len(batch)
+
+		connection.executemany("INSERT INTO metadata VALUES (?, ?)", [
+			("source", "<stdin>" if is_stdin else os.path.abspath(file_path)),
+			("dialect", dialect.name)
+		])
+		connection.execute("COMMIT")
+		progress.close()
+
+		print("Building indexes", file=sys.stderr)
+		connection.executescript(INDEXES)
+		connection.execute("ANALYZE")
+	finally:
+		progress.close()
+		connection.close()
+	return item_count
+
+def item_path(connection, item_id, path_cache):
+	"""Return the full path of an item, caching the paths of its ancestors."""
+	names = []
+	parent_path = None
+	while item_id is not None:
+		parent_path = path_cache.get(item_id)
+		if parent_path is not None:
+			break
+		parent_id, name = connection.execute("SELECT parent_id, name FROM items WHERE id = ?", (item_id,)).fetchone()
+		names.append((item_id, name))
+		item_id = parent_id
+
+	for item_id, name in reversed(names):
+		parent_path = name if parent_path is None else parent_path + "/" + name
+		path_cache[item_id] = parent_path
+	return parent_path
+
+def write_store_statistics(connection, output=sys.stdout):
+	"""Print item counts and per-extension file counts and bytes from the store."""
+	item_count, files_count, sized_files, total_bytes = connection.execute(
+		"SELECT COUNT(*), SUM(is_file), SUM(size IS NOT NULL AND is_file), SUM(CASE WHEN is_file THEN size END) FROM items"
+	).fetchone()
+	metadata = dict(connection.execute("SELECT key, value FROM metadata"))
+
+	stats_text = f"\n=== Store Statistics ===\n"
+	stats_text += f"Source: {metadata.get('source', 'unknown')}\n"
+	stats_text += f"Items stored: {item_count:,}\n"
+	stats_text += f"Files found: {files_count or 0:,}\n"
+	if sized_files:
+		stats_text += f"Total size: {format_bytes(total_bytes)} ({sized_files:,} files with a size)\n"
+
+	stats_text += f"\nFile types found:\n"
+	rows = connection.execute(
+		"SELECT extension, COUNT(*), SUM(size) FROM items WHERE extension IS NOT NULL "
+		"GROUP BY extension ORDER BY COUNT(*) DESC"
+	)
+	for ext, count, size in rows:
+		size_text = f", {format_bytes(size)}" if size is not None else ""
+		stats_text += f"  .{ext}: {count:,} files{size_text}\n"
+
+	output.write(stats_text)
+
+def find_items(connection, extensions=None, name_pattern=None, min_size=None, limit=None):
+	"""Yield (line, full_path, size) for files matching every given filter."""
+	conditions = ["is_file"]
+	parameters = []
+	if extensions:
+		conditions.append(f"extension IN ({', '.join('?' * len(extensions))})")
+		parameters.extend(ext.lower().lstrip('.') for ext in extensions)
+	if name_pattern:
+		conditions.append("name GLOB ?")
+		parameters.append(name_pattern)
+	if min_size is not None:
+		conditions.append("size >= ?")
+		parameters.append(min_size)
+
+	query = f"SELECT id, line, size FROM items WHERE {' AND '.join(conditions)} ORDER BY id"
+	if limit:
+		query += f" LIMIT {int(limit)}"
+
+	path_cache = {}
+	for item_id, line_num, size in connection.execute(query, parameters).fetchall():
+		yield line_num, item_path(connection, item_id, path_cache), size
+
+def main():
+	parser = argparse.ArgumentParser(description='Load tree output into SQLite and query it')
+	subparsers = parser.add_subparsers(dest='command', required=True)
+
+	ingest_parser = subparsers.add_parser('ingest', help='Parse a tree file into a database')
+	ingest_parser.add_argument('file_path', help='Path to the tree output file, or - for stdin')
+	ingest_parser.add_argument('database', help='SQLite database to create or replace')
+	ingest_parser.add_argument('--dialect', choices=[AUTO_DIALECT] + sorted(DIALECTS), default=AUTO_DIALECT,
+							   help='Listing format (default: auto, detected by sampling the file)')
+	ingest_parser.add_argument('--encoding', help='Input encoding (default: detected, else utf-8)')
+	ingest_parser.add_argument('--batch-size', type=int, default=INSERT_BATCH_SIZE,
+							   help=f'Rows per executemany batch (default: {INSERT_BATCH_SIZE})')
+	ingest_parser.add_argument('--progress', choices=['auto'] + sorted(PROGRESS_REPORTERS), default='auto',
+							   help='Progress reporter (default: auto)')
+	ingest_parser.add_argument('--progress-interval', type=int, default=50000,
+							   help='Show progress every N lines for simple progress (default: 50000)')
+
+	stats_parser = subparsers.add_parser('stats', help='Show statistics from a database')
+	stats_parser.add_argument('database', help='Database written by ingest')
+
+	find_parser = subparsers.add_parser('find', help='List files matching filters')
+	find_parser.add_argument('database', help='Database written by ingest')
+	find_parser.add_argument('--ext', action='append', help='File extension to match (repeatable)')
+	find_parser.add_argument('--name', help="Shell-style pattern the file name must match, e.g. '*invoice*'")
+	find_parser.add_argument('--min-size', type=parse_size, help="Minimum size, e.g. '10 MB'")
+	find_parser.add_argument('--limit', type=int, help='Stop after N results')
+
+	args = parser.parse_args()
+
+	try:
+		if args.command == 'ingest':
+			dialect, encoding = args.dialect, args.encoding
+			if dialect == AUTO_DIALECT:
+				if args.file_path == STDIN_PATH:
+					dialect = DEFAULT_DIALECT
+				else:
+					detection = detect_dialect(args.file_path)
+					print(f"Detected listing format: {detection.describe()}", file=sys.stderr)
+					dialect, encoding = detection.make_dialect(), encoding or detection.encoding
+			progress = make_progress(args.progress, args.progress_interval)
+			item_count = ingest_tree_file(args.file_path, args.database, progress, args.batch_size, dialect, encoding)
+			print(f"Stored {item_count:,} items in {args.database}", file=sys.stderr)
+			return
+
+		if not os.path.exists(args.database):
+			raise FileNotFoundError(args.database)
+		connection = open_store(args.database)
+		try:
+			if args.command == 'stats':
+				write_store_statistics(connection)
+			else:
+				for line_num, path, size in find_items(connection, args.ext, args.name, args.min_size, args.limit):
+					print(f"Line {line_num}: {path}")
+		finally:
+			connection.close()
+	except FileNotFoundError as e:
+		print(f"Error: File '{e.filename or e}' not found.", file=sys.stderr)
+	except sqlite3.Error as e:
+		print(f"Database error: {e}", file=sys.stderr)
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,320 @@
+"""Compact in-memory table of a parsed tree, for analyses over whole leaks.
+
+Items are stored column-wise in typed arrays instead of one dict per item:
+line number, depth, parent index, name id, extension id and size, about 24
+bytes per item. Each distinct name is stored once as UTF-8 in a NamePool, and
+full paths are not stored at all but rebuilt from the parent column when
+asked for. Iterating yields TreeItem views, which read the columns on
+access, and queries scan the arrays directly.
+
+    python tree_table.py tree.txt --ext pdf --min-size "10 MB"
+"""
+import argparse
+import os
+import sys
+from array import array
+from fnmatch import fnmatchcase
+
+from dialects import DEFAULT_DIALECT, DIALECTS
+from dialects.detect import AUTO_DIALECT, detect_dialect
+from progress import PROGRESS_REPORTERS, make_progress
+from sizes import format_bytes, parse_size
+from tree_input import STDIN_PATH
+from tree_store import iter_item_rows
+
+# Parent column value for items at the top of the tree
+NO_PARENT = 2 ** 32 - 1
+
+# Size column value for items without a size annotation
+NO_SIZE = -1
+
+# Distinct names remembered for deduplication before the lookup is reset
+NAME_CACHE_SIZE = 1 << 20
+
+# Parent paths kept while listing query results
+PATH_CACHE_SIZE = 65536
+
+
+class NamePool:
+	"""Strings stored once each as UTF-8 in one buffer, looked up by id.
+
+	Names seen again while they are in the lookup dict get the same id; the
+	dict is reset after cache_size distinct names so it can't outgrow the
+	pool, at the cost of storing later repeats again. stats counts the names
+	stored, the repeats and the bytes they would have taken.
+	"""
+
+	__slots__ = ('data', 'offsets', 'ids', 'cache_size', 'stats')
+
+	def __init__(self, cache_size=NAME_CACHE_SIZE):
+		self.data = bytearray()
+		# Name i is data[offsets[i]:offsets[i + 1]]
+		self.offsets = array('Q', [0])
+		self.ids = {}
+		self.cache_size = cache_size
+		self.stats = {"unique": 0, "repeats": 0, "saved_bytes": 0}
+
+	def add(self, name):
+		"""Return the id of name, storing it if it isn't in the pool."""
+		try:
+			name_id = self.ids[name]
+		except KeyError:
+			pass
+		else:
+			self.stats['repeats'] += 1
+			self.stats['saved_bytes'] += self.offsets[name_id + 1] - self.offsets[name_id] + self.offsets.itemsize
+			return name_id
+
+		name_id = len(self.offsets) - 1
+		self.data += name.encode('utf-8')
+		self.offsets.append(len(self.data))
+		if len(self.ids) >= self.cache_size:
+			self.ids.clear()
+		self.ids[name] = name_id
+		self.stats['unique'] += 1
+		return name_id
+
+	def __getitem__(self, name_id):
+		return self.data[self.offsets[name_id]:self.offsets[name_id + 1]].decode('utf-8')
+
+	def __len__(self):
+		return len(self.offsets) - 1
+
+	def nbytes(self):
+		"""Return the bytes held by the buffer and offsets."""
+		return len(self.data) + self.offsets.itemsize * len(self.offsets)
+
+
+class TreeItem:
+	"""View of one item in a TreeTable."""
+
+	__slots__ = ('table', 'index')
+
+	def __init__(self, table, index):
+		self.table = table
+		self.index = index
+
+	@property
+	def line(self):
+		return self.table.lines[self.index]
+
+	@property
+	def depth(self):
+		return self.table.depths[self.index]
+
+	@property
+	def name(self):
+		return self.table.names[self.table.name_ids[self.index]]
+
+	@property
+	def extension(self):
+		return self.table.extensions[self.table.extension_ids[self.index]]
+
+	@property
+	def is_file(self):
+		return self.table.extension_ids[self.index] != 0
+
+	@property
+	def size(self):
+		size = self.table.sizes[self.index]
+		return None if size == NO_SIZE else size
+
+	@property
+	def parent(self):
+		parent = self.table.parents[self.index]
+		return None if parent == NO_PARENT else TreeItem(self.table, parent)
+
+	@property
+	def path(self):
+		return self.table.path(self.index)
+
+	def __repr__(self):
+		return f"TreeItem(line={self.line}, path={self.path!r})"
+
+
+class TreeTable:
+	"""Parsed tree items in parallel typed columns.
+
+	parents holds the index of each item's parent (NO_PARENT at the top),
+	extension_ids index extensions (0 for directories and unknown types) and
+	sizes are in bytes (NO_SIZE when there was no size annotation).
+	"""
+
+	def __init__(self):
+		self.lines = array('I')
+		self.depths = array('H')
+		self.parents = array('I')
+		self.name_ids = array('I')
+		self.extension_ids = array('H')
+		self.sizes = array('q')
+		self.names = NamePool()
+		self.extensions = [None]
+		self.extension_index = {None: 0}
+
+	@classmethod
+	def from_rows(cls, rows):
+		"""Build a table from (id, line, parent_id, depth, name, is_file, extension, size) rows, ids counting from 1."""
+		table = cls()
+		append_line = table.lines.append
+		append_depth = table.depths.append
+		append_parent = table.parents.append
+		append_name = table.name_ids.append
+		append_extension = table.extension_ids.append
+		append_size = table.sizes.append
+		add_name = table.names.add
+		extension_index = table.extension_index
+
+		for _, line_num, parent_id, depth, name, _, ext, size in rows:
+			append_line(line_num)
+			append_depth(depth)
+			append_parent(NO_PARENT if parent_id is None else parent_id - 1)
+			append_name(add_name(name))
+			extension_id = extension_index.get(ext)
+			if extension_id is None:
+				extension_id = extension_index[ext] = len(table.extensions)
+				table.extensions.append(ext)
+			append_extension(extension_id)
+			append_size(NO_SIZE if size is None else size)
+		# The name lookup is only needed while loading
+		table.names.ids.clear()
+		return table
+
+	@classmethod
+	def from_tree_file(cls, file_path, progress=None, dialect=DEFAULT_DIALECT, encoding=None):
+		"""Parse a tree file into a table; dialect is a TreeDialect or DIALECTS name."""
+		progress = progress or make_progress('none')
+		progress.start(None if file_path == STDIN_PATH else os.path.getsize(file_path))
+		return cls.from_rows(iter_item_rows(file_path, progress, dialect, encoding))
+
+	def __len__(self):
+		return len(self.lines)
+
+	def __getitem__(self, index):
+		if index < 0:
+			index += len(self)
+		if not 0 <= index < len(self):
+			raise IndexError("TreeTable index out of range")
+		return TreeItem(self, index)
+
+	def __iter__(self):
+		for index in range(len(self)):
+			yield TreeItem(self, index)
+
+	def path(self, index, path_cache=None):
+		"""Return an item's full path, padded with empty names for skipped levels like the parser's.
+
+		path_cache maps parent indexes to their paths, to share work between
+		items in the same directory.
+		"""
+		names = self.names
+		name_ids = self.name_ids
+		parents = self.parents
+		depths = self.depths
+
+		parent = parents[index]
+		if path_cache is not None and parent != NO_PARENT:
+			parent_path = path_cache.get(parent)
+			if parent_path is None:
+				if len(path_cache) >= PATH_CACHE_SIZE:
+					path_cache.clear()
+				parent_path = path_cache[parent] = self.path(parent)
+			return parent_path + "/" * (depths[index] - depths[parent]) + names[name_ids[index]]
+
+		parts = [names[name_ids[index]]]
+		depth = depths[index]
+		while parent != NO_PARENT:
+			parent_depth = depths[parent]
+			parts.extend([""] * (depth - parent_depth - 1))
+			parts.append(names[name_ids[parent]])
+			depth = parent_depth
+			parent = parents[parent]
+		parts.extend([""] * depth)
+		parts.reverse()
+		return "/".join(parts)
+
+	def find(self, extensions=None, name_pattern=None, min_size=None):
+		"""Yield TreeItems for files matching every given filter, in listing order.
+
+		extensions are matched without the dot and case, name_pattern is a
+		shell-style pattern and min_size is in bytes.
+		"""
+		if extensions:
+			wanted = {self.extension_index[ext] for ext in (ext.lower().lstrip('.') for ext in extensions) if ext in self.extension_index}
+		else:
+			wanted = set(range(1, len(self.extensions)))
+		names = self.names
+		name_ids = self.name_ids
+		sizes = self.sizes
+
+		for index, extension_id in enumerate(self.extension_ids):
+			if extension_id not in wanted:
+				continue
+			if min_size is not None and sizes[index] < min_size:
+				continue
+			if name_pattern and not fnmatchcase(names[name_ids[index]], name_pattern):
+				continue
+			yield TreeItem(self, index)
+
+	def extension_totals(self):
+		"""Return {extension: [files, bytes]} for the files in the table."""
+		totals = [[0, 0] for _ in self.extensions]
+		for extension_id, size in zip(self.extension_ids, self.sizes):
+			counters = totals[extension_id]
+			counters[0] += 1
+			if size != NO_SIZE:
+				counters[1] += size
+		return {ext: counters for ext, counters in zip(self.extensions, totals) if ext is not None and counters[0]}
+
+	def nbytes(self):
+		"""Return the bytes held by the columns and the name pool."""
+		columns = (self.lines, self.depths, self.parents, self.name_ids, self.extension_ids, self.sizes)
+		return sum(column.itemsize * len(column) for column in columns) + self.names.nbytes()
+
+def main():
+	parser = argparse.ArgumentParser(description='Load a tree file into a compact in-memory table and query it')
+	parser.add_argument('file_path', help='Path to the tree output file, or - for stdin')
+	parser.add_argument('--dialect', choices=[AUTO_DIALECT] + sorted(DIALECTS), default=AUTO_DIALECT,
+					   help='Listing format (default: auto, detected by sampling the file)')
+	parser.add_argument('--encoding', help='Input encoding (default: detected, else utf-8)')
+	parser.add_argument('--ext', action='append', help='List files with this extension (repeatable)')
+	parser.add_argument('--name', help="List files whose name matches this shell-style pattern, e.g. '*invoice*'")
+	parser.add_argument('--min-size', type=parse_size, help="List files of at least this size, e.g. '10 MB'")
+	parser.add_argument('--progress', choices=['auto'] + sorted(PROGRESS_REPORTERS), default='auto',
+					   help='Progress reporter (default: auto)')
+
+	args = parser.parse_args()
+
+	try:
+		dialect, encoding = args.dialect, args.encoding
+		if dialect == AUTO_DIALECT:
+			if args.file_path == STDIN_PATH:
+				dialect = DEFAULT_DIALECT
+			else:
+				detection = detect_dialect(args.file_path)
+				print(f"Detected listing format: {detection.describe()}", file=sys.stderr)
+				dialect, encoding = detection.make_dialect(), encoding or detection.encoding
+
+		progress = make_progress(args.progress, 50000)
+		table = TreeTable.from_tree_file(args.file_path, progress, dialect, encoding)
+		progress.close()
+
+		if args.ext or args.name or args.min_size is not None:
+			path_cache = {}
+			for item in table.find(args.ext, args.name, args.min_size):
+				print(f"Line {item.line}: {table.path(item.index, path_cache)}")
+			return
+
+		string_stats = table.names.stats
+		print(f"Items: {len(table):,} ({string_stats['unique']:,} names stored, {string_stats['repeats']:,} repeats shared, "
+			  f"{format_bytes(string_stats['saved_bytes'])} saved)")
+		print(f"Table size: {format_bytes(table.nbytes())} ({table.nbytes() / max(len(table), 1):.1f} bytes per item)")
+		print(f"\nFile types found:")
+		for ext, (count, size) in sorted(table.extension_totals().items(), key=lambda x: x[1][0], reverse=True):
+			print(f"  .{ext}: {count:,} files, {format_bytes(size)}")
+	except FileNotFoundError:
+		print(f"Error: File '{args.file_path}' not found.", file=sys.stderr)
+	except Exception as e:
+		print(f"Error processing file: {e}", file=sys.stderr)
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,38 @@
+"""Allocation-light tokenizer for Interlock tree listing lines.
+
+Every line of a tree dump goes through tokenize_line, so this module keeps all
+lookup tables at module level and does the work with C-level str methods
+(lstrip/split/join) instead of per-character Python loops and regexes.
+
+Throughput target: >= 500,000 lines/sec on a single core under CPython 3.11
+for typical Interlock lines (depth 3-10, ~60 chars). Run
+`python benchmark.py tokenizer` to measure against the original implementation.
+"""
+
+# Characters that count towards indentation when working out the level
+INDENT_CHARS = frozenset(' \xa0│─└├┬┴┘┌┐┼')
+_INDENT_STRIP = ''.join(INDENT_CHARS)
+
+# Every character str.isspace() accepts (the same set as the `\s` regex class),
+# all of which sit below U+3001
+WHITESPACE = ''.join(chr(c) for c in range(0x3001) if chr(c).isspace())
+
+# Characters stripped from the front of a line before the item name begins
+PREFIX_CHARS = frozenset('│─└├' + WHITESPACE)
+_PREFIX_STRIP = ''.join(PREFIX_CHARS)
+
+# Number of prefix characters per tree level in Interlock listings
+INDENT_WIDTH = 4
+
+
+def tokenize_line(raw_line, indent_width=INDENT_WIDTH):
+	"""Return (indent_level, item_name) for a single tree line."""
+	content = raw_line.lstrip(_INDENT_STRIP)
+	if content:
+		indent_level = (len(raw_line) - len(content)) // indent_width
+	else:
+		# A line made only of tree glyphs has no content to indent
+		indent_level = 0
+
+	item_name = ' '.join(raw_line.lstrip(_PREFIX_STRIP).split())
+	return indent_level, item_name